@@ -0,0 +1,26 @@
+"""
+Shared logging setup for the stress test scripts
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+def start_queue_logging(level: int = logging.INFO) -> QueueListener:
+    """Route root logging through a queue drained by one listener thread
+    
+    Workers only enqueue records; the listener formats and writes them. The
+    listener is stopped (and the queue flushed) at interpreter exit.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(threadName)s - %(levelname)s - %(message)s'))
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # full layout is applied by the listener
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
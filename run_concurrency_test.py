@@ -7,9 +7,12 @@ import sys
 import os
 import subprocess
 import time
+import importlib.util
+
+REQUIRED_CATALOGS = ('iceberg', 'iceberg_hms')
 
 def check_trino_connection():
-    """Check if Trino is accessible"""
+    """Check if Trino is accessible and the required catalogs exist"""
     try:
         import trino
         conn = trino.dbapi.connect(
@@ -17,21 +20,27 @@ def check_trino_connection():
             port=8081,
             user='admin'
         )
-        cursor = conn.cursor()
-        cursor.execute("SHOW CATALOGS")
-        catalogs = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            # Count only the catalogs we need instead of listing every catalog
+            cursor.execute(
+                "SELECT count(*) FROM system.metadata.catalogs WHERE catalog_name IN ("
+                + ", ".join(f"'{cat}'" for cat in REQUIRED_CATALOGS) + ")"
+            )
+            if cursor.fetchone()[0] == len(REQUIRED_CATALOGS):
+                print(f"Required catalogs available: {list(REQUIRED_CATALOGS)}")
+                return True
+            
+            # Only list everything when something is missing, to report what
+            cursor.execute("SHOW CATALOGS")
+            catalogs = [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
         
         print(f"Available catalogs: {catalogs}")
-        
-        required_catalogs = ['iceberg', 'iceberg_hms']
-        missing_catalogs = [cat for cat in required_catalogs if cat not in catalogs]
-        
-        if missing_catalogs:
-            print(f"Missing required catalogs: {missing_catalogs}")
-            return False
-        
-        return True
+        missing_catalogs = [cat for cat in REQUIRED_CATALOGS if cat not in catalogs]
+        print(f"Missing required catalogs: {missing_catalogs}")
+        return False
     except Exception as e:
         print(f"Failed to connect to Trino: {e}")
         return False
@@ -40,7 +49,8 @@ def install_requirements():
     """Install required packages"""
     print("Installing requirements...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+                       check=True, stdout=subprocess.DEVNULL)
         print("Requirements installed successfully!")
         return True
     except subprocess.CalledProcessError as e:
@@ -68,10 +78,9 @@ def main():
     print("=== Trino Concurrency Test Runner ===")
     
     # Check if requirements are installed
-    try:
-        import trino
+    if importlib.util.find_spec("trino") is not None:
         print("✓ Trino package is available")
-    except ImportError:
+    else:
         print("✗ Trino package not found")
         if input("Install requirements? (y/n): ").lower() == 'y':
             if not install_requirements():
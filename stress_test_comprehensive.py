@@ -6,79 +6,217 @@ This script performs intensive concurrent insert operations to test the limits o
 
 import threading
 import time
-import random
 import logging
-import statistics
-from typing import List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
+import queue
+from functools import lru_cache
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence, Tuple
+from array import array
+from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import numpy as np
+import requests
 import trino
+from requests.adapters import HTTPAdapter
+
+from log_setup import start_queue_logging
+from trino_pool import PooledTester
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-class ComprehensiveStressTester:
+# Placeholder tuple for one stress row; created_at/partition_date are bound once per batch
+INSERT_ROW_PLACEHOLDER = "(?, ?, ?, ?, ?, ?)"
+RANDOM_DATA_ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+RANDOM_DATA_LENGTH = 20
+# Keep-alive HTTP connections kept per catalog session
+HTTP_POOL_SIZE = 64
+# Trino's sequence() returns at most this many elements; larger batches cross-join two sequences
+SERVER_MAX_ROWS = 10000
+
+
+@lru_cache(maxsize=None)
+def build_insert_statement(table_name: str, batch_size: int) -> str:
+    """Build (once per table/batch size) the parameterized multi-row INSERT
+    
+    Parameters: created_at and partition_date for the whole batch, then the
+    six per-row values of every row.
+    """
+    placeholders = ", ".join([INSERT_ROW_PLACEHOLDER] * batch_size)
+    return (
+        f"INSERT INTO {table_name} SELECT v.*, ?, ? FROM (VALUES {placeholders}) "
+        "AS v(id, batch_id, thread_id, name, value, random_data)"
+    )
+
+
+def batch_timestamp() -> List[Any]:
+    """created_at and partition_date for a batch, both from the client's local clock
+    
+    Both payload modes bind these, so a batch lands in the same daily partition
+    whether the rows are generated client-side or by Trino.
+    """
+    created_at = datetime.now()
+    return [created_at, created_at.date()]
+
+
+@lru_cache(maxsize=None)
+def build_server_insert_statement(table_name: str) -> str:
+    """Build the INSERT that has Trino generate a batch of rows itself
+    
+    Only the id range and row labels are sent; value and random_data are
+    computed by Trino rather than shipped as SQL text. Ids are built from two
+    cross-joined sequences so batches may exceed SERVER_MAX_ROWS.
+    Parameters: batch_id, thread_id, name prefix, base id, created_at,
+    partition_date, first id, number of SERVER_MAX_ROWS blocks minus one, last id.
+    """
+    return (
+        f"INSERT INTO {table_name} "
+        "SELECT t.id, ?, ?, concat(?, CAST(t.id - ? AS varchar)), round(1 + random() * 999, 2), "
+        "upper(substr(to_hex(md5(to_utf8(CAST(uuid() AS varchar)))), 1, 20)), ?, ? "
+        f"FROM (SELECT ? + hi * {SERVER_MAX_ROWS} + lo AS id "
+        "FROM UNNEST(sequence(0, ?)) AS h(hi) "
+        f"CROSS JOIN UNNEST(sequence(0, {SERVER_MAX_ROWS - 1})) AS l(lo)) AS t "
+        "WHERE t.id <= ?"
+    )
+
+
+# Stress table layout shared by every catalog
+_TABLE_DDL = """
+    CREATE TABLE stress_test.{t} (
+        id bigint,
+        batch_id bigint,
+        thread_id varchar,
+        name varchar,
+        value double,
+        random_data varchar,
+        created_at timestamp,
+        partition_date date
+    ) WITH (
+        partitioning = ARRAY['partition_date']
+    )
+"""
+
+
+class WorkerResults(NamedTuple):
+    """Outcomes of one stress worker, one array slot per batch"""
+    catalog: str
+    durations: array       # 'd' seconds
+    timestamps: array      # 'd' epoch seconds at submit
+    success: bytearray     # 1 = succeeded
+    rows: array            # 'q' reported row counts
+    errors: List[Tuple[int, str]]  # (batch_id, error) for failed batches
+    moments: array         # 'd' running [n, mean, M2] of successful durations (Welford)
+
+    @classmethod
+    def allocate(cls, catalog: str, batches: int) -> 'WorkerResults':
+        """Preallocate exactly one slot per batch so recording never grows a buffer"""
+        return cls(catalog, array('d', [0.0]) * batches, array('d', [0.0]) * batches,
+                   bytearray(batches), array('q', [0]) * batches, [], array('d', [0, 0, 0]))
+
+    def record(self, batch_id: int, duration: float, timestamp: float, success: bool, rows: int,
+               error: Optional[str] = None):
+        self.durations[batch_id] = duration
+        self.timestamps[batch_id] = timestamp
+        self.success[batch_id] = 1 if success else 0
+        self.rows[batch_id] = rows
+        if success:
+            moments = self.moments
+            moments[0] += 1
+            delta = duration - moments[1]
+            moments[1] += delta / moments[0]
+            moments[2] += delta * (duration - moments[1])
+        else:
+            self.errors.append((batch_id, error or 'Unknown error'))
+
+
+def merge_moments(a: Tuple[float, float, float], b: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """Combine two (n, mean, M2) Welford states (Chan et al. parallel update)"""
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    if not n:
+        return 0.0, 0.0, 0.0
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+
+class ComprehensiveStressTester(PooledTester):
     def __init__(self, host='localhost', port=8081, user='admin'):
         self.host = host
         self.port = port
         self.user = user
-        self.connections = {}
+        self.pools: Dict[str, queue.Queue] = {}
+        self.pool_sizes: Dict[str, int] = {}
+        self.http_sessions: Dict[str, requests.Session] = {}
         self.catalogs = ['iceberg_polaris', 'iceberg_hms', 'iceberg_nessie']
         # Use timestamp to create unique table names
         self.table_suffix = str(int(time.time()))
         self.table_name = f"insert_stress_{self.table_suffix}"
+        self._ddl = {catalog: _TABLE_DDL.format(t=self.table_name) for catalog in self.catalogs}
+        # Only set while a pipelined run is in progress
+        self.pipeline_executor = None
+        self.inflight_limits = {}
+        # Rate pacing state shared by all workers (see wait_for_slot)
+        self.pace_lock = threading.Lock()
+        self.next_slot = 0.0
+        self.slot_interval = 0.0
+        self.in_flight = threading.BoundedSemaphore(1)
+        # Each worker thread lazily spawns its own child stream of this sequence
+        self.seed_sequence = np.random.SeedSequence()
+        self._rng_tls = threading.local()
+        self._alphabet = np.frombuffer(RANDOM_DATA_ALPHABET, dtype='S1')
         self.setup_connections()
         
-    def setup_connections(self):
-        """Setup connections to all catalogs"""
+    def setup_connections(self, pool_size: int = 1):
+        """Setup a pool of connections for every catalog"""
         try:
-            # Connection for Polaris catalog (iceberg_polaris)
-            self.connections['iceberg_polaris'] = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_polaris',
-                schema='default'
-            )
-            logger.info("Connected to Polaris catalog (iceberg_polaris)")
+            for catalog in self.catalogs:
+                # One keep-alive HTTP session per catalog, shared by that catalog's pooled connections
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.http_sessions[catalog] = session
+                self.pools[catalog] = queue.Queue()
+                self.pool_sizes[catalog] = 0
             
-            # Connection for HMS catalog
-            self.connections['iceberg_hms'] = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_hms',
-                schema='default'
-            )
-            logger.info("Connected to HMS catalog (iceberg_hms)")
-            
-            # Connection for Nessie catalog
-            self.connections['iceberg_nessie'] = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_nessie',
-                schema='default'
-            )
-            logger.info("Connected to Nessie catalog (iceberg_nessie)")
+            self.ensure_pool_size(pool_size)
             
         except Exception as e:
             logger.error(f"Failed to setup connections: {e}")
             raise
 
-    def execute_query(self, catalog_name: str, query: str) -> Dict[str, Any]:
-        """Execute a query and return results with timing"""
+    def open_pool_entry(self, catalog: str):
+        """Open a (connection, cursor) pair on the catalog's shared keep-alive HTTP session
+        
+        Only the thread holding the pool entry may use the connection or its cursor.
+        """
+        connection = trino.dbapi.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            catalog=catalog,
+            schema='default',
+            http_scheme='http',
+            http_session=self.http_sessions[catalog]
+        )
+        return connection, connection.cursor()
+
+    def execute_query(self, catalog_name: str, query: str, params: Optional[Sequence[Any]] = None,
+                      cursor=None) -> Dict[str, Any]:
+        """Execute a query (optionally with bound parameters) and return results with timing
+        
+        Without ``cursor`` a pooled connection is borrowed just for this statement.
+        """
+        if cursor is None:
+            with self.acquire(catalog_name) as (_, pooled_cursor):
+                return self.execute_query(catalog_name, query, params, pooled_cursor)
+        
         start_time = time.time()
         thread_id = threading.current_thread().name
         
         try:
-            connection = self.connections[catalog_name]
-            cursor = connection.cursor()
-            
-            cursor.execute(query)
+            cursor.execute(query, params)
             rows_count = cursor.rowcount if hasattr(cursor, 'rowcount') else 0
             
             end_time = time.time()
@@ -108,166 +246,211 @@ class ComprehensiveStressTester:
 
     def setup_stress_environment(self):
         """Setup schemas and tables for stress testing"""
-        setup_queries = [
-            # Schema creation for all catalogs
-            ("iceberg_polaris", "CREATE SCHEMA IF NOT EXISTS stress_test"),
-            ("iceberg_hms", "CREATE SCHEMA IF NOT EXISTS stress_test"),
-            ("iceberg_nessie", "CREATE SCHEMA IF NOT EXISTS stress_test"),
-        ]
+        per_catalog_steps = {
+            catalog_name: [
+                "CREATE SCHEMA IF NOT EXISTS stress_test",
+                # Drop any stale table, but don't fail if it doesn't exist
+                f"DROP TABLE IF EXISTS stress_test.{self.table_name}",
+                self._ddl[catalog_name],
+            ]
+            for catalog_name in self.catalogs
+        }
         
-        # Try to drop existing tables, but don't fail if they don't exist
-        drop_queries = [
-            ("iceberg_polaris", f"DROP TABLE IF EXISTS stress_test.{self.table_name}"),
-            ("iceberg_hms", f"DROP TABLE IF EXISTS stress_test.{self.table_name}"),
-            ("iceberg_nessie", f"DROP TABLE IF EXISTS stress_test.{self.table_name}")
-        ]
+        # Catalogs are independent: run each catalog's schema -> drop -> create chain concurrently
+        with ThreadPoolExecutor(max_workers=len(per_catalog_steps), thread_name_prefix="setup") as executor:
+            futures = [
+                executor.submit(self.setup_catalog_environment, catalog_name, *steps)
+                for catalog_name, steps in per_catalog_steps.items()
+            ]
+            errors = []
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append(e)
         
-        create_queries = [
-            # Table creation for all catalogs
-            ("iceberg_polaris", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    batch_id bigint,
-                    thread_id varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            ("iceberg_hms", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    batch_id bigint,
-                    thread_id varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            ("iceberg_nessie", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    batch_id bigint,
-                    thread_id varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """)
-        ]
+        if errors:
+            raise errors[0]
+
+    def setup_catalog_environment(self, catalog_name: str, schema_sql: str, drop_sql: str, create_sql: str):
+        """Create the schema, drop any stale table and create the stress table for one catalog
         
+        All three statements run on one borrowed connection so the chain reuses
+        a single keep-alive HTTP session.
+        """
+        with self.acquire(catalog_name) as (_, cursor):
+            self._setup_catalog_chain(catalog_name, cursor, schema_sql, drop_sql, create_sql)
+
+    def _setup_catalog_chain(self, catalog_name: str, cursor, schema_sql: str, drop_sql: str, create_sql: str):
         # Execute schema creation
-        for catalog_name, query in setup_queries:
-            try:
-                result = self.execute_query(catalog_name, query)
-                if result['success']:
-                    logger.info(f"Schema created for {catalog_name}")
-                else:
-                    logger.warning(f"Schema creation failed for {catalog_name}: {result.get('error')}")
-            except Exception as e:
-                logger.warning(f"Schema creation error for {catalog_name}: {e}")
+        try:
+            result = self.execute_query(catalog_name, schema_sql, cursor=cursor)
+            if result['success']:
+                logger.info(f"Schema created for {catalog_name}")
+            else:
+                logger.warning(f"Schema creation failed for {catalog_name}: {result.get('error')}")
+        except Exception as e:
+            logger.warning(f"Schema creation error for {catalog_name}: {e}")
         
-        # Drop existing tables
-        for catalog_name, query in drop_queries:
-            try:
-                result = self.execute_query(catalog_name, query)
-                if result['success']:
-                    logger.info(f"Dropped existing table for {catalog_name}")
-            except Exception as e:
-                logger.info(f"No existing table to drop for {catalog_name}")
+        # Drop existing table
+        try:
+            result = self.execute_query(catalog_name, drop_sql, cursor=cursor)
+            if result['success']:
+                logger.info(f"Dropped existing table for {catalog_name}")
+        except Exception as e:
+            logger.info(f"No existing table to drop for {catalog_name}")
         
-        # Create tables
-        for catalog_name, query in create_queries:
-            try:
-                result = self.execute_query(catalog_name, query)
-                if result['success']:
-                    logger.info(f"Table created for {catalog_name}")
-                else:
-                    logger.error(f"Table creation failed for {catalog_name}: {result.get('error')}")
-                    raise Exception(f"Failed to create table for {catalog_name}")
-            except Exception as e:
-                logger.error(f"Table creation error for {catalog_name}: {e}")
-                raise
-
-    def generate_stress_insert_query(self, table_name: str, batch_size: int, batch_id: int, thread_id: str) -> str:
-        """Generate INSERT query with random data for stress testing"""
-        values = []
-        base_id = batch_id * batch_size + random.randint(1, 1000000)
-        
-        for i in range(batch_size):
-            row_id = base_id + i
-            name = f"stress_test_{thread_id}_{batch_id}_{i}"
-            value = random.uniform(1.0, 1000.0)
-            random_data = ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=20))
-            
-            # Use current timestamp and date
-            values.append(
-                f"({row_id}, {batch_id}, '{thread_id}', '{name}', {value:.2f}, "
-                f"'{random_data}', current_timestamp, current_date)"
-            )
+        # Create table
+        try:
+            result = self.execute_query(catalog_name, create_sql, cursor=cursor)
+            if result['success']:
+                logger.info(f"Table created for {catalog_name}")
+            else:
+                logger.error(f"Table creation failed for {catalog_name}: {result.get('error')}")
+                raise Exception(f"Failed to create table for {catalog_name}")
+        except Exception as e:
+            logger.error(f"Table creation error for {catalog_name}: {e}")
+            raise
+
+    def thread_rng(self) -> np.random.Generator:
+        """Return this thread's NumPy generator, spawning it on first use"""
+        rng = getattr(self._rng_tls, 'rng', None)
+        if rng is None:
+            rng = self.spawn_rng()
+            self._rng_tls.rng = rng
+        return rng
+
+    def generate_stress_insert_query(self, batch_size: int, batch_id: int, thread_id: str) -> List[Tuple[Any, ...]]:
+        """Generate parameter tuples with random data for one stress INSERT batch"""
+        rng = self.thread_rng()
+        base_id = batch_id * batch_size + int(rng.integers(1, 1000001))
+        prefix = f"stress_test_{thread_id}_{batch_id}_"
+        
+        # Draw every random column for the batch in one vectorized call each
+        ids = range(base_id, base_id + batch_size)
+        values = np.round(rng.uniform(1.0, 1000.0, batch_size), 2).tolist()
+        blob = self._alphabet[rng.integers(0, len(self._alphabet), (batch_size, RANDOM_DATA_LENGTH))].tobytes().decode('ascii')
+        random_data = [blob[i:i + RANDOM_DATA_LENGTH] for i in range(0, len(blob), RANDOM_DATA_LENGTH)]
         
-        return f"INSERT INTO {table_name} VALUES {', '.join(values)}"
+        return [
+            (row_id, batch_id, thread_id, f"{prefix}{i}", value, data)
+            for i, (row_id, value, data) in enumerate(zip(ids, values, random_data))
+        ]
+
+    def generate_server_insert_params(self, batch_size: int, batch_id: int, thread_id: str) -> List[Any]:
+        """Generate the parameters for build_server_insert_statement for one batch"""
+        base_id = batch_id * batch_size + int(self.thread_rng().integers(1, 1000001))
+        prefix = f"stress_test_{thread_id}_{batch_id}_"
+        return [batch_id, thread_id, prefix, base_id, *batch_timestamp(), base_id,
+                (batch_size - 1) // SERVER_MAX_ROWS, base_id + batch_size - 1]
 
-    def stress_insert_worker(self, catalog_name: str, thread_num: int, batches: int, batch_size: int, delay_range: tuple):
-        """Worker function for stress testing inserts"""
-        results = []
+    def wait_for_slot(self):
+        """Block until the next send slot when a target rate is configured
+        
+        A single shared ``next_slot`` is advanced by ``1/target_qps`` per call,
+        so the aggregate rate is enforced without every thread sleeping.
+        """
+        if not self.slot_interval:
+            return
+        with self.pace_lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.slot_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def submit_insert(self, catalog_name: str, insert_sql: str, params: Sequence[Any]) -> Future:
+        """Submit an INSERT to the pipeline executor, or run it inline when pipelining is off"""
+        self.wait_for_slot()
+        
+        if self.pipeline_executor is None:
+            future = Future()
+            with self.in_flight:
+                future.set_result(self.execute_query(catalog_name, insert_sql, params))
+            return future
+        
+        semaphore = self.inflight_limits[catalog_name]
+        semaphore.acquire()
+        self.in_flight.acquire()
+        
+        def release(_):
+            self.in_flight.release()
+            semaphore.release()
+        
+        future = self.pipeline_executor.submit(self.execute_query, catalog_name, insert_sql, params)
+        future.add_done_callback(release)
+        return future
+
+    def stress_insert_worker(self, catalog_name: str, thread_num: int, batches: int, batch_size: int,
+                             delay_range: tuple, pipeline_depth: int = 1, payload_mode: str = 'values'):
+        """Worker function for stress testing inserts
+        
+        Up to ``pipeline_depth`` batches are kept in flight at once so the
+        worker keeps generating rows while earlier INSERTs wait on Trino.
+        ``payload_mode`` is 'values' (client-generated rows bound as
+        parameters) or 'server' (rows generated by Trino from an id range).
+        """
+        # Per-batch outcomes as parallel primitive arrays rather than one dict per batch
+        results = WorkerResults.allocate(catalog_name, batches)
+        pending = deque()
         thread_id = f"{catalog_name}-ST{thread_num}"
+        table_name = f"stress_test.{self.table_name}"
+        if payload_mode == 'server':
+            insert_sql = build_server_insert_statement(table_name)
+        else:
+            insert_sql = build_insert_statement(table_name, batch_size)
         
         logger.info(f"[{thread_id}] Starting stress test: {batches} batches of {batch_size} rows each")
         
+        def collect_oldest():
+            batch_id, future = pending.popleft()
+            result = future.result()
+            results.record(batch_id, result['duration'], result['timestamp'], result['success'],
+                           result.get('rows_count', 0), result.get('error'))
+            
+            if result['success']:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"[{thread_id}] Batch {batch_id + 1}/{batches} completed in {result['duration']:.2f}s")
+            else:
+                logger.error(f"[{thread_id}] Batch {batch_id + 1}/{batches} failed: {result.get('error')}")
+        
         for batch_id in range(batches):
             try:
-                # Generate INSERT query
-                query = self.generate_stress_insert_query(
-                    f"stress_test.{self.table_name}", batch_size, batch_id, thread_id
-                )
-                
-                # Execute the insert
-                result = self.execute_query(catalog_name, query)
-                result['batch_id'] = batch_id
-                result['batch_size'] = batch_size
-                results.append(result)
-                
-                if result['success']:
-                    logger.info(f"[{thread_id}] Batch {batch_id + 1}/{batches} completed in {result['duration']:.2f}s")
+                # Generate parameters for the prepared INSERT
+                if payload_mode == 'server':
+                    params = self.generate_server_insert_params(batch_size, batch_id, thread_id)
                 else:
-                    logger.error(f"[{thread_id}] Batch {batch_id + 1}/{batches} failed: {result.get('error')}")
+                    rows = self.generate_stress_insert_query(batch_size, batch_id, thread_id)
+                    params = batch_timestamp()
+                    params.extend(value for row in rows for value in row)
                 
-                # Random delay between batches
-                if batch_id < batches - 1:  # Don't delay after the last batch
-                    delay = random.uniform(*delay_range)
+                # Submit the insert, draining the oldest one once the pipeline is full
+                pending.append((batch_id, self.submit_insert(catalog_name, insert_sql, params)))
+                while len(pending) >= pipeline_depth:
+                    collect_oldest()
+                
+                # Optional think time between batches; pacing is normally left to wait_for_slot
+                if delay_range[1] > 0 and batch_id < batches - 1:  # Don't delay after the last batch
+                    delay = self.thread_rng().uniform(*delay_range)
                     time.sleep(delay)
                     
             except Exception as e:
                 logger.error(f"[{thread_id}] Exception in batch {batch_id}: {e}")
-                results.append({
-                    'catalog': catalog_name,
-                    'success': False,
-                    'error': str(e),
-                    'batch_id': batch_id,
-                    'thread_id': thread_id,
-                    'duration': 0,
-                    'timestamp': time.time()
-                })
-        
-        logger.info(f"[{thread_id}] Completed all {batches} batches")
+                results.record(batch_id, 0.0, time.time(), False, 0, str(e))
+        
+        while pending:
+            collect_oldest()
+        
+        succeeded = sum(results.success)
+        logger.info(
+            f"[{thread_id}] Completed all {batches} batches: {succeeded} succeeded, "
+            f"{batches - succeeded} failed, avg {results.moments[1]:.2f}s per successful batch"
+        )
         return results
 
-    def run_comprehensive_stress_test(self, threads_per_catalog=5, batches_per_thread=10, batch_size=100, delay_range=(0.1, 1.0)):
+    def run_comprehensive_stress_test(self, threads_per_catalog=5, batches_per_thread=10, batch_size=100,
+                                      delay_range=(0, 0), pipeline_depth=1, target_qps=None, max_in_flight=None,
+                                      payload_mode='values'):
         """Run comprehensive stress test on all catalogs"""
         logger.info("="*100)
         logger.info("STARTING COMPREHENSIVE INSERT STRESS TEST (POLARIS + HMS + NESSIE)")
@@ -277,11 +460,18 @@ class ComprehensiveStressTester:
         logger.info(f"  - Threads per catalog: {threads_per_catalog}")
         logger.info(f"  - Batches per thread: {batches_per_thread}")
         logger.info(f"  - Batch size: {batch_size}")
+        logger.info(f"  - In-flight batches per thread: {pipeline_depth}")
+        logger.info(f"  - Row payload: {payload_mode}")
         logger.info(f"  - Total rows per catalog: {threads_per_catalog * batches_per_thread * batch_size:,}")
         logger.info(f"  - Total rows across all catalogs: {len(self.catalogs) * threads_per_catalog * batches_per_thread * batch_size:,}")
         logger.info(f"  - Delay range: {delay_range}")
+        logger.info(f"  - Target rate: {f'{target_qps} batches/sec' if target_qps else 'unthrottled'}")
+        logger.info(f"  - Max in-flight INSERTs: {max_in_flight or 'unlimited'}")
         logger.info("="*100)
         
+        # Every in-flight statement needs its own pooled connection
+        self.ensure_pool_size(threads_per_catalog * pipeline_depth)
+        
         # Setup test environment
         print("Setting up comprehensive stress test environment...")
         self.setup_stress_environment()
@@ -293,27 +483,48 @@ class ComprehensiveStressTester:
         tasks = []
         total_threads = len(self.catalogs) * threads_per_catalog
         
-        with ThreadPoolExecutor(max_workers=total_threads) as executor:
-            # Submit tasks for each catalog
-            for catalog_name in self.catalogs:
-                for i in range(threads_per_catalog):
-                    task = executor.submit(
-                        self.stress_insert_worker,
-                        catalog_name,
-                        i + 1,
-                        batches_per_thread,
-                        batch_size,
-                        delay_range
-                    )
-                    tasks.append(task)
-            
-            # Collect results
-            for task in as_completed(tasks):
-                try:
-                    batch_results = task.result()
-                    all_results.extend(batch_results)
-                except Exception as e:
-                    logger.error(f"Task execution failed: {e}")
+        # Shared rate pacing and global in-flight cap
+        self.slot_interval = 1.0 / target_qps if target_qps else 0.0
+        self.next_slot = time.monotonic()
+        self.in_flight = threading.BoundedSemaphore(max_in_flight or total_threads * pipeline_depth)
+        
+        # Pipelined INSERTs run on their own executor, bounded per catalog
+        if pipeline_depth > 1:
+            self.pipeline_executor = ThreadPoolExecutor(
+                max_workers=total_threads * pipeline_depth, thread_name_prefix="insert-pipeline"
+            )
+            self.inflight_limits = {
+                catalog: threading.BoundedSemaphore(threads_per_catalog * pipeline_depth)
+                for catalog in self.catalogs
+            }
+        
+        try:
+            with ThreadPoolExecutor(max_workers=total_threads) as executor:
+                # Submit tasks for each catalog
+                for catalog_name in self.catalogs:
+                    for i in range(threads_per_catalog):
+                        task = executor.submit(
+                            self.stress_insert_worker,
+                            catalog_name,
+                            i + 1,
+                            batches_per_thread,
+                            batch_size,
+                            delay_range,
+                            pipeline_depth,
+                            payload_mode
+                        )
+                        tasks.append(task)
+                
+                # Collect results
+                for task in as_completed(tasks):
+                    try:
+                        all_results.append(task.result())
+                    except Exception as e:
+                        logger.error(f"Task execution failed: {e}")
+        finally:
+            if self.pipeline_executor is not None:
+                self.pipeline_executor.shutdown(wait=True)
+                self.pipeline_executor = None
         
         end_time = time.time()
         total_duration = end_time - start_time
@@ -323,12 +534,24 @@ class ComprehensiveStressTester:
         
         return all_results
 
-    def analyze_comprehensive_results(self, results: List[Dict[str, Any]], total_duration: float):
+    def analyze_comprehensive_results(self, results: List[WorkerResults], total_duration: float):
         """Analyze and print comprehensive stress test results"""
-        # Separate results by catalog
-        catalog_results = {}
-        for catalog in self.catalogs:
-            catalog_results[catalog] = [r for r in results if r['catalog'] == catalog]
+        # One pass over the workers buckets their buffers by catalog; each worker
+        # serves a single catalog, so no per-row catalog filtering is needed
+        buckets = {
+            catalog: {'success': [], 'durations': [], 'rows': [], 'errors': [], 'moments': (0.0, 0.0, 0.0)}
+            for catalog in self.catalogs
+        }
+        for w in results:
+            bucket = buckets[w.catalog]
+            bucket['success'].append(np.frombuffer(w.success, dtype=np.bool_))
+            bucket['durations'].append(np.frombuffer(w.durations, dtype=np.float64))
+            bucket['rows'].append(np.frombuffer(w.rows, dtype=np.int64))
+            bucket['errors'].extend(error for _, error in w.errors)
+            bucket['moments'] = merge_moments(bucket['moments'], tuple(w.moments))
+        
+        def concat(parts, dtype):
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
         
         print("\n" + "="*100)
         print("COMPREHENSIVE STRESS TEST RESULTS")
@@ -345,42 +568,46 @@ class ComprehensiveStressTester:
         performance_summary = {}
         
         for catalog, display_name in catalog_names.items():
-            catalog_ops = catalog_results[catalog]
-            success_ops = [r for r in catalog_ops if r['success']]
-            failed_ops = [r for r in catalog_ops if not r['success']]
+            bucket = buckets[catalog]
+            success = concat(bucket['success'], np.bool_)
+            total_ops = len(success)
+            success_count = int(np.count_nonzero(success))
+            failed_count = total_ops - success_count
             
             print(f"\n{display_name} ({catalog}):")
-            print(f"  Total operations: {len(catalog_ops)}")
-            print(f"  Successful: {len(success_ops)} ({len(success_ops)/len(catalog_ops)*100:.1f}%)")
-            print(f"  Failed: {len(failed_ops)} ({len(failed_ops)/len(catalog_ops)*100:.1f}%)")
+            print(f"  Total operations: {total_ops}")
+            print(f"  Successful: {success_count} ({success_count/total_ops*100:.1f}%)")
+            print(f"  Failed: {failed_count} ({failed_count/total_ops*100:.1f}%)")
             
-            if success_ops:
-                durations = [r['duration'] for r in success_ops]
-                total_rows = sum(r.get('rows_count', 0) for r in success_ops)
-                avg_duration = statistics.mean(durations)
+            if success_count:
+                catalog_durations = concat(bucket['durations'], np.float64)[success]
+                total_rows = int(concat(bucket['rows'], np.int64)[success].sum())
+                # Mean and sample stdev come from the merged Welford states, no extra pass
+                n, avg_duration, m2 = bucket['moments']
+                std_duration = math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
                 
                 print(f"  Total rows inserted: {total_rows:,}")
                 print(f"  Average duration: {avg_duration:.2f}s")
-                print(f"  Median duration: {statistics.median(durations):.2f}s")
-                print(f"  Min duration: {min(durations):.2f}s")
-                print(f"  Max duration: {max(durations):.2f}s")
-                print(f"  Std deviation: {statistics.stdev(durations) if len(durations) > 1 else 0:.2f}s")
+                print(f"  Median duration: {np.median(catalog_durations):.2f}s")
+                print(f"  Min duration: {catalog_durations.min():.2f}s")
+                print(f"  Max duration: {catalog_durations.max():.2f}s")
+                print(f"  Std deviation: {std_duration:.2f}s")
                 print(f"  Throughput: {total_rows/total_duration:.1f} rows/sec")
                 
                 performance_summary[catalog] = {
                     'avg_duration': avg_duration,
-                    'success_rate': len(success_ops)/len(catalog_ops)*100,
+                    'success_rate': success_count/total_ops*100,
                     'throughput': total_rows/total_duration,
                     'total_rows': total_rows
                 }
             
             # Show first few failures
-            if failed_ops:
+            if failed_count:
                 print(f"  Sample failures:")
-                for r in failed_ops[:3]:  # Show first 3 failures
-                    print(f"    - {r.get('error', 'Unknown error')}")
-                if len(failed_ops) > 3:
-                    print(f"    ... and {len(failed_ops) - 3} more failures")
+                for error in bucket['errors'][:3]:  # Show first 3 failures
+                    print(f"    - {error}")
+                if failed_count > 3:
+                    print(f"    ... and {failed_count - 3} more failures")
         
         # Performance comparison
         if len(performance_summary) > 1:
@@ -411,17 +638,23 @@ class ComprehensiveStressTester:
         print("\n" + "="*100)
 
     def cleanup(self):
-        """Clean up connections"""
-        for catalog, conn in self.connections.items():
-            if conn:
+        """Clean up pooled connections"""
+        for catalog, pool in self.pools.items():
+            closed = 0
+            while not pool.empty():
+                conn, cursor = pool.get_nowait()
                 try:
+                    cursor.close()
                     conn.close()
-                    logger.info(f"Closed connection to {catalog}")
+                    closed += 1
                 except Exception as e:
                     logger.warning(f"Error closing connection to {catalog}: {e}")
+            logger.info(f"Closed {closed} connection(s) to {catalog}")
 
 def main():
     """Main function to run the comprehensive stress tests"""
+    start_queue_logging()
+    
     print("COMPREHENSIVE INSERT STRESS TEST FOR POLARIS vs HMS vs NESSIE")
     print("="*80)
     
@@ -432,21 +665,24 @@ def main():
             'threads_per_catalog': 2,
             'batches_per_thread': 3,
             'batch_size': 30,
-            'delay_range': (0.5, 1.5)
+            'pipeline_depth': 1,
+            'target_qps': 5
         },
         {
             'name': 'Medium Load', 
             'threads_per_catalog': 3,
             'batches_per_thread': 5,
             'batch_size': 50,
-            'delay_range': (0.2, 1.0)
+            'pipeline_depth': 2,
+            'target_qps': 20
         },
         {
             'name': 'Heavy Load',
             'threads_per_catalog': 5,
             'batches_per_thread': 8,
             'batch_size': 80,
-            'delay_range': (0.1, 0.5)
+            'pipeline_depth': 4,
+            'target_qps': None
         }
     ]
     
@@ -465,14 +701,19 @@ def main():
         threads = int(input("Threads per catalog: "))
         batches = int(input("Batches per thread: "))
         batch_size = int(input("Batch size: "))
-        min_delay = float(input("Min delay between batches (seconds): "))
-        max_delay = float(input("Max delay between batches (seconds): "))
+        pipeline_depth = int(input("In-flight batches per thread (1 = sequential): ") or 1)
+        target_qps = input("Target batches/sec across all threads (blank = unthrottled): ").strip()
+        max_in_flight = input("Max in-flight INSERTs (blank = unlimited): ").strip()
+        payload_mode = input("Row payload - values (client rows) or server (Trino-generated) [values]: ").strip() or 'values'
         
         config = {
             'threads_per_catalog': threads,
             'batches_per_thread': batches,
             'batch_size': batch_size,
-            'delay_range': (min_delay, max_delay)
+            'pipeline_depth': pipeline_depth,
+            'target_qps': float(target_qps) if target_qps else None,
+            'max_in_flight': int(max_in_flight) if max_in_flight else None,
+            'payload_mode': payload_mode
         }
     elif choice in ["1", "2", "3"]:
         config = test_configs[int(choice) - 1]
@@ -491,8 +732,8 @@ def main():
         # Run comprehensive stress test
         results = tester.run_comprehensive_stress_test(**config)
         
-        total_ops = len(results)
-        successful_ops = len([r for r in results if r['success']])
+        total_ops = sum(len(w.success) for w in results)
+        successful_ops = sum(sum(w.success) for w in results)
         print(f"\nComprehensive stress test completed!")
         print(f"Total operations: {total_ops}")
         print(f"Successful operations: {successful_ops} ({successful_ops/total_ops*100:.1f}%)")
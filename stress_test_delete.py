@@ -4,106 +4,242 @@ Stress test for DELETE operations on Polaris, HMS, and Nessie catalogs
 This script performs intensive concurrent delete operations to test the limits
 """
 
+import argparse
+import asyncio
 import threading
 import time
-import random
 import logging
-import statistics
-from typing import List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import trino
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s'
-)
+import os
+import queue
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from log_setup import start_queue_logging
+from trino_pool import PooledTester
+
 logger = logging.getLogger(__name__)
 
-class DeleteStressTester:
-    def __init__(self, host='localhost', port=8081, user='admin'):
+# One row of test data: id, category, thread_group, name, value, random_data, created_at, partition_date, deleted
+INSERT_ROW_PLACEHOLDER = "(" + ", ".join(["?"] * 9) + ")"
+RANDOM_DATA_LENGTH = 50
+# WHERE clause of each DELETE pattern; the default ("by_id") deletes a single row
+DELETE_PREDICATES = {
+    "by_id_range": "id BETWEEN {start_id} AND {end_id}",
+    "by_category": "category = 'cat_{category}'",
+    "by_thread_group": "thread_group = 'group_{group}'",
+    "by_value_range": "value BETWEEN {min_val:.2f} AND {max_val:.2f}",
+    "random_sample": "id % {mod_val} = {remainder}",
+    "by_id": "id = {id_val}",
+    "by_partition": "true",
+}
+# Test rows are spread over this many daily partitions; each worker deletes only within its own
+PARTITION_DAYS = 30
+PARTITION_PREDICATE = "partition_date = DATE '{partition_date}'"
+DELETE_TYPES = ("by_id_range", "by_category", "by_thread_group", "by_value_range", "random_sample")
+# Opt-in whole-partition DELETE, which Iceberg can satisfy by dropping data files (metadata only)
+PARTITION_DELETE_TYPE = "by_partition"
+# Patterns that only flag rows (deleted = true) instead of removing them when delete_mode='soft'
+SOFT_DELETE_TYPES = ("by_value_range", "random_sample")
+DELETE_MODES = ("hard", "soft")
+
+
+# Delete stress table layout shared by every catalog
+_TABLE_DDL = """
+    CREATE TABLE stress_test.{t} (
+        id bigint,
+        category varchar,
+        thread_group varchar,
+        name varchar,
+        value double,
+        random_data varchar,
+        created_at timestamp,
+        partition_date date,
+        deleted boolean
+    ) WITH (
+        partitioning = ARRAY['partition_date']
+    )
+"""
+
+
+@lru_cache(maxsize=None)
+def build_insert_statement(table_name: str, batch_size: int) -> str:
+    """Build (once per table/batch size) the parameterized multi-row test data INSERT"""
+    return f"INSERT INTO {table_name} VALUES " + ", ".join([INSERT_ROW_PLACEHOLDER] * batch_size)
+
+
+@dataclass(slots=True)
+class OpResult:
+    """Outcome of one statement; fixed fields keep large result lists compact"""
+    catalog: str
+    duration: float
+    success: bool
+    timestamp: float
+    thread_id: str = ''
+    rows_count: Optional[int] = 0  # None when the server did not report a count
+    delete_type: str = ''
+    operation_num: int = 0
+    predicates: int = 1
+    error: Optional[str] = None
+
+
+class TokenBucket:
+    """Rate limiter shared by all workers of one catalog
+    
+    Refills ``rate`` tokens per second up to ``capacity``. Callers that find the bucket
+    empty reserve a future token and wait for it, so the aggregate rate holds exactly.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.ts = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+    
+    def acquire(self):
+        """Block the calling thread until a token is available"""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        """Suspend the calling coroutine until a token is available"""
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class DeleteStressTester(PooledTester):
+    def __init__(self, host='localhost', port=8081, user='admin', max_workers=32, collect_rowcount=True):
         self.host = host
         self.port = port
         self.user = user
-        self.polaris_conn = None
-        self.hms_conn = None
-        self.nessie_conn = None
+        self.catalogs = ["iceberg_polaris", "iceberg_hms", "iceberg_nessie"]
+        # Bounded pool of pre-opened (connection, cursor) pairs per catalog; a pair
+        # must only be used by the one thread that has borrowed it
+        self.pools: Dict[str, queue.Queue] = {}
+        self.pool_sizes: Dict[str, int] = {}
+        # One long-lived pool for every blocking trino call (setup, inserts, deletes);
+        # threads are only started as load requires and are released in cleanup()
+        self.max_workers = max_workers
+        # Drain a statement's result when the client has no update count yet (costs extra roundtrips)
+        self.collect_rowcount = collect_rowcount
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="delete-stress")
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        # Per-catalog rate limiters, set by run_stress_test when a target rate is given
+        self.buckets: Dict[str, TokenBucket] = {}
         # Use timestamp to create unique table names
         self.table_suffix = str(int(time.time()))
         self.table_name = f"delete_stress_{self.table_suffix}"
+        # Root of every random stream: each worker and the data loader get an independent child
+        self.seed_sequence = np.random.SeedSequence()
+        # Newest partition_date of the test data; older partitions count back from it
+        self.data_date = date.today()
+        # The table name is fixed from here on, so every DELETE statement is prebuilt once.
+        # Every statement is pinned to one partition so concurrent commits touch disjoint manifests
+        self._delete_templates = {
+            delete_type: f"DELETE FROM stress_test.{self.table_name} WHERE ({predicate}) AND {PARTITION_PREDICATE}"
+            for delete_type, predicate in DELETE_PREDICATES.items()
+        }
+        self._delete_templates[PARTITION_DELETE_TYPE] = f"DELETE FROM stress_test.{self.table_name} WHERE {PARTITION_PREDICATE}"
+        self._delete_prefix = f"DELETE FROM stress_test.{self.table_name} WHERE "
+        # Soft deletes skip rows already flagged, so a row is rewritten (and counted) only once
+        self._soft_delete_prefix = f"UPDATE stress_test.{self.table_name} SET deleted = true WHERE NOT deleted AND "
+        self._soft_delete_templates = {
+            delete_type: f"{self._soft_delete_prefix}({DELETE_PREDICATES[delete_type]}) AND {PARTITION_PREDICATE}"
+            for delete_type in SOFT_DELETE_TYPES
+        }
         self.setup_connections()
         
-    def setup_connections(self):
-        """Setup connections to all catalogs"""
+    def setup_connections(self, pool_size: int = 1):
+        """Setup a pool of connections for every catalog"""
         try:
-            # Connection for Polaris catalog (iceberg_polaris)
-            self.polaris_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_polaris',
-                schema='default'
-            )
-            logger.info("Connected to Polaris catalog")
+            for catalog_name in self.catalogs:
+                self.pools[catalog_name] = queue.Queue()
+                self.pool_sizes[catalog_name] = 0
             
-            # Connection for HMS catalog
-            self.hms_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_hms',
-                schema='default'
-            )
-            logger.info("Connected to HMS catalog")
-            
-            # Connection for Nessie catalog
-            self.nessie_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_nessie',
-                schema='default'
-            )
-            logger.info("Connected to Nessie catalog")
+            self.ensure_pool_size(pool_size)
             
         except Exception as e:
             logger.error(f"Failed to setup connections: {e}")
             raise
 
-    def execute_query(self, connection, query: str, catalog_name: str) -> Dict[str, Any]:
-        """Execute a query and return results with timing"""
+    def open_pool_entry(self, catalog_name: str):
+        """Open a (connection, cursor) pair; the cursor is reused for every statement on it"""
+        import trino  # deferred so startup (and --help) does not pay for the client import
+        
+        connection = trino.dbapi.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            catalog=catalog_name,
+            schema='default'
+        )
+        return connection, connection.cursor()
+
+    def execute_query(self, catalog_name: str, query: str, label: Optional[str] = None,
+                      cursor=None, params: Optional[Sequence[Any]] = None) -> OpResult:
+        """Execute a query (optionally with bound parameters) and return results with timing
+        
+        Without ``cursor`` a pooled connection's cursor is borrowed just for this statement.
+        ``label`` is reported as the result's catalog (defaults to ``catalog_name``).
+        """
+        if cursor is None:
+            with self.acquire(catalog_name) as (_, pooled_cursor):
+                return self.execute_query(catalog_name, query, label, pooled_cursor, params)
+        
+        label = label or catalog_name
+        # Wall clock for the reported timestamp, monotonic high-resolution clock for the duration
         start_time = time.time()
+        t0 = time.perf_counter()
         thread_id = threading.current_thread().name
         
         try:
-            cursor = connection.cursor()
-            cursor.execute(query)
-            rows_count = cursor.rowcount if hasattr(cursor, 'rowcount') else 0
+            cursor.execute(query, params)
+            rows_count = cursor.rowcount
+            if rows_count == -1 and self.collect_rowcount:
+                # Clients that do not drain update statements in execute() only know
+                # the count once the remaining result pages have been fetched
+                cursor.fetchall()
+                rows_count = cursor.rowcount
+            if rows_count == -1:
+                rows_count = None
             
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = time.perf_counter() - t0
             
-            return {
-                'catalog': catalog_name,
-                'duration': duration,
-                'rows_count': rows_count,
-                'success': True,
-                'thread_id': thread_id,
-                'timestamp': start_time
-            }
+            return OpResult(
+                catalog=label,
+                duration=duration,
+                success=True,
+                timestamp=start_time,
+                thread_id=thread_id,
+                rows_count=rows_count
+            )
             
         except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = time.perf_counter() - t0
             
-            return {
-                'catalog': catalog_name,
-                'duration': duration,
-                'success': False,
-                'error': str(e),
-                'thread_id': thread_id,
-                'timestamp': start_time
-            }
+            return OpResult(
+                catalog=label,
+                duration=duration,
+                success=False,
+                timestamp=start_time,
+                thread_id=thread_id,
+                error=str(e)
+            )
 
     def setup_stress_environment(self, total_rows_per_catalog=10000):
         """Setup schemas, tables and insert test data for delete stress testing"""
@@ -121,206 +257,383 @@ class DeleteStressTester:
         ]
         
         create_queries = [
-            ("iceberg_polaris", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    category varchar,
-                    thread_group varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            ("iceberg_hms", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    category varchar,
-                    thread_group varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            ("iceberg_nessie", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    category varchar,
-                    thread_group varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """)
+            (catalog_name, _TABLE_DDL.format(t=self.table_name)) for catalog_name in self.catalogs
         ]
         
-        # Execute setup
-        for catalog_name, query in setup_queries:
-            conn = self._get_connection(catalog_name)
-            result = self.execute_query(conn, query, catalog_name)
-            if not result['success']:
-                logger.warning(f"Schema creation warning for {catalog_name}: {result.get('error')}")
-        
-        for catalog_name, query in drop_queries:
-            conn = self._get_connection(catalog_name)
-            result = self.execute_query(conn, query, catalog_name)
-        
-        for catalog_name, query in create_queries:
-            conn = self._get_connection(catalog_name)
-            result = self.execute_query(conn, query, catalog_name)
-            if not result['success']:
-                logger.error(f"Table creation failed for {catalog_name}: {result.get('error')}")
+        # Execute setup: phases stay ordered, catalogs run in parallel within each phase
+        def run_phase(phase_queries):
+            return zip((catalog_name for catalog_name, _ in phase_queries),
+                       self.executor.map(lambda cq: self.execute_query(*cq), phase_queries))
+        
+        for catalog_name, result in run_phase(setup_queries):
+            if not result.success:
+                logger.warning(f"Schema creation warning for {catalog_name}: {result.error}")
+        
+        list(run_phase(drop_queries))
+        
+        for catalog_name, result in run_phase(create_queries):
+            if not result.success:
+                logger.error(f"Table creation failed for {catalog_name}: {result.error}")
                 raise Exception(f"Failed to create table in {catalog_name}")
         
         # Insert test data for each catalog
         logger.info(f"Inserting {total_rows_per_catalog:,} test rows per catalog...")
         self._insert_test_data(total_rows_per_catalog)
 
-    def _get_connection(self, catalog_name: str):
-        """Get connection for a catalog"""
-        if catalog_name == "iceberg_polaris":
-            return self.polaris_conn
-        elif catalog_name == "iceberg_hms":
-            return self.hms_conn
-        else:  # iceberg_nessie
-            return self.nessie_conn
+    def generate_test_batch(self, rng: np.random.Generator, batch_start: int, batch_end: int,
+                            current_date: date) -> List[Any]:
+        """Generate the flat INSERT parameters for test rows ``batch_start``..``batch_end``
+        
+        Each row lands in a random one of the last PARTITION_DAYS daily partitions. The day is
+        drawn independently of ``id`` because category (``id % 10``) and thread group
+        (``id % 100``) are derived from it: an id-based day would leave exactly one category
+        per partition.
+        """
+        rows = batch_end - batch_start
+        
+        # Draw every random column for the batch in one vectorized call each
+        ids = np.arange(batch_start + 1, batch_end + 1)
+        values = np.round(rng.uniform(1.0, 1000.0, rows), 2).tolist()
+        partition_days = np.datetime64(current_date, 'D') - rng.integers(0, PARTITION_DAYS, rows).astype('timedelta64[D]')
+        created_at = (partition_days.astype('datetime64[s]') + rng.integers(0, 86400, rows).astype('timedelta64[s]')).tolist()
+        partition_dates = partition_days.tolist()
+        # random_data: one os.urandom call per batch, hex-encoded and sliced into 50-char strings
+        blob = os.urandom(rows * RANDOM_DATA_LENGTH // 2).hex()
+        random_data = [blob[i:i + RANDOM_DATA_LENGTH] for i in range(0, len(blob), RANDOM_DATA_LENGTH)]
+        
+        params = []
+        for id_val, value, data, ts, partition_date in zip(ids.tolist(), values, random_data, created_at, partition_dates):
+            params += (
+                id_val,
+                f"cat_{(id_val - 1) % 10}",  # 10 categories
+                f"group_{(id_val - 1) % 100}",  # 100 thread groups
+                f"test_record_{id_val}",
+                value,
+                data,
+                ts,
+                partition_date,
+                False,
+            )
+        return params
 
     def _insert_test_data(self, total_rows_per_catalog: int):
-        """Insert test data for delete operations"""
-        batch_size = 1000
-        current_date = time.strftime('%Y-%m-%d')
+        """Insert test data for delete operations
         
-        catalogs = ["iceberg_polaris", "iceberg_hms", "iceberg_nessie"]
+        Each batch is generated once and the same rows are inserted into every
+        catalog concurrently, so all catalogs start from an identical dataset.
+        """
+        batch_size = 1000
+        rng = self.spawn_rng()
         
-        for catalog_name in catalogs:
-            conn = self._get_connection(catalog_name)
-            logger.info(f"Inserting test data for {catalog_name}...")
+        for batch_start in range(0, total_rows_per_catalog, batch_size):
+            batch_end = min(batch_start + batch_size, total_rows_per_catalog)
+            insert_query = build_insert_statement(f"stress_test.{self.table_name}", batch_end - batch_start)
+            params = self.generate_test_batch(rng, batch_start, batch_end, self.data_date)
             
-            for batch_start in range(0, total_rows_per_catalog, batch_size):
-                batch_end = min(batch_start + batch_size, total_rows_per_catalog)
-                values = []
-                
-                for i in range(batch_start, batch_end):
-                    id_val = i + 1
-                    category = f"'cat_{i % 10}'"  # 10 categories
-                    thread_group = f"'group_{i % 100}'"  # 100 thread groups
-                    name = f"'test_record_{id_val}'"
-                    value = round(random.uniform(1.0, 1000.0), 2)
-                    random_data = f"'{''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=50))}'"
-                    created_at = f"TIMESTAMP '{current_date} {random.randint(0,23):02d}:{random.randint(0,59):02d}:{random.randint(0,59):02d}'"
-                    partition_date = f"DATE '{current_date}'"
-                    
-                    values.append(f"({id_val}, {category}, {thread_group}, {name}, {value}, {random_data}, {created_at}, {partition_date})")
-                
-                insert_query = f"INSERT INTO stress_test.{self.table_name} VALUES {', '.join(values)}"
-                result = self.execute_query(conn, insert_query, catalog_name)
-                
-                if not result['success']:
-                    logger.error(f"Failed to insert test data batch for {catalog_name}: {result.get('error')}")
+            futures = {
+                catalog_name: self.executor.submit(self.execute_query, catalog_name, insert_query, params=params)
+                for catalog_name in self.catalogs
+            }
+            for catalog_name, future in futures.items():
+                result = future.result()
+                if not result.success:
+                    logger.error(f"Failed to insert test data batch for {catalog_name}: {result.error}")
                     raise Exception(f"Failed to insert test data for {catalog_name}")
-                
-                logger.info(f"Inserted batch {batch_start}-{batch_end} for {catalog_name}")
-
-    def generate_delete_query(self, thread_id: str, delete_type: str) -> str:
-        """Generate different types of DELETE queries"""
-        table_name = f"stress_test.{self.table_name}"
-        
-        if delete_type == "by_id_range":
-            # Delete by ID range
-            start_id = random.randint(1, 9000)
-            end_id = start_id + random.randint(10, 100)
-            return f"DELETE FROM {table_name} WHERE id BETWEEN {start_id} AND {end_id}"
-        
-        elif delete_type == "by_category":
-            # Delete by category
-            category = random.randint(0, 9)
-            return f"DELETE FROM {table_name} WHERE category = 'cat_{category}'"
-        
-        elif delete_type == "by_thread_group":
-            # Delete by thread group
-            group = random.randint(0, 99)
-            return f"DELETE FROM {table_name} WHERE thread_group = 'group_{group}'"
-        
-        elif delete_type == "by_value_range":
-            # Delete by value range
-            min_val = random.uniform(1.0, 500.0)
-            max_val = min_val + random.uniform(50.0, 200.0)
-            return f"DELETE FROM {table_name} WHERE value BETWEEN {min_val:.2f} AND {max_val:.2f}"
-        
-        elif delete_type == "random_sample":
-            # Delete random sample by mod
-            mod_val = random.randint(50, 200)
-            remainder = random.randint(0, mod_val - 1)
-            return f"DELETE FROM {table_name} WHERE id % {mod_val} = {remainder}"
+            
+            logger.info(f"Inserted batch {batch_start}-{batch_end} into {len(self.catalogs)} catalogs")
+
+    def build_delete_plan(self, rng: np.random.Generator, delete_operations: int, delay_range: tuple,
+                          partition_delete: bool = False) -> Tuple[List[str], List[Dict[str, Any]], List[float]]:
+        """Draw the delete type, predicate values and trailing delay of every operation up front
+        
+        Returns parallel lists (delete_type, template params, delay) indexed by operation.
+        With ``partition_delete`` the last operation drops the worker's whole partition
+        instead, so the row-level operations before it still find rows to delete.
+        """
+        n = delete_operations
+        start_ids = rng.integers(1, 9001, n)
+        mod_vals = rng.integers(50, 201, n)
+        min_vals = rng.uniform(1.0, 500.0, n)
+        
+        # Predicate values per delete type, one vectorized draw per column
+        columns = {
+            "by_id_range": {"start_id": start_ids, "end_id": start_ids + rng.integers(10, 101, n)},
+            "by_category": {"category": rng.integers(0, 10, n)},
+            "by_thread_group": {"group": rng.integers(0, 100, n)},
+            "by_value_range": {"min_val": min_vals, "max_val": min_vals + rng.uniform(50.0, 200.0, n)},
+            "random_sample": {"mod_val": mod_vals, "remainder": (rng.random(n) * mod_vals).astype(np.int64)},
+        }
+        columns = {dt: {name: arr.tolist() for name, arr in cols.items()} for dt, cols in columns.items()}
         
-        else:
-            # Default: delete by single ID
-            id_val = random.randint(1, 10000)
-            return f"DELETE FROM {table_name} WHERE id = {id_val}"
+        delete_types = [DELETE_TYPES[i] for i in rng.integers(0, len(DELETE_TYPES), n).tolist()]
+        params = [
+            {name: values[i] for name, values in columns[delete_type].items()}
+            for i, delete_type in enumerate(delete_types)
+        ]
+        if partition_delete and n:
+            delete_types[-1] = PARTITION_DELETE_TYPE
+            params[-1] = {}
+        delays = rng.uniform(*delay_range, n).tolist()
+        return delete_types, params, delays
+
+    def render_delete_query(self, delete_type: str, params: Dict[str, Any], partition_date: date,
+                            soft: bool = False) -> str:
+        """Render a planned operation into its prebuilt DELETE (or soft-delete UPDATE) statement"""
+        templates = self._soft_delete_templates if soft else self._delete_templates
+        return templates[delete_type].format(partition_date=partition_date, **params)
+
+    def render_batch_query(self, ops: List[Tuple[str, Dict[str, Any]]], partition_date: date,
+                           soft: bool = False) -> str:
+        """Render several planned operations as one statement whose predicates are OR-combined"""
+        if len(ops) == 1:
+            return self.render_delete_query(ops[0][0], ops[0][1], partition_date, soft)
+        prefix = self._soft_delete_prefix if soft else self._delete_prefix
+        predicates = " OR ".join(f"({DELETE_PREDICATES[delete_type].format(**params)})" for delete_type, params in ops)
+        return f"{prefix}({predicates}) AND {PARTITION_PREDICATE.format(partition_date=partition_date)}"
+
+    def build_delete_statements(self, plan_types: List[str], plan_params: List[Dict[str, Any]], partition_date: date,
+                                delete_mode: str, batch_delete_size: int) -> List[Tuple[str, str, int, int]]:
+        """Coalesce consecutive planned operations into statements of up to ``batch_delete_size`` predicates
+        
+        Returns (delete_type label, query, first operation index, predicate count) per statement.
+        Within a batch, soft-delete predicates go to one UPDATE and the rest to one DELETE.
+        """
+        statements = []
+        for start in range(0, len(plan_types), batch_delete_size):
+            groups: Dict[bool, List[Tuple[str, Dict[str, Any]]]] = {False: [], True: []}
+            for delete_type, params in zip(plan_types[start:start + batch_delete_size],
+                                           plan_params[start:start + batch_delete_size]):
+                soft = delete_mode == 'soft' and delete_type in SOFT_DELETE_TYPES
+                groups[soft].append((delete_type, params))
+            
+            for soft, ops in groups.items():
+                if not ops:
+                    continue
+                label = ops[0][0] if len(ops) == 1 else f"batch_of_{len(ops)}"
+                if soft:
+                    label = f"{label} (soft)"
+                statements.append((label, self.render_batch_query(ops, partition_date, soft), start, len(ops)))
+        return statements
+
+    def render_flush_query(self, ops: List[Tuple[str, Dict[str, Any], date]], soft: bool = False) -> str:
+        """Render queued operations, possibly from different partitions, as one OR-combined statement"""
+        prefix = self._soft_delete_prefix if soft else self._delete_prefix
+        return prefix + "(" + " OR ".join(
+            f"(({DELETE_PREDICATES[delete_type].format(**params)}) AND {PARTITION_PREDICATE.format(partition_date=partition_date)})"
+            for delete_type, params, partition_date in ops
+        ) + ")"
+
+    async def run_query_async(self, catalog_name: str, query: str, label: str) -> OpResult:
+        """Run a statement on the shared executor, at most ``max_in_flight`` at a time"""
+        async with self._in_flight:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.execute_query, catalog_name, query, label
+            )
+
+    async def deletion_flusher(self, catalog_name: str, deletion_queue: asyncio.Queue,
+                               flush_size: int, flush_interval: float) -> List[OpResult]:
+        """Drain a catalog's deletion queue into combined statements
+        
+        Queued operations are buffered (hard and soft separately) and flushed as one
+        statement once ``flush_size`` are waiting or ``flush_interval`` seconds after the
+        first one arrived. A ``None`` item flushes what is left and stops the flusher.
+        """
+        loop = asyncio.get_running_loop()
+        flusher_id = f"{catalog_name}-DF"
+        results = []
+        buffers: Dict[bool, List[Tuple[str, Dict[str, Any], date]]] = {False: [], True: []}
+        deadline = None
+        
+        async def flush(soft: bool):
+            ops = buffers[soft]
+            if not ops:
+                return
+            buffers[soft] = []
+            delete_type = f"flush_of_{len(ops)}" + (" (soft)" if soft else "")
+            result = await self.run_query_async(catalog_name, self.render_flush_query(ops, soft), flusher_id)
+            result.delete_type = delete_type
+            result.operation_num = len(results) + 1
+            result.predicates = len(ops)
+            results.append(result)
+            if not result.success:
+                logger.error(f"[{flusher_id}] Flush {len(results)} failed: {result.error}")
+        
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                item = await asyncio.wait_for(deletion_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                await flush(False)
+                await flush(True)
+                deadline = None
+                continue
+            
+            if item is None:
+                await flush(False)
+                await flush(True)
+                break
+            
+            delete_type, params, partition_date, soft = item
+            buffers[soft].append((delete_type, params, partition_date))
+            if deadline is None:
+                deadline = loop.time() + flush_interval
+            if len(buffers[soft]) >= flush_size:
+                await flush(soft)
+                if not buffers[not soft]:
+                    deadline = None
+        
+        logger.info(f"[{flusher_id}] Flushed {sum(r.predicates for r in results)} queued deletes "
+                    f"in {len(results)} statements")
+        return results
 
-    def stress_delete_worker(self, catalog_name: str, thread_num: int, delete_operations: int, delay_range: tuple):
-        """Worker function for stress testing deletes"""
-        conn = self._get_connection(catalog_name)
+    async def stress_delete_worker(self, catalog_name: str, thread_num: int,
+                                   delete_operations: int, delay_range: tuple, delete_mode: str = 'hard',
+                                   batch_delete_size: int = 1, deletion_queue: Optional[asyncio.Queue] = None,
+                                   rng: Optional[np.random.Generator] = None, partition_delete: bool = False):
+        """Worker coroutine for stress testing deletes
+        
+        Each DELETE runs on the shared executor with a connection borrowed for that statement,
+        so a worker occupies an OS thread only while a query is in flight, not while
+        it waits between operations. With ``delete_mode='soft'`` the SOFT_DELETE_TYPES
+        patterns flag rows via UPDATE instead of deleting them. ``batch_delete_size``
+        consecutive operations are OR-combined into a single statement (and commit).
+        Worker ``thread_num`` only touches partition ``(thread_num - 1) % PARTITION_DAYS``.
+        
+        With a ``deletion_queue`` the worker executes nothing itself: it enqueues each
+        planned operation for the catalog's deletion_flusher and returns no results.
+        When the catalog has a token bucket, operations are paced by it instead of by
+        the planned random delays. ``rng`` is the worker's own generator (spawned if omitted).
+        With ``partition_delete`` the worker's last operation deletes its whole partition.
+        """
         results = []
         thread_id = f"{catalog_name}-DT{thread_num}"
-        
-        delete_types = ["by_id_range", "by_category", "by_thread_group", "by_value_range", "random_sample"]
-        
-        logger.info(f"[{thread_id}] Starting delete stress test: {delete_operations} delete operations")
-        
-        for op_num in range(delete_operations):
+        plan_types, plan_params, plan_delays = self.build_delete_plan(
+            rng or self.spawn_rng(), delete_operations, delay_range, partition_delete
+        )
+        partition_date = self.data_date - timedelta(days=(thread_num - 1) % PARTITION_DAYS)
+        
+        bucket = self.buckets.get(catalog_name)
+        
+        if deletion_queue is not None:
+            for op_num, delete_type in enumerate(plan_types):
+                soft = delete_mode == 'soft' and delete_type in SOFT_DELETE_TYPES
+                if bucket:
+                    await bucket.acquire_async()
+                await deletion_queue.put((delete_type, plan_params[op_num], partition_date, soft))
+                if not bucket and op_num < delete_operations - 1:
+                    await asyncio.sleep(plan_delays[op_num])
+            logger.info(f"[{thread_id}] Queued all {delete_operations} delete operations")
+            return results
+        
+        statements = self.build_delete_statements(plan_types, plan_params, partition_date, delete_mode,
+                                                  batch_delete_size)
+        
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"[{thread_id}] Starting delete stress test: {delete_operations} delete operations "
+                         f"in {len(statements)} statements")
+        
+        for stmt_num, (delete_type, query, first_op, predicates) in enumerate(statements):
             try:
-                # Choose random delete type
-                delete_type = random.choice(delete_types)
-                query = self.generate_delete_query(thread_id, delete_type)
-                
-                logger.info(f"[{thread_id}] Executing delete operation {op_num + 1}/{delete_operations} ({delete_type})")
-                result = self.execute_query(conn, query, thread_id)
-                result['delete_type'] = delete_type
-                result['operation_num'] = op_num + 1
+                if bucket:
+                    await bucket.acquire_async()
+                if debug:
+                    logger.debug(f"[{thread_id}] Executing delete statement {stmt_num + 1}/{len(statements)} ({delete_type})")
+                result = await self.run_query_async(catalog_name, query, thread_id)
+                result.delete_type = delete_type
+                result.operation_num = first_op + 1
+                result.predicates = predicates
                 results.append(result)
                 
-                if result['success']:
-                    rows_deleted = result.get('rows_count', 0)
-                    logger.info(f"[{thread_id}] Delete {op_num + 1} completed in {result['duration']:.2f}s - {rows_deleted} rows deleted")
+                if result.success:
+                    if debug:
+                        logger.debug(f"[{thread_id}] Delete {stmt_num + 1} completed in {result.duration:.2f}s - "
+                                     f"{result.rows_count} rows deleted")
                 else:
-                    logger.error(f"[{thread_id}] Delete {op_num + 1} failed: {result.get('error')}")
+                    logger.error(f"[{thread_id}] Delete {stmt_num + 1} failed: {result.error}")
                 
-                # Random delay between operations
-                if op_num < delete_operations - 1:
-                    delay = random.uniform(*delay_range)
-                    time.sleep(delay)
+                # Random delay between statements
+                if not bucket and stmt_num < len(statements) - 1:
+                    await asyncio.sleep(plan_delays[first_op])
                     
             except Exception as e:
-                logger.error(f"[{thread_id}] Exception in delete operation {op_num}: {e}")
-                results.append({
-                    'catalog': thread_id,
-                    'success': False,
-                    'error': str(e),
-                    'duration': 0,
-                    'timestamp': time.time(),
-                    'delete_type': 'error',
-                    'operation_num': op_num + 1
-                })
-        
-        logger.info(f"[{thread_id}] Completed all {delete_operations} delete operations")
+                logger.error(f"[{thread_id}] Exception in delete statement {stmt_num}: {e}")
+                results.append(OpResult(
+                    catalog=thread_id,
+                    duration=0.0,
+                    success=False,
+                    timestamp=time.time(),
+                    delete_type='error',
+                    operation_num=first_op + 1,
+                    predicates=predicates,
+                    error=str(e)
+                ))
+        
+        succeeded = [r.duration for r in results if r.success]
+        avg_duration = sum(succeeded) / len(succeeded) if succeeded else 0.0
+        logger.info(
+            f"[{thread_id}] Completed all {delete_operations} delete operations: {len(succeeded)} statements succeeded, "
+            f"{len(results) - len(succeeded)} failed, avg {avg_duration:.2f}s per successful statement"
+        )
         return results
 
-    def run_stress_test(self, threads_per_catalog=3, delete_operations_per_thread=20, delay_range=(0.1, 1.0), initial_rows=10000):
-        """Run comprehensive delete stress test"""
+    async def _run_delete_workers(self, max_in_flight: int, threads_per_catalog: int,
+                                  delete_operations_per_thread: int, delay_range: tuple,
+                                  delete_mode: str, batch_delete_size: int, flush_size: Optional[int],
+                                  flush_interval: float, partition_delete: bool) -> List[OpResult]:
+        """Run every catalog's delete workers (and deletion flushers, if enabled) on one event loop"""
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        queues = {catalog_name: asyncio.Queue() for catalog_name in self.catalogs} if flush_size else {}
+        flushers = [
+            asyncio.ensure_future(self.deletion_flusher(catalog_name, deletion_queue,
+                                                        flush_size, flush_interval))
+            for catalog_name, deletion_queue in queues.items()
+        ]
+        workers = [
+            self.stress_delete_worker(catalog_name, i + 1, delete_operations_per_thread, delay_range,
+                                      delete_mode, batch_delete_size, queues.get(catalog_name), self.spawn_rng(),
+                                      partition_delete)
+            for catalog_name in self.catalogs
+            for i in range(threads_per_catalog)
+        ]
+        
+        outcomes = await asyncio.gather(*workers, return_exceptions=True)
+        for deletion_queue in queues.values():
+            await deletion_queue.put(None)
+        outcomes += await asyncio.gather(*flushers, return_exceptions=True)
+        
+        all_results = []
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                logger.error(f"Task failed: {outcome}")
+            else:
+                all_results.extend(outcome)
+        return all_results
+
+    def run_stress_test(self, threads_per_catalog=3, delete_operations_per_thread=20, delay_range=(0.1, 1.0), initial_rows=10000,
+                        max_in_flight: Optional[int] = None, delete_mode: str = 'hard', batch_delete_size: int = 1,
+                        flush_size: Optional[int] = None, flush_interval: float = 0.5,
+                        target_ops_per_sec: Optional[float] = None, seed: Optional[int] = None,
+                        partition_delete: bool = False):
+        """Run comprehensive delete stress test
+        
+        ``max_in_flight`` caps the DELETEs executing at once across all catalogs
+        (defaults to one per worker). ``delete_mode`` is 'hard' or 'soft' (see
+        stress_delete_worker); run both to compare them side by side. ``batch_delete_size``
+        sets how many delete predicates each statement combines (1 = unbatched).
+        With ``flush_size`` workers instead enqueue their operations and one flusher per
+        catalog issues a combined statement per ``flush_size`` operations or ``flush_interval``
+        seconds (``batch_delete_size`` is then unused). ``target_ops_per_sec`` paces each
+        catalog with a shared token bucket in place of the per-worker ``delay_range`` sleeps.
+        A ``seed`` makes the test data and every worker's delete plan reproducible.
+        ``partition_delete`` ends each worker with a whole-partition (metadata-only) DELETE.
+        """
+        if delete_mode not in DELETE_MODES:
+            raise ValueError(f"Unknown delete_mode {delete_mode!r}, expected one of {DELETE_MODES}")
+        max_in_flight = max_in_flight or threads_per_catalog * len(self.catalogs)
+        if max_in_flight > self.max_workers:
+            logger.warning(f"max_in_flight={max_in_flight} exceeds the executor's {self.max_workers} threads; "
+                           f"at most {self.max_workers} deletes will run at once")
         logger.info("="*80)
         logger.info("STARTING DELETE STRESS TEST")
         logger.info("="*80)
@@ -329,61 +642,68 @@ class DeleteStressTester:
         logger.info(f"  - Delete operations per thread: {delete_operations_per_thread}")
         logger.info(f"  - Total delete operations per catalog: {threads_per_catalog * delete_operations_per_thread}")
         logger.info(f"  - Initial rows per catalog: {initial_rows:,}")
-        logger.info(f"  - Delay range: {delay_range}")
+        if target_ops_per_sec:
+            logger.info(f"  - Target rate: {target_ops_per_sec} ops/sec per catalog")
+        else:
+            logger.info(f"  - Delay range: {delay_range}")
+        logger.info(f"  - Max in-flight deletes: {max_in_flight}")
+        logger.info(f"  - Delete mode: {delete_mode}")
+        if flush_size:
+            logger.info(f"  - Deletion queue: flush every {flush_size} operations or {flush_interval}s")
+        else:
+            logger.info(f"  - Predicates per delete statement: {batch_delete_size}")
+        if partition_delete:
+            logger.info(f"  - Final operation per worker: whole-partition delete")
         logger.info("="*80)
         
         # Setup test environment with initial data
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.ensure_pool_size(threads_per_catalog)
+        self.buckets = {
+            catalog_name: TokenBucket(target_ops_per_sec) for catalog_name in self.catalogs
+        } if target_ops_per_sec else {}
+        
         print("Setting up delete stress test environment...")
         self.setup_stress_environment(initial_rows)
         
-        start_time = time.time()
-        all_results = []
+        start_time = time.perf_counter()
         
-        # Create tasks for all catalogs
-        tasks = []
-        with ThreadPoolExecutor(max_workers=threads_per_catalog * 3) as executor:
-            # Submit tasks for all catalogs
-            for catalog_name in ["iceberg_polaris", "iceberg_hms", "iceberg_nessie"]:
-                for i in range(threads_per_catalog):
-                    task = executor.submit(
-                        self.stress_delete_worker,
-                        catalog_name,
-                        i + 1,
-                        delete_operations_per_thread,
-                        delay_range
-                    )
-                    tasks.append(task)
-            
-            # Collect results
-            for task in as_completed(tasks):
-                try:
-                    results = task.result()
-                    all_results.extend(results)
-                except Exception as e:
-                    logger.error(f"Task failed: {e}")
+        # Workers are coroutines; blocking trino calls run on the shared executor
+        all_results = asyncio.run(self._run_delete_workers(
+            max_in_flight, threads_per_catalog, delete_operations_per_thread, delay_range, delete_mode,
+            batch_delete_size, flush_size, flush_interval, partition_delete
+        ))
         
-        end_time = time.time()
-        total_duration = end_time - start_time
+        total_duration = time.perf_counter() - start_time
         
         # Analyze results
         self.analyze_delete_results(all_results, total_duration)
         
         return all_results
 
-    def analyze_delete_results(self, results: List[Dict[str, Any]], total_duration: float):
+    def analyze_delete_results(self, results: List[OpResult], total_duration: float):
         """Analyze and print delete stress test results"""
-        # Separate results by catalog
-        polaris_results = [r for r in results if 'iceberg_polaris-DT' in r['catalog']]
-        hms_results = [r for r in results if 'iceberg_hms-DT' in r['catalog']]
-        nessie_results = [r for r in results if 'iceberg_nessie-DT' in r['catalog']]
-        
-        # Calculate success/failure counts
-        polaris_success = [r for r in polaris_results if r['success']]
-        polaris_failed = [r for r in polaris_results if not r['success']]
-        hms_success = [r for r in hms_results if r['success']]
-        hms_failed = [r for r in hms_results if not r['success']]
-        nessie_success = [r for r in nessie_results if r['success']]
-        nessie_failed = [r for r in nessie_results if not r['success']]
+        import pandas as pd  # only needed once the run is over
+        
+        # One DataFrame, aggregated by catalog in a single groupby per statistic
+        df = pd.DataFrame({
+            'catalog': [r.catalog for r in results],
+            'duration': np.fromiter((r.duration for r in results), dtype=np.float64, count=len(results)),
+            'success': np.fromiter((r.success for r in results), dtype=bool, count=len(results)),
+            'rows_count': [r.rows_count for r in results],
+            'delete_type': [r.delete_type for r in results],
+            'error': [r.error for r in results],
+        })
+        df['catalog_kind'] = df['catalog'].astype(str).str.extract(r'^(iceberg_[a-z]+)-D[TF]', expand=False)
+        df['rows_count'] = df['rows_count'].fillna(0)
+        
+        success = df[df['success']]
+        op_counts = df.groupby('catalog_kind')['success'].agg(['size', 'sum'])
+        by_catalog = success.groupby('catalog_kind')['duration']
+        duration_stats = by_catalog.agg(['mean', 'median', 'min', 'max'])
+        duration_stats['std'] = by_catalog.std(ddof=0)  # population std: 0 rather than NaN for one sample
+        rows_deleted = success.groupby('catalog_kind')['rows_count'].sum()
+        type_breakdown = success.groupby(['catalog_kind', 'delete_type'], sort=False)['rows_count'].agg(['size', 'sum'])
         
         print("\n" + "="*80)
         print("DELETE STRESS TEST RESULTS")
@@ -392,60 +712,57 @@ class DeleteStressTester:
         
         # Results for each catalog
         catalog_data = [
-            ("POLARIS CATALOG (iceberg_polaris)", polaris_results, polaris_success, polaris_failed),
-            ("HIVE METASTORE CATALOG (iceberg_hms)", hms_results, hms_success, hms_failed),
-            ("NESSIE CATALOG (iceberg_nessie)", nessie_results, nessie_success, nessie_failed)
+            ("POLARIS CATALOG (iceberg_polaris)", "iceberg_polaris"),
+            ("HIVE METASTORE CATALOG (iceberg_hms)", "iceberg_hms"),
+            ("NESSIE CATALOG (iceberg_nessie)", "iceberg_nessie")
         ]
         
         performance_summary = {}
         
-        for catalog_name, all_ops, success_ops, failed_ops in catalog_data:
+        for catalog_name, kind in catalog_data:
+            total_ops = int(op_counts['size'].get(kind, 0))
+            success_count = int(op_counts['sum'].get(kind, 0))
+            failed_count = total_ops - success_count
+            
             print(f"\n{catalog_name}:")
-            print(f"  Total operations: {len(all_ops)}")
-            if all_ops:
-                print(f"  Successful: {len(success_ops)} ({len(success_ops)/len(all_ops)*100:.1f}%)")
-                print(f"  Failed: {len(failed_ops)} ({len(failed_ops)/len(all_ops)*100:.1f}%)")
+            print(f"  Total operations: {total_ops}")
+            if total_ops:
+                print(f"  Successful: {success_count} ({success_count/total_ops*100:.1f}%)")
+                print(f"  Failed: {failed_count} ({failed_count/total_ops*100:.1f}%)")
             
-            if success_ops:
-                durations = [r['duration'] for r in success_ops]
-                total_rows_deleted = sum(r.get('rows_count', 0) for r in success_ops)
-                avg_duration = statistics.mean(durations)
+            if success_count:
+                stats = duration_stats.loc[kind]
+                total_rows_deleted = int(rows_deleted[kind])
+                avg_duration = float(stats['mean'])
                 
                 print(f"  Total rows deleted: {total_rows_deleted:,}")
                 print(f"  Average duration: {avg_duration:.2f}s")
-                print(f"  Median duration: {statistics.median(durations):.2f}s")
-                print(f"  Min duration: {min(durations):.2f}s")
-                print(f"  Max duration: {max(durations):.2f}s")
-                print(f"  Std deviation: {statistics.stdev(durations) if len(durations) > 1 else 0:.2f}s")
-                print(f"  Delete throughput: {len(success_ops)/total_duration:.1f} ops/sec")
+                print(f"  Median duration: {stats['median']:.2f}s")
+                print(f"  Min duration: {stats['min']:.2f}s")
+                print(f"  Max duration: {stats['max']:.2f}s")
+                print(f"  Std deviation: {stats['std']:.2f}s")
+                print(f"  Delete throughput: {success_count/total_duration:.1f} ops/sec")
                 
                 # Delete type breakdown
-                delete_types = {}
-                for r in success_ops:
-                    dt = r.get('delete_type', 'unknown')
-                    if dt not in delete_types:
-                        delete_types[dt] = {'count': 0, 'rows': 0}
-                    delete_types[dt]['count'] += 1
-                    delete_types[dt]['rows'] += r.get('rows_count', 0)
-                
                 print(f"  Delete type breakdown:")
-                for dt, stats in delete_types.items():
-                    print(f"    {dt}: {stats['count']} ops, {stats['rows']} rows")
+                for dt, row in type_breakdown.loc[kind].iterrows():
+                    print(f"    {dt}: {int(row['size'])} ops, {int(row['sum'])} rows")
                 
                 performance_summary[catalog_name] = {
                     'avg_duration': avg_duration,
-                    'success_rate': len(success_ops)/len(all_ops)*100,
-                    'throughput': len(success_ops)/total_duration,
+                    'success_rate': success_count/total_ops*100,
+                    'throughput': success_count/total_duration,
                     'total_rows_deleted': total_rows_deleted
                 }
             
             # Show sample failures
-            if failed_ops:
+            if failed_count:
+                errors = df.loc[(df['catalog_kind'] == kind) & ~df['success'], 'error']
                 print(f"  Sample failures:")
-                for r in failed_ops[:3]:
-                    print(f"    - {r.get('error', 'Unknown error')}")
-                if len(failed_ops) > 3:
-                    print(f"    ... and {len(failed_ops) - 3} more failures")
+                for error in errors.head(3):
+                    print(f"    - {error if isinstance(error, str) else 'Unknown error'}")
+                if failed_count > 3:
+                    print(f"    ... and {failed_count - 3} more failures")
         
         # Performance comparison
         if len(performance_summary) > 1:
@@ -467,16 +784,21 @@ class DeleteStressTester:
         print("\n" + "="*80)
 
     def cleanup(self):
-        """Clean up connections"""
-        if self.polaris_conn:
-            self.polaris_conn.close()
-        if self.hms_conn:
-            self.hms_conn.close()
-        if self.nessie_conn:
-            self.nessie_conn.close()
+        """Clean up the executor and connections"""
+        self.executor.shutdown(wait=True)
+        for pool in self.pools.values():
+            while not pool.empty():
+                connection, cursor = pool.get_nowait()
+                cursor.close()
+                connection.close()
 
 def main():
     """Main function to run the delete stress tests"""
+    parser = argparse.ArgumentParser(description="DELETE stress test for Polaris, HMS and Nessie catalogs")
+    parser.add_argument('--verbose', action='store_true', help="log every delete statement (DEBUG)")
+    args = parser.parse_args()
+    start_queue_logging(logging.DEBUG if args.verbose else logging.INFO)
+    
     print("DELETE STRESS TEST FOR POLARIS vs HIVE METASTORE vs NESSIE")
     print("="*60)
     
@@ -522,12 +844,24 @@ def main():
         initial_rows = int(input("Initial rows per catalog: "))
         min_delay = float(input("Min delay between operations (seconds): "))
         max_delay = float(input("Max delay between operations (seconds): "))
+        max_in_flight = input("Max in-flight deletes (blank = one per worker): ").strip()
+        delete_mode = input("Delete mode (hard/soft) [hard]: ").strip() or 'hard'
+        batch_delete_size = int(input("Delete predicates per statement [1]: ").strip() or 1)
+        flush_size = input("Deletion queue flush size (blank = no queue): ").strip()
+        target_rate = input("Target ops/sec per catalog (blank = use delay range): ").strip()
+        partition_delete = input("End each worker with a whole-partition delete? (y/N): ").strip().lower() == 'y'
         
         config = {
             'threads_per_catalog': threads,
             'delete_operations_per_thread': delete_ops,
             'delay_range': (min_delay, max_delay),
-            'initial_rows': initial_rows
+            'initial_rows': initial_rows,
+            'max_in_flight': int(max_in_flight) if max_in_flight else None,
+            'delete_mode': delete_mode,
+            'batch_delete_size': batch_delete_size,
+            'flush_size': int(flush_size) if flush_size else None,
+            'target_ops_per_sec': float(target_rate) if target_rate else None,
+            'partition_delete': partition_delete
         }
     elif choice in ["1", "2", "3"]:
         config = test_configs[int(choice) - 1]
@@ -546,7 +880,7 @@ def main():
         results = tester.run_stress_test(**config)
         
         total_ops = len(results)
-        successful_ops = len([r for r in results if r['success']])
+        successful_ops = sum(r.success for r in results)
         print(f"\nDelete stress test completed!")
         print(f"Total operations: {total_ops}")
         print(f"Successful operations: {successful_ops} ({successful_ops/total_ops*100:.1f}%)")
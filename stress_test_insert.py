@@ -4,85 +4,219 @@ Stress test for INSERT operations on Polaris and Hive Metastore catalogs
 This script performs intensive concurrent insert operations to test the limits
 """
 
+import argparse
+import asyncio
 import threading
 import time
-import random
 import logging
-import statistics
-from typing import List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+import os
+import queue
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 import trino
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s'
-)
+from log_setup import start_queue_logging
+from trino_pool import PooledTester
+
 logger = logging.getLogger(__name__)
 
-class InsertStressTester:
+CATALOGS = ("iceberg_polaris", "iceberg_hms", "iceberg_nessie")
+
+# One stress row: id, batch_id, thread_id, name, value, random_data, created_at, partition_date
+ROW_WIDTH = 8
+INSERT_ROW_PLACEHOLDER = "(" + ", ".join(["?"] * ROW_WIDTH) + ")"
+STRESS_TABLE_DDL = """
+    CREATE TABLE {table_name} (
+        id bigint,
+        batch_id bigint,
+        thread_id varchar,
+        name varchar,
+        value double,
+        random_data varchar,
+        created_at timestamp,
+        partition_date date
+    ) WITH (
+        partitioning = ARRAY['partition_date']
+    )
+"""
+# Trino's sequence() returns at most this many elements; larger server-generated INSERTs cross-join two sequences
+SERVER_MAX_ROWS = 10000
+# Bound VALUES rows are sent as SQL literals (~180 chars each); beyond this many rows one INSERT
+# risks Trino's default query.max-length of 1,000,000 characters
+VALUES_MAX_ROWS_HINT = 5000
+PAYLOAD_MODES = ('values', 'server')
+COMMIT_MODES = ('direct', 'staged')
+# Coalesced INSERT payloads each worker lets its producer generate ahead of submission
+PREFETCH_PAYLOADS = 2
+# Per-row name template; %-formatting of a single int is cheaper than an f-string
+NAME_TMPL = "stress_test_%d"
+RANDOM_DATA_ALPHABET = np.frombuffer(b'abcdefghijklmnopqrstuvwxyz0123456789', dtype='S1')
+# random_data values are 10-100 char slices of one pregenerated blob of this size
+RANDOM_DATA_BLOB_SIZE = 1 << 20
+RANDOM_DATA_MIN_LENGTH = 10
+RANDOM_DATA_MAX_LENGTH = 100
+# Rows are spread over this many daily partitions counting back from today (1 = today only)
+DEFAULT_PARTITION_SPREAD = 30
+
+
+def build_stress_rows(rng: np.random.Generator, blob: str, batch_size: int, batch_id: int,
+                      thread_id: str, partition_spread: int = 1) -> List[Tuple[Any, ...]]:
+    """Generate native-typed row tuples for one stress INSERT batch from ``rng`` and the payload ``blob``
+    
+    ``partition_date`` is drawn from the last ``partition_spread`` days and ``created_at``
+    falls on that same day.
+    """
+    today = date.today()
+    partition_dates = [today - timedelta(days=d) for d in range(partition_spread)]
+    midnights = [datetime.combine(d, datetime.min.time()) for d in partition_dates]
+    
+    # Draw every column for the whole batch in one vectorized call each
+    ids = rng.integers(1, 10_000_001, size=batch_size).tolist()
+    values = np.round(rng.uniform(1.0, 10000.0, size=batch_size), 2).tolist()
+    offsets = rng.integers(0, RANDOM_DATA_BLOB_SIZE - RANDOM_DATA_MAX_LENGTH, size=batch_size)
+    ends = (offsets + rng.integers(RANDOM_DATA_MIN_LENGTH, RANDOM_DATA_MAX_LENGTH + 1, size=batch_size)).tolist()
+    offsets = offsets.tolist()
+    seconds = rng.integers(0, 86400, size=batch_size).tolist()
+    days = rng.integers(0, partition_spread, size=batch_size).tolist()
+    
+    return [
+        (id_val, batch_id, thread_id, NAME_TMPL % id_val, value_val,
+         blob[off:end], midnights[day] + timedelta(seconds=sec), partition_dates[day])
+        for id_val, value_val, off, end, sec, day in zip(ids, values, offsets, ends, seconds, days)
+    ]
+
+
+def build_blob_pool(rng: np.random.Generator) -> str:
+    """Generate the opaque payload blob that random_data values are sliced from"""
+    return rng.choice(RANDOM_DATA_ALPHABET, size=RANDOM_DATA_BLOB_SIZE).tobytes().decode()
+
+
+# Payload blob of a payload worker process, set by init_payload_worker
+_worker_blob: str = ""
+
+
+def init_payload_worker(blob: str):
+    """ProcessPoolExecutor initializer: receive the payload blob once per process"""
+    global _worker_blob
+    _worker_blob = blob
+
+
+def generate_payload_in_worker(first_batch: int, last_batch: int, batch_size: int, thread_id: str,
+                               partition_spread: int = 1,
+                               seed: Optional[np.random.SeedSequence] = None) -> List[Any]:
+    """Generate the flat bound-parameter list for a coalesced INSERT inside a payload worker process"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for batch_id in range(first_batch, last_batch):
+        rows.extend(build_stress_rows(rng, _worker_blob, batch_size, batch_id, thread_id, partition_spread))
+    return list(chain.from_iterable(rows))
+
+
+@lru_cache(maxsize=None)
+def build_insert_statement(table_name: str, batch_size: int) -> str:
+    """Build (once per table/batch size) the parameterized multi-row INSERT"""
+    return f"INSERT INTO {table_name} VALUES " + ", ".join([INSERT_ROW_PLACEHOLDER] * batch_size)
+
+
+@lru_cache(maxsize=None)
+def build_server_insert_statement(table_name: str) -> str:
+    """Build the INSERT that has Trino generate a coalesced group of rows itself
+    
+    Parameters: base id, first batch id, batch size, thread id, base id, partition spread,
+    number of SERVER_MAX_ROWS blocks - 1, row count - 1. Row ``n`` gets id ``base + n``, batch id
+    ``first_batch + n / batch_size`` and a partition day drawn from the last ``partition spread``
+    days. Row numbers come from two cross-joined sequences, so a group may exceed SERVER_MAX_ROWS.
+    """
+    return (
+        f"INSERT INTO {table_name} "
+        "SELECT ? + t.n, ? + t.n / ?, ?, concat('stress_test_', CAST(? + t.n AS varchar)), "
+        "round(1 + random() * 9999, 2), "
+        "lower(substr(to_hex(sha512(to_utf8(CAST(uuid() AS varchar)))), 1, 10 + CAST(floor(random() * 91) AS integer))), "
+        "date_add('second', CAST(floor(random() * 86400) AS bigint), CAST(t.day AS timestamp)), t.day "
+        "FROM (SELECT s.n, date_add('day', -CAST(floor(random() * ?) AS bigint), current_date) AS day "
+        f"FROM (SELECT hi * {SERVER_MAX_ROWS} + lo AS n FROM UNNEST(sequence(0, ?)) AS h(hi) "
+        f"CROSS JOIN UNNEST(sequence(0, {SERVER_MAX_ROWS - 1})) AS l(lo)) s "
+        "WHERE s.n <= ?) t"
+    )
+
+
+class InsertStressTester(PooledTester):
     def __init__(self, host='localhost', port=8081, user='admin'):
         self.host = host
         self.port = port
         self.user = user
-        self.polaris_conn = None
-        self.hms_conn = None
-        self.nessie_conn = None
+        # Per-catalog pools of Trino connections; each connection serves one statement at a time
+        self.pools: Dict[str, queue.Queue] = {catalog: queue.Queue() for catalog in CATALOGS}
+        self.pool_sizes: Dict[str, int] = {catalog: 0 for catalog in CATALOGS}
+        # Bound while run_stress_test is driving the async workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._gen_executor: Optional[Executor] = None
+        self.partition_spread = DEFAULT_PARTITION_SPREAD
+        self._thread_local = threading.local()
+        # Quiet runs replace per-batch log lines with these counters and a once-per-second reporter
+        self.quiet = False
+        self._ops_ok = 0
+        self._ops_failed = 0
+        self._rows_done = 0
+        self._in_flight: Dict[str, asyncio.Semaphore] = {}
         # Use timestamp to create unique table names
         self.table_suffix = str(int(time.time()))
         self.table_name = f"insert_stress_{self.table_suffix}"
+        # Every generator is spawned from this sequence; run_stress_test(seed=...) re-seeds it
+        self.seed_sequence = np.random.SeedSequence()
+        self.rng = self.spawn_rng()
+        # Opaque payload blob generated once; each row takes a random slice of it
+        self.blob_pool = build_blob_pool(self.rng)
         self.setup_connections()
         
     def setup_connections(self):
         """Setup connections to all catalogs"""
         try:
-            # Connection for Polaris catalog (iceberg_polaris)
-            self.polaris_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_polaris',
-                schema='default'
-            )
-            logger.info("Connected to Polaris catalog")
-            
-            # Connection for HMS catalog
-            self.hms_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_hms',
-                schema='default'
-            )
-            logger.info("Connected to HMS catalog")
-            
-            # Connection for Nessie catalog
-            self.nessie_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_nessie',
-                schema='default'
-            )
-            logger.info("Connected to Nessie catalog")
-            
+            self.ensure_pool_size(1)
         except Exception as e:
             logger.error(f"Failed to setup connections: {e}")
             raise
 
-    def execute_query(self, connection, query: str, catalog_name: str) -> Dict[str, Any]:
-        """Execute a query and return results with timing"""
-        start_time = time.time()
-        thread_id = threading.current_thread().name
+    def open_pool_entry(self, catalog_name: str):
+        """Open one pooled connection to ``catalog_name``"""
+        return trino.dbapi.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            catalog=catalog_name,
+            schema='default',
+            # Bound INSERTs go out as one EXECUTE IMMEDIATE request, never the legacy
+            # PREPARE / EXECUTE / DEALLOCATE round trips
+            legacy_prepared_statements=False
+        )
+
+    def execute_query(self, connection, query: str, catalog_name: str,
+                      params: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """Execute a query (optionally with bound parameters) and return results with timing"""
+        start_time = time.time()  # wall clock, reported as the result timestamp
+        t0 = time.perf_counter_ns()
+        try:
+            thread_id = self._thread_local.name
+        except AttributeError:
+            # First statement on this thread: look the name up once and cache it
+            thread_id = self._thread_local.name = threading.current_thread().name
         
         try:
             cursor = connection.cursor()
             
-            cursor.execute(query)
-            rows_count = cursor.rowcount if hasattr(cursor, 'rowcount') else 0
+            cursor.execute(query, params)
+            # execute() has already drained the statement; -1 means Trino reported no update count
+            rows_count = cursor.rowcount
+            if rows_count < 0:
+                rows_count = None
             
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = (time.perf_counter_ns() - t0) / 1e9
             
             return {
                 'catalog': catalog_name,
@@ -94,8 +228,7 @@ class InsertStressTester:
             }
             
         except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = (time.perf_counter_ns() - t0) / 1e9
             
             return {
                 'catalog': catalog_name,
@@ -108,182 +241,295 @@ class InsertStressTester:
 
     def setup_stress_environment(self):
         """Setup schemas and tables for stress testing"""
-        setup_queries = [
-            # Polaris setup
-            ("iceberg_polaris", "CREATE SCHEMA IF NOT EXISTS stress_test"),
-            
-            # HMS setup
-            ("iceberg_hms", "CREATE SCHEMA IF NOT EXISTS stress_test"),
-            
-            # Nessie setup
-            ("iceberg_nessie", "CREATE SCHEMA IF NOT EXISTS stress_test"),
-        ]
-        
-        # Try to drop existing tables, but don't fail if they don't exist
-        drop_queries = [
-            ("iceberg_polaris", f"DROP TABLE IF EXISTS stress_test.{self.table_name}"),
-            ("iceberg_hms", f"DROP TABLE IF EXISTS stress_test.{self.table_name}"),
-            ("iceberg_nessie", f"DROP TABLE IF EXISTS stress_test.{self.table_name}")
-        ]
+        table_name = f"stress_test.{self.table_name}"
+        
+        for catalog_name in CATALOGS:
+            # One borrowed connection runs the catalog's whole DDL chain
+            with self.acquire(catalog_name) as conn:
+                # Execute schema creation
+                result = self.execute_query(conn, "CREATE SCHEMA IF NOT EXISTS stress_test", catalog_name)
+                if not result['success']:
+                    logger.warning(f"Schema creation warning for {catalog_name}: {result.get('error')}")
+                
+                # Try to drop existing tables, but don't fail if they don't exist
+                result = self.execute_query(conn, f"DROP TABLE IF EXISTS {table_name}", catalog_name)
+                if not result['success']:
+                    logger.info(f"Table drop info for {catalog_name}: {result.get('error')}")
+                
+                # Create tables
+                result = self.execute_query(conn, STRESS_TABLE_DDL.format(table_name=table_name), catalog_name)
+                if not result['success']:
+                    logger.error(f"Table creation failed for {catalog_name}: {result.get('error')}")
+                    raise Exception(f"Failed to create table in {catalog_name}")
+
+    def generate_stress_rows(self, batch_size: int, batch_id: int, thread_id: str, partition_spread: int = 1,
+                             rng: Optional[np.random.Generator] = None) -> List[Tuple[Any, ...]]:
+        """Generate native-typed row tuples for one stress INSERT batch (from ``rng``, else ``self.rng``)"""
+        return build_stress_rows(rng or self.rng, self.blob_pool, batch_size, batch_id, thread_id, partition_spread)
+
+    def execute_pooled(self, catalog_name: str, query: str, label: str,
+                       params: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """Execute a query on a connection borrowed from the catalog pool"""
+        with self.acquire(catalog_name) as conn:
+            return self.execute_query(conn, query, label, params)
+
+    async def run_insert_async(self, catalog_name: str, query: str, label: str,
+                               params: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """Run a blocking INSERT on the worker pool, capped per catalog by the in-flight semaphore"""
+        async with self._in_flight[catalog_name]:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.execute_pooled, catalog_name, query, label, params
+            )
+
+    def generate_insert_params(self, first_batch: int, last_batch: int, batch_size: int, thread_id: str,
+                               partition_spread: int = 1,
+                               seed: Optional[np.random.SeedSequence] = None) -> List[Any]:
+        """Generate the flat bound-parameter list for batches ``first_batch``..``last_batch - 1``"""
+        rng = np.random.default_rng(seed) if seed is not None else self.rng
+        rows = []
+        for batch_id in range(first_batch, last_batch):
+            rows.extend(self.generate_stress_rows(batch_size, batch_id, thread_id, partition_spread, rng))
+        return list(chain.from_iterable(rows))
+
+    def payload_function(self):
+        """Callable the producers submit to the generator pool (picklable when it is a process pool)"""
+        if isinstance(self._gen_executor, ProcessPoolExecutor):
+            return generate_payload_in_worker
+        return self.generate_insert_params
+
+    def generate_server_insert_params(self, first_batch: int, last_batch: int, batch_size: int, thread_id: str,
+                                      rng: Optional[np.random.Generator] = None) -> List[Any]:
+        """Generate the build_server_insert_statement parameters for a coalesced group"""
+        row_count = (last_batch - first_batch) * batch_size
+        base_id = int((rng or self.rng).integers(1, 10_000_001 - row_count))
+        return [base_id, first_batch, batch_size, thread_id, base_id, self.partition_spread,
+                (row_count - 1) // SERVER_MAX_ROWS, row_count - 1]
+
+    async def payload_producer(self, payloads: asyncio.Queue, thread_id: str, batches: int,
+                               batch_size: int, coalesce_factor: int, payload_mode: str,
+                               seed: np.random.SeedSequence):
+        """Generate each coalesced INSERT payload ahead of the worker
+        
+        'values' payloads are built on the generator pool; 'server' payloads are
+        just an id range, so they are computed inline. Every payload draws from its
+        own child of the worker's ``seed``, so the data does not depend on which
+        pool thread or process generated it.
+        """
+        loop = asyncio.get_running_loop()
+        generate = self.payload_function()
+        try:
+            for batch_id in range(0, batches, coalesce_factor):
+                last_batch = min(batch_id + coalesce_factor, batches)
+                payload_seed = seed.spawn(1)[0]
+                try:
+                    if payload_mode == 'server':
+                        params = self.generate_server_insert_params(batch_id, last_batch, batch_size, thread_id,
+                                                                    np.random.default_rng(payload_seed))
+                    else:
+                        params = await loop.run_in_executor(
+                            self._gen_executor, generate, batch_id, last_batch, batch_size, thread_id,
+                            self.partition_spread, payload_seed
+                        )
+                except Exception as e:
+                    # Handed to the worker so the failure is recorded against these batches
+                    params = e
+                await payloads.put((batch_id, last_batch, params))
+        finally:
+            await payloads.put(None)
+
+    async def stress_insert_worker(self, catalog_name: str, thread_num: int, batches: int, batch_size: int,
+                                   delay_range: tuple, coalesce_factor: int = 1, payload_mode: str = 'values',
+                                   commit_mode: str = 'direct', seed: Optional[np.random.SeedSequence] = None):
+        """Worker coroutine for stress testing inserts
+        
+        ``coalesce_factor`` consecutive batches are sent as one INSERT, so the worker
+        commits ``ceil(batches / coalesce_factor)`` snapshots instead of ``batches``.
+        Payloads are generated by a producer up to ``PREFETCH_PAYLOADS`` INSERTs ahead,
+        overlapping row generation with the INSERT in flight. ``payload_mode`` is
+        'values' (client-generated rows bound as parameters) or 'server' (rows
+        generated by Trino from an id range).
+        
+        With ``commit_mode='staged'`` the batches go to a worker-private staging
+        table and are published to the shared table in one INSERT ... SELECT at
+        the end, so the shared table sees one commit per worker.
+        
+        ``seed`` (default: a fresh child of ``seed_sequence``) drives this worker's
+        delays and payloads through generators no other worker touches.
+        """
+        if seed is None:
+            seed = self.seed_sequence.spawn(1)[0]
+        rng = np.random.default_rng(seed)
+        # One slot per coalesced INSERT, filled by index; only a failed publish is appended
+        results: List[Optional[Dict[str, Any]]] = [None] * -(-batches // coalesce_factor)
+        thread_id = f"{catalog_name}-ST{thread_num}"
+        target_table = f"stress_test.{self.table_name}"
+        table_name = target_table
         
-        create_queries = [
-            # Polaris table creation
-            ("iceberg_polaris", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    batch_id bigint,
-                    thread_id varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            # HMS table creation
-            ("iceberg_hms", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    batch_id bigint,
-                    thread_id varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            # Nessie table creation
-            ("iceberg_nessie", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    batch_id bigint,
-                    thread_id varchar,
-                    name varchar,
-                    value double,
-                    random_data varchar,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """)
-        ]
+        logger.info(f"[{thread_id}] Starting stress test: {batches} batches of {batch_size} rows each"
+                    f" ({coalesce_factor} batches per INSERT)")
         
-        # Execute schema creation
-        for catalog_name, query in setup_queries:
-            if catalog_name == "iceberg_polaris":
-                conn = self.polaris_conn
-            elif catalog_name == "iceberg_hms":
-                conn = self.hms_conn
-            else:  # iceberg_nessie
-                conn = self.nessie_conn
-            result = self.execute_query(conn, query, catalog_name)
-            if not result['success']:
-                logger.warning(f"Schema creation warning for {catalog_name}: {result.get('error')}")
-        
-        # Try to drop tables (ignore failures)
-        for catalog_name, query in drop_queries:
-            if catalog_name == "iceberg_polaris":
-                conn = self.polaris_conn
-            elif catalog_name == "iceberg_hms":
-                conn = self.hms_conn
-            else:  # iceberg_nessie
-                conn = self.nessie_conn
-            result = self.execute_query(conn, query, catalog_name)
-            if not result['success']:
-                logger.info(f"Table drop info for {catalog_name}: {result.get('error')}")
-        
-        # Create tables
-        for catalog_name, query in create_queries:
-            if catalog_name == "iceberg_polaris":
-                conn = self.polaris_conn
-            elif catalog_name == "iceberg_hms":
-                conn = self.hms_conn
-            else:  # iceberg_nessie
-                conn = self.nessie_conn
-            result = self.execute_query(conn, query, catalog_name)
+        if commit_mode == 'staged':
+            table_name = f"{target_table}_stage_{thread_num}"
+            # Unpartitioned copy of the target's columns; the publish step partitions the rows
+            result = await self.run_insert_async(
+                catalog_name, f"CREATE TABLE {table_name} (LIKE {target_table})", thread_id
+            )
             if not result['success']:
-                logger.error(f"Table creation failed for {catalog_name}: {result.get('error')}")
-                raise Exception(f"Failed to create table in {catalog_name}")
-
-    def generate_stress_insert_query(self, table_name: str, batch_size: int, batch_id: int, thread_id: str) -> str:
-        """Generate INSERT query with stress test data"""
-        values = []
-        current_date = time.strftime('%Y-%m-%d')
-        
-        for i in range(batch_size):
-            id_val = random.randint(1, 10000000)
-            name_val = f"'stress_test_{id_val}'"
-            value_val = round(random.uniform(1.0, 10000.0), 2)
-            
-            # Generate random data to simulate real-world scenarios
-            random_data = f"'{''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=random.randint(10, 100)))}'"
-            
-            created_at = f"TIMESTAMP '{current_date} {random.randint(0,23):02d}:{random.randint(0,59):02d}:{random.randint(0,59):02d}'"
-            partition_date = f"DATE '{current_date}'"
-            
-            values.append(f"({id_val}, {batch_id}, '{thread_id}', {name_val}, {value_val}, {random_data}, {created_at}, {partition_date})")
-        
-        return f"INSERT INTO {table_name} VALUES {', '.join(values)}"
-
-    def stress_insert_worker(self, catalog_name: str, thread_num: int, batches: int, batch_size: int, delay_range: tuple):
-        """Worker function for stress testing inserts"""
-        if catalog_name == "iceberg_polaris":
-            conn = self.polaris_conn
-        elif catalog_name == "iceberg_hms":
-            conn = self.hms_conn
-        else:  # iceberg_nessie
-            conn = self.nessie_conn
-            
-        results = []
-        thread_id = f"{catalog_name}-ST{thread_num}"
+                logger.error(f"[{thread_id}] Staging table creation failed: {result.get('error')}")
+                results[0] = result
+                return results
         
-        logger.info(f"[{thread_id}] Starting stress test: {batches} batches of {batch_size} rows each")
+        payloads: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_PAYLOADS)
+        producer = asyncio.ensure_future(
+            self.payload_producer(payloads, thread_id, batches, batch_size, coalesce_factor, payload_mode, seed)
+        )
         
-        for batch_id in range(batches):
+        while (payload := await payloads.get()) is not None:
+            batch_id, last_batch, params = payload
             try:
-                query = self.generate_stress_insert_query(
-                    f"stress_test.{self.table_name}", 
-                    batch_size, 
-                    batch_id, 
-                    thread_id
-                )
+                if isinstance(params, Exception):
+                    raise params
+                row_count = (last_batch - batch_id) * batch_size
+                if payload_mode == 'server':
+                    insert_query = build_server_insert_statement(table_name)
+                else:
+                    insert_query = build_insert_statement(table_name, row_count)
                 
-                logger.info(f"[{thread_id}] Executing batch {batch_id + 1}/{batches}")
-                result = self.execute_query(conn, query, thread_id)
-                results.append(result)
+                if not self.quiet:
+                    logger.info(f"[{thread_id}] Executing batches {batch_id + 1}-{last_batch}/{batches} ({row_count} rows)")
+                # One statement per coalesced group: bound parameters, a single Iceberg commit
+                result = await self.run_insert_async(catalog_name, insert_query, thread_id, params)
+                results[batch_id // coalesce_factor] = result
                 
                 if result['success']:
-                    logger.info(f"[{thread_id}] Batch {batch_id + 1} completed in {result['duration']:.2f}s")
+                    self._ops_ok += 1
+                    self._rows_done += row_count
+                    if not self.quiet:
+                        logger.info(f"[{thread_id}] Batches {batch_id + 1}-{last_batch} completed in {result['duration']:.2f}s")
                 else:
-                    logger.error(f"[{thread_id}] Batch {batch_id + 1} failed: {result.get('error')}")
+                    self._ops_failed += 1
+                    logger.error(f"[{thread_id}] Batches {batch_id + 1}-{last_batch} failed: {result.get('error')}")
                 
-                # Random delay between batches
-                delay = random.uniform(delay_range[0], delay_range[1])
-                time.sleep(delay)
+                # Random delay between batches; other workers keep their INSERTs in flight meanwhile
+                delay = rng.uniform(delay_range[0], delay_range[1])
+                await asyncio.sleep(delay)
                 
             except Exception as e:
+                self._ops_failed += 1
                 logger.error(f"[{thread_id}] Unexpected error in batch {batch_id}: {e}")
-                results.append({
+                results[batch_id // coalesce_factor] = {
                     'catalog': thread_id,
                     'success': False,
                     'error': str(e),
                     'duration': 0,
                     'timestamp': time.time()
-                })
+                }
         
+        await producer
+        if commit_mode == 'staged':
+            await self.publish_staged_rows(catalog_name, thread_id, table_name, target_table, results)
         logger.info(f"[{thread_id}] Completed all {batches} batches")
         return results
 
-    def run_stress_test(self, threads_per_catalog=5, batches_per_thread=10, batch_size=100, delay_range=(0.1, 1.0)):
-        """Run comprehensive stress test"""
+    async def publish_staged_rows(self, catalog_name: str, thread_id: str, stage_table: str,
+                                  target_table: str, results: List[Dict[str, Any]]):
+        """Move a worker's staged rows into the shared table in one commit, then drop the staging table
+        
+        The publish is logged rather than reported as an operation so its rows are not counted twice;
+        a failed publish is appended to ``results``.
+        """
+        result = await self.run_insert_async(
+            catalog_name, f"INSERT INTO {target_table} SELECT * FROM {stage_table}", thread_id
+        )
+        if result['success']:
+            logger.info(f"[{thread_id}] Published staged rows in {result['duration']:.2f}s")
+        else:
+            logger.error(f"[{thread_id}] Publishing staged rows failed: {result.get('error')}")
+            results.append(result)
+        
+        result = await self.run_insert_async(catalog_name, f"DROP TABLE IF EXISTS {stage_table}", thread_id)
+        if not result['success']:
+            logger.warning(f"[{thread_id}] Staging table drop failed: {result.get('error')}")
+
+    def progress_reporter(self, stop: threading.Event, interval: float = 1.0):
+        """Print the aggregate INSERT counters every ``interval`` seconds until ``stop`` is set"""
+        started = time.perf_counter()
+        while not stop.wait(interval):
+            print(f"[{time.perf_counter() - started:6.1f}s] INSERTs ok: {self._ops_ok}, "
+                  f"failed: {self._ops_failed}, rows: {self._rows_done:,}", flush=True)
+
+    async def _run_insert_workers(self, threads_per_catalog: int, batches_per_thread: int,
+                                  batch_size: int, delay_range: tuple,
+                                  coalesce_factor: int, payload_mode: str,
+                                  commit_mode: str) -> List[Dict[str, Any]]:
+        """Run every catalog's insert workers concurrently on one event loop"""
+        self._in_flight = {catalog_name: asyncio.Semaphore(threads_per_catalog) for catalog_name in CATALOGS}
+        # Child seeds are spawned in a fixed worker order so a seeded run is reproducible
+        seeds = iter(self.seed_sequence.spawn(len(CATALOGS) * threads_per_catalog))
+        workers = [
+            self.stress_insert_worker(catalog_name, i, batches_per_thread, batch_size, delay_range,
+                                      coalesce_factor, payload_mode, commit_mode, next(seeds))
+            for catalog_name in CATALOGS
+            for i in range(threads_per_catalog)
+        ]
+        
+        # Each worker owns a fixed span of the preallocated buffer; extra entries (failed publishes) go after it
+        ops_per_worker = -(-batches_per_thread // coalesce_factor)
+        all_results: List[Optional[Dict[str, Any]]] = [None] * (len(workers) * ops_per_worker)
+        extra_results = []
+        for i, outcome in enumerate(await asyncio.gather(*workers, return_exceptions=True)):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Task failed: {outcome}")
+            else:
+                all_results[i * ops_per_worker:(i + 1) * ops_per_worker] = outcome[:ops_per_worker]
+                extra_results.extend(outcome[ops_per_worker:])
+        return [r for r in all_results if r is not None] + extra_results
+
+    def run_stress_test(self, threads_per_catalog=5, batches_per_thread=10, batch_size=100, delay_range=(0.1, 1.0),
+                        coalesce_factor=1, payload_processes=0, payload_mode='values', commit_mode='direct',
+                        max_workers=None, partition_spread=DEFAULT_PARTITION_SPREAD, target_file_rows=None,
+                        quiet=False, seed=None):
+        """Run comprehensive stress test
+        
+        Payloads are generated on a thread pool in this process. For large batches,
+        ``payload_processes`` > 0 moves row assembly to that many worker processes (started
+        with the spawn method, since the event loop and I/O threads already exist) so it does
+        not compete with the submitting threads for the GIL; for small batches the IPC cost
+        of pickling each payload back outweighs the gain.
+        With ``payload_mode='server'`` Trino generates the rows and no payloads are built.
+        ``commit_mode='staged'`` stages each worker's batches and commits them to the
+        shared table once per worker (see stress_insert_worker).
+        The I/O pool defaults to one thread per pooled connection; ``max_workers`` overrides it.
+        
+        Rows are spread over ``partition_spread`` daily partitions so concurrent writers mostly
+        hit different partitions; this measures engine write parallelism rather than contention
+        on a single partition, which ``partition_spread=1`` restores.
+        
+        ``target_file_rows`` buffers each worker's batches until at least that many rows are
+        pending and flushes them as one INSERT (the remainder at the end), so every commit
+        writes fewer, larger data files; the delay then applies between flushes.
+        
+        ``quiet`` silences this script's INFO logging for the timed section and prints
+        aggregate counters once per second instead of a log line per batch.
+        
+        A ``seed`` makes the payload blob, every worker's rows and delays reproducible;
+        the seed actually used is logged either way.
+        """
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = self.spawn_rng()
+        self.blob_pool = build_blob_pool(self.rng)
+        self.partition_spread = max(1, partition_spread)
+        if payload_mode not in PAYLOAD_MODES:
+            raise ValueError(f"payload_mode must be one of {PAYLOAD_MODES}, got {payload_mode!r}")
+        if commit_mode not in COMMIT_MODES:
+            raise ValueError(f"commit_mode must be one of {COMMIT_MODES}, got {commit_mode!r}")
+        if target_file_rows:
+            # Flushing whenever the row buffer reaches the target is coalescing by whole batches
+            coalesce_factor = max(coalesce_factor, -(-target_file_rows // batch_size))
+        coalesce_factor = max(1, min(coalesce_factor, batches_per_thread))
+        if payload_mode == 'values' and coalesce_factor * batch_size > VALUES_MAX_ROWS_HINT:
+            logger.warning(f"{coalesce_factor * batch_size} bound rows per INSERT may exceed Trino's query.max-length; "
+                           f"use payload_mode='server' or raise query.max-length on the coordinator")
         logger.info("="*80)
         logger.info("STARTING INSERT STRESS TEST")
         logger.info("="*80)
@@ -293,64 +539,72 @@ class InsertStressTester:
         logger.info(f"  - Batch size: {batch_size}")
         logger.info(f"  - Total rows per catalog: {threads_per_catalog * batches_per_thread * batch_size:,}")
         logger.info(f"  - Delay range: {delay_range}")
+        logger.info(f"  - Batches per INSERT: {coalesce_factor} "
+                    f"({-(-batches_per_thread // coalesce_factor)} commits per thread)")
+        logger.info(f"  - Row payload: {payload_mode}")
+        logger.info(f"  - Commit mode: {commit_mode}")
+        logger.info(f"  - Partition spread: {self.partition_spread} day(s)")
+        logger.info(f"  - Seed: {self.seed_sequence.entropy}")
         logger.info("="*80)
         
         # Setup test environment
         print("Setting up stress test environment...")
         self.setup_stress_environment()
+        # One pooled connection per in-flight INSERT so catalog workers never share an HTTP stream
+        self.ensure_pool_size(threads_per_catalog)
+        pooled_connections = sum(self.pool_sizes.values())
+        # An I/O thread blocks on its INSERT for the whole round trip, so threads beyond the
+        # pooled connections would only wait in acquire() and fewer would leave connections idle
+        io_workers = max_workers or pooled_connections
+        logger.info(f"I/O pool: {io_workers} threads for {pooled_connections} pooled connections "
+                    f"({io_workers / pooled_connections:.2f} threads per connection)")
+        if io_workers > pooled_connections:
+            logger.warning(f"max_workers={io_workers} exceeds the {pooled_connections} pooled connections; "
+                           f"extra threads will wait for a connection")
+        
+        self.quiet = quiet
+        self._ops_ok = self._ops_failed = self._rows_done = 0
+        stop_reporter = threading.Event()
+        reporter = None
+        if quiet:
+            logger.setLevel(logging.WARNING)
+            reporter = threading.Thread(target=self.progress_reporter, args=(stop_reporter,),
+                                        name="insert-progress", daemon=True)
+            reporter.start()
         
-        start_time = time.time()
-        all_results = []
-        
-        # Create tasks for all catalogs
-        tasks = []
-        with ThreadPoolExecutor(max_workers=threads_per_catalog * 3) as executor:
-            # Submit tasks for Polaris
-            for i in range(threads_per_catalog):
-                task = executor.submit(
-                    self.stress_insert_worker, 
-                    "iceberg_polaris", 
-                    i, 
-                    batches_per_thread, 
-                    batch_size, 
-                    delay_range
-                )
-                tasks.append(task)
-            
-            # Submit tasks for HMS
-            for i in range(threads_per_catalog):
-                task = executor.submit(
-                    self.stress_insert_worker, 
-                    "iceberg_hms", 
-                    i, 
-                    batches_per_thread, 
-                    batch_size, 
-                    delay_range
-                )
-                tasks.append(task)
-            
-            # Submit tasks for Nessie
-            for i in range(threads_per_catalog):
-                task = executor.submit(
-                    self.stress_insert_worker, 
-                    "iceberg_nessie", 
-                    i, 
-                    batches_per_thread, 
-                    batch_size, 
-                    delay_range
-                )
-                tasks.append(task)
+        try:
+            start_time = time.perf_counter()
             
-            # Collect results
-            for task in as_completed(tasks):
+            # Worker coroutines share one event loop; blocking trino calls run on the I/O pool
+            # and payload generation on a separate CPU-sized pool so the two overlap
+            if payload_mode == 'server':
+                # Nothing to generate client-side beyond id ranges
+                gen_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="insert-gen")
+            elif payload_processes > 0:
+                gen_pool = ProcessPoolExecutor(max_workers=payload_processes, initializer=init_payload_worker,
+                                               initargs=(self.blob_pool,),
+                                               mp_context=multiprocessing.get_context('spawn'))
+            else:
+                gen_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="insert-gen")
+            with ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="insert-io") as executor, \
+                    gen_pool as gen_executor:
+                self._executor = executor
+                self._gen_executor = gen_executor
                 try:
-                    results = task.result()
-                    all_results.extend(results)
-                except Exception as e:
-                    logger.error(f"Task failed: {e}")
-        
-        end_time = time.time()
-        total_duration = end_time - start_time
+                    all_results = asyncio.run(self._run_insert_workers(
+                        threads_per_catalog, batches_per_thread, batch_size, delay_range,
+                        coalesce_factor, payload_mode, commit_mode
+                    ))
+                finally:
+                    self._executor = None
+                    self._gen_executor = None
+            
+            total_duration = time.perf_counter() - start_time
+        finally:
+            if reporter:
+                stop_reporter.set()
+                reporter.join()
+                logger.setLevel(logging.NOTSET)
         
         # Analyze results
         self.analyze_stress_results(all_results, total_duration)
@@ -359,87 +613,60 @@ class InsertStressTester:
 
     def analyze_stress_results(self, results: List[Dict[str, Any]], total_duration: float):
         """Analyze and print stress test results"""
-        # Separate results by catalog
-        polaris_results = [r for r in results if 'iceberg_polaris-ST' in r['catalog']]
-        hms_results = [r for r in results if 'iceberg_hms-ST' in r['catalog']]
-        nessie_results = [r for r in results if 'iceberg_nessie-ST' in r['catalog']]
-        
-        # Calculate success/failure counts
-        polaris_success = [r for r in polaris_results if r['success']]
-        polaris_failed = [r for r in polaris_results if not r['success']]
-        hms_success = [r for r in hms_results if r['success']]
-        hms_failed = [r for r in hms_results if not r['success']]
-        nessie_success = [r for r in nessie_results if r['success']]
-        nessie_failed = [r for r in nessie_results if not r['success']]
+        # One DataFrame; catalog and outcome are derived once and every statistic is a groupby
+        df = pd.DataFrame(results, columns=['catalog', 'duration', 'rows_count', 'success', 'error'])
+        df['catalog_base'] = df['catalog'].str.extract(r'^(iceberg_[a-z]+)-ST', expand=False)
+        df['is_success'] = df['success'].astype(bool)
+        # Successful INSERTs whose update count Trino did not report count as 0 rows but are listed
+        df['rows_unknown'] = df['is_success'] & df['rows_count'].isna()
+        df['rows_count'] = df['rows_count'].fillna(0)
+        
+        op_counts = df.groupby('catalog_base')['is_success'].agg(['size', 'sum'])
+        success = df[df['is_success']]
+        unknown_counts = success.groupby('catalog_base')['rows_unknown'].sum()
+        rows_inserted = success.groupby('catalog_base')['rows_count'].sum()
+        duration_stats = df.groupby(['catalog_base', 'is_success'])['duration'].agg(
+            ['count', 'mean', 'median', 'std', 'min', 'max']
+        ).fillna({'std': 0.0})
         
         print("\n" + "="*80)
         print("STRESS TEST RESULTS")
         print("="*80)
         print(f"Total test duration: {total_duration:.2f}s")
         
-        # Polaris results
-        print(f"\nPOLARIS CATALOG (iceberg_polaris):")
-        print(f"  Total operations: {len(polaris_results)}")
-        if polaris_results:
-            print(f"  Successful: {len(polaris_success)} ({len(polaris_success)/len(polaris_results)*100:.1f}%)")
-            print(f"  Failed: {len(polaris_failed)} ({len(polaris_failed)/len(polaris_results)*100:.1f}%)")
-        
-        if polaris_success:
-            durations = [r['duration'] for r in polaris_success]
-            total_rows = sum(r.get('rows_count', 0) for r in polaris_success)
-            print(f"  Total rows inserted: {total_rows:,}")
-            print(f"  Average duration: {statistics.mean(durations):.2f}s")
-            print(f"  Median duration: {statistics.median(durations):.2f}s")
-            print(f"  Min duration: {min(durations):.2f}s")
-            print(f"  Max duration: {max(durations):.2f}s")
-            print(f"  Std deviation: {statistics.stdev(durations):.2f}s")
-            print(f"  Throughput: {total_rows/total_duration:.1f} rows/sec")
-        
-        # HMS results
-        # HMS results
-        print(f"\nHIVE METASTORE CATALOG (iceberg_hms):")
-        print(f"  Total operations: {len(hms_results)}")
-        if hms_results:
-            print(f"  Successful: {len(hms_success)} ({len(hms_success)/len(hms_results)*100:.1f}%)")
-            print(f"  Failed: {len(hms_failed)} ({len(hms_failed)/len(hms_results)*100:.1f}%)")
-        
-        if hms_success:
-            durations = [r['duration'] for r in hms_success]
-            total_rows = sum(r.get('rows_count', 0) for r in hms_success)
-            print(f"  Total rows inserted: {total_rows:,}")
-            print(f"  Average duration: {statistics.mean(durations):.2f}s")
-            print(f"  Median duration: {statistics.median(durations):.2f}s")
-            print(f"  Min duration: {min(durations):.2f}s")
-            print(f"  Max duration: {max(durations):.2f}s")
-            print(f"  Std deviation: {statistics.stdev(durations):.2f}s")
-            print(f"  Throughput: {total_rows/total_duration:.1f} rows/sec")
-        
-        # Nessie results
-        print(f"\nNESSIE CATALOG (iceberg_nessie):")
-        print(f"  Total operations: {len(nessie_results)}")
-        if nessie_results:
-            print(f"  Successful: {len(nessie_success)} ({len(nessie_success)/len(nessie_results)*100:.1f}%)")
-            print(f"  Failed: {len(nessie_failed)} ({len(nessie_failed)/len(nessie_results)*100:.1f}%)")
-        
-        if nessie_success:
-            durations = [r['duration'] for r in nessie_success]
-            total_rows = sum(r.get('rows_count', 0) for r in nessie_success)
-            print(f"  Total rows inserted: {total_rows:,}")
-            print(f"  Average duration: {statistics.mean(durations):.2f}s")
-            print(f"  Median duration: {statistics.median(durations):.2f}s")
-            print(f"  Min duration: {min(durations):.2f}s")
-            print(f"  Max duration: {max(durations):.2f}s")
-            print(f"  Std deviation: {statistics.stdev(durations):.2f}s")
-            print(f"  Throughput: {total_rows/total_duration:.1f} rows/sec")
+        catalog_data = [
+            ("Polaris", "POLARIS CATALOG (iceberg_polaris)", "iceberg_polaris"),
+            ("HMS", "HIVE METASTORE CATALOG (iceberg_hms)", "iceberg_hms"),
+            ("Nessie", "NESSIE CATALOG (iceberg_nessie)", "iceberg_nessie")
+        ]
+        
+        for _, title, base in catalog_data:
+            total_ops = int(op_counts['size'].get(base, 0))
+            success_count = int(op_counts['sum'].get(base, 0))
+            failed_count = total_ops - success_count
+            
+            print(f"\n{title}:")
+            print(f"  Total operations: {total_ops}")
+            if total_ops:
+                print(f"  Successful: {success_count} ({success_count/total_ops*100:.1f}%)")
+                print(f"  Failed: {failed_count} ({failed_count/total_ops*100:.1f}%)")
+            if success_count:
+                total_rows = int(rows_inserted[base])
+                print(f"  Total rows inserted: {total_rows:,}")
+                if unknown_counts[base]:
+                    print(f"  INSERTs with unknown row count: {int(unknown_counts[base])}")
+                print(f"  Throughput: {total_rows/total_duration:.1f} rows/sec")
+        
+        if not duration_stats.empty:
+            print(f"\nDURATION BY CATALOG AND OUTCOME (seconds):")
+            print(duration_stats.to_string(float_format=lambda v: f"{v:.2f}"))
         
         # Performance comparison
-        catalogs_data = []
-        if polaris_success:
-            catalogs_data.append(("Polaris", statistics.mean([r['duration'] for r in polaris_success])))
-        if hms_success:
-            catalogs_data.append(("HMS", statistics.mean([r['duration'] for r in hms_success])))
-        if nessie_success:
-            catalogs_data.append(("Nessie", statistics.mean([r['duration'] for r in nessie_success])))
+        catalogs_data = [
+            (name, float(duration_stats.loc[(base, True), 'mean']))
+            for name, _, base in catalog_data
+            if (base, True) in duration_stats.index
+        ]
         
         if len(catalogs_data) > 1:
             print(f"\nPERFORMANCE COMPARISON:")
@@ -451,40 +678,45 @@ class InsertStressTester:
                 print(f"  {name}: {slower_pct:.1f}% slower than {fastest[0]}")
         
         # Print failed operations
-        if polaris_failed:
-            print(f"\nFAILED POLARIS OPERATIONS:")
-            for r in polaris_failed[:5]:  # Show first 5 failures
-                print(f"  - {r['catalog']}: {r.get('error', 'Unknown error')}")
-            if len(polaris_failed) > 5:
-                print(f"  ... and {len(polaris_failed) - 5} more failures")
-        
-        if hms_failed:
-            print(f"\nFAILED HMS OPERATIONS:")
-            for r in hms_failed[:5]:  # Show first 5 failures
-                print(f"  - {r['catalog']}: {r.get('error', 'Unknown error')}")
-            if len(hms_failed) > 5:
-                print(f"  ... and {len(hms_failed) - 5} more failures")
-        
-        if nessie_failed:
-            print(f"\nFAILED NESSIE OPERATIONS:")
-            for r in nessie_failed[:5]:  # Show first 5 failures
-                print(f"  - {r['catalog']}: {r.get('error', 'Unknown error')}")
-            if len(nessie_failed) > 5:
-                print(f"  ... and {len(nessie_failed) - 5} more failures")
+        failed = df[~df['is_success']]
+        for name, _, base in catalog_data:
+            catalog_failed = failed[failed['catalog_base'] == base]
+            if catalog_failed.empty:
+                continue
+            print(f"\nFAILED {name.upper()} OPERATIONS:")
+            for label, error in catalog_failed[['catalog', 'error']].head(5).itertuples(index=False):  # Show first 5 failures
+                print(f"  - {label}: {error if isinstance(error, str) else 'Unknown error'}")
+            if len(catalog_failed) > 5:
+                print(f"  ... and {len(catalog_failed) - 5} more failures")
         
         print("\n" + "="*80)
 
     def cleanup(self):
         """Clean up connections"""
-        if self.polaris_conn:
-            self.polaris_conn.close()
-        if self.hms_conn:
-            self.hms_conn.close()
-        if self.nessie_conn:
-            self.nessie_conn.close()
+        for catalog_name, pool in self.pools.items():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            self.pool_sizes[catalog_name] = 0
 
 def main():
     """Main function to run the stress tests"""
+    parser = argparse.ArgumentParser(description="INSERT stress test for Polaris, HMS and Nessie catalogs")
+    parser.add_argument('--partition-spread', type=int, default=DEFAULT_PARTITION_SPREAD,
+                        help="spread rows over this many daily partitions (1 = all rows in today's partition, "
+                             "i.e. single-partition contention; default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed for reproducible test data and delays (default: random, logged at start)")
+    parser.add_argument('--quiet', action='store_true',
+                        help="no per-batch log lines during the run; print aggregate progress once per second")
+    parser.add_argument('--payload-processes', type=int, default=0,
+                        help="generate row payloads in this many worker processes; only worth it for "
+                             "large batches (default: %(default)s = in-process threads)")
+    args = parser.parse_args()
+    start_queue_logging()
+    
     print("INSERT STRESS TEST FOR POLARIS vs HIVE METASTORE vs NESSIE")
     print("="*60)
     
@@ -530,12 +762,20 @@ def main():
         batch_size = int(input("Batch size: "))
         min_delay = float(input("Min delay between batches (seconds): "))
         max_delay = float(input("Max delay between batches (seconds): "))
+        coalesce = int(input("Batches coalesced per INSERT [1]: ") or 1)
+        target_file_rows = input("Target rows per INSERT/data file (blank = per batch): ").strip()
+        payload_mode = input("Row payload - values (client rows) or server (Trino-generated) [values]: ").strip() or 'values'
+        commit_mode = input("Commit mode - direct (every batch) or staged (once per thread) [direct]: ").strip() or 'direct'
         
         config = {
             'threads_per_catalog': threads,
             'batches_per_thread': batches,
             'batch_size': batch_size,
-            'delay_range': (min_delay, max_delay)
+            'delay_range': (min_delay, max_delay),
+            'coalesce_factor': coalesce,
+            'target_file_rows': int(target_file_rows) if target_file_rows else None,
+            'payload_mode': payload_mode,
+            'commit_mode': commit_mode
         }
     elif choice in ["1", "2", "3"]:
         config = test_configs[int(choice) - 1]
@@ -552,7 +792,8 @@ def main():
         tester = InsertStressTester()
         
         # Run stress test
-        results = tester.run_stress_test(**config)
+        results = tester.run_stress_test(**config, partition_spread=args.partition_spread, quiet=args.quiet,
+                                         seed=args.seed, payload_processes=args.payload_processes)
         
         total_ops = len(results)
         successful_ops = len([r for r in results if r['success']])
@@ -6,119 +6,254 @@ This script performs intensive concurrent update operations to test the limits
 
 import threading
 import time
-import random
+import argparse
+import asyncio
 import logging
-import statistics
-from typing import List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+import queue
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
 import trino
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s'
-)
+from log_setup import start_queue_logging
+from trino_pool import PooledTester
+
 logger = logging.getLogger(__name__)
 
-class UpdateStressTester:
-    def __init__(self, host='localhost', port=8081, user='admin'):
+CATALOGS = ("iceberg_polaris", "iceberg_hms", "iceberg_nessie")
+# Catalog, short name and report heading used by analyze_update_results
+CATALOG_DISPLAY = (
+    ("iceberg_polaris", "Polaris", "POLARIS"),
+    ("iceberg_hms", "HMS", "HIVE METASTORE"),
+    ("iceberg_nessie", "Nessie", "NESSIE"),
+)
+
+CATEGORIES = ['Electronics', 'Books', 'Clothing', 'Home', 'Sports', 'Toys']
+INITIAL_STATUSES = ['Active', 'Pending', 'Inactive', 'Processing']
+UPDATE_STATUSES = INITIAL_STATUSES + ['Completed']
+# value_update id ranges cover exactly one block of this many consecutive ids, so an update
+# touches whole blocks instead of straddling two
+FILE_STRIDE = 1000
+# Trino's sequence() returns at most this many elements; larger tables cross-join two sequences
+SERVER_MAX_ROWS = 10000
+# Initial rows are spread over this many daily partitions counting back from today; every generated
+# UPDATE targets a single one of them. Default 1 keeps all rows in today's partition; raise via --partition-spread
+DEFAULT_PARTITION_SPREAD = 1
+# 'statement' runs each generated UPDATE on its own; 'merge' coalesces a batch into one MERGE
+UPDATE_MODES = ('statement', 'merge')
+UPDATE_TYPES = ('value_update', 'status_update', 'priority_update', 'category_update',
+                'version_increment', 'bulk_update')
+# UPDATE templates per update type; {table} is bound once per tester, the doubled-brace
+# fields per query. Every WHERE pins one partition_date so Iceberg prunes the other partitions.
+UPDATE_TEMPLATES = {
+    # Update value for specific IDs
+    'value_update': "UPDATE {table} SET value = {{value}}, last_updated = TIMESTAMP '{{ts}}', "
+                    "version = version + 1 WHERE id BETWEEN {{start_id}} AND {{end_id}} "
+                    "AND partition_date = DATE '{{partition_date}}'",
+    # Update status for a category
+    'status_update': "UPDATE {table} SET status = '{{status}}', last_updated = TIMESTAMP '{{ts}}', "
+                     "version = version + 1 WHERE category = '{{category}}' AND priority > {{min_priority}} "
+                     "AND partition_date = DATE '{{partition_date}}'",
+    # Update priority based on value
+    'priority_update': "UPDATE {table} SET priority = {{priority}}, last_updated = TIMESTAMP '{{ts}}', "
+                       "version = version + 1 WHERE value > {{threshold}} "
+                       "AND partition_date = DATE '{{partition_date}}'",
+    # Update category for specific status
+    'category_update': "UPDATE {table} SET category = '{{category}}', last_updated = TIMESTAMP '{{ts}}', "
+                       "version = version + 1 WHERE status = '{{status}}' AND id % 10 = {{remainder}} "
+                       "AND partition_date = DATE '{{partition_date}}'",
+    # Increment version for all rows with specific criteria
+    'version_increment': "UPDATE {table} SET version = version + 1, last_updated = TIMESTAMP '{{ts}}' "
+                         "WHERE value > {{min_value}} AND priority <= 3 "
+                         "AND partition_date = DATE '{{partition_date}}'",
+    # Bulk update with multiple conditions
+    'bulk_update': "UPDATE {table} SET value = value * {{multiplier}}, status = '{{status}}', "
+                   "last_updated = TIMESTAMP '{{ts}}', version = version + 1 "
+                   "WHERE category = '{{category}}' AND version < 5 "
+                   "AND partition_date = DATE '{{partition_date}}'",
+}
+# Coalesced batch of value updates; each source row sets the value of one disjoint id range
+# within one partition
+MERGE_TEMPLATE = (
+    "MERGE INTO {table} t USING (VALUES {{rows}}) AS s(id_lo, id_hi, new_value, partition_date) "
+    "ON t.partition_date = s.partition_date AND t.id BETWEEN s.id_lo AND s.id_hi "
+    "WHEN MATCHED THEN UPDATE SET value = s.new_value, last_updated = TIMESTAMP '{{ts}}', "
+    "version = t.version + 1"
+)
+
+
+def sql_array(values: Sequence[str]) -> str:
+    """Render string constants as a Trino ARRAY literal"""
+    return "ARRAY[" + ", ".join(f"'{v}'" for v in values) + "]"
+
+
+def build_ctas_statement(table_name: str, num_rows: int, today: date, partition_spread: int) -> str:
+    """Build the CREATE TABLE ... AS SELECT that has Trino generate all initial rows itself
+    
+    Ids run 1..``num_rows``; each row lands in a random one of the ``partition_spread`` days
+    ending at ``today`` and is last updated on that day. The whole table is one snapshot.
+    """
+    return f"""
+        CREATE TABLE {table_name}
+        WITH (
+            partitioning = ARRAY['partition_date']
+        )
+        AS SELECT
+            id, category, name, value, status, priority,
+            CAST(partition_date AS timestamp(6)) + random(86400) * INTERVAL '1' SECOND AS last_updated,
+            version, partition_date
+        FROM (
+            SELECT
+                id,
+                CAST({sql_array(CATEGORIES)}[random({len(CATEGORIES)}) + 1] AS varchar) AS category,
+                concat('item_', CAST(id AS varchar)) AS name,
+                round(10 + random() * 990, 2) AS value,
+                CAST({sql_array(INITIAL_STATUSES)}[random({len(INITIAL_STATUSES)}) + 1] AS varchar) AS status,
+                random(5) + 1 AS priority,
+                1 AS version,
+                DATE '{today.isoformat()}' - random({partition_spread}) * INTERVAL '1' DAY AS partition_date
+            FROM (
+                SELECT hi * {SERVER_MAX_ROWS} + lo AS id
+                FROM UNNEST(sequence(0, {max(num_rows - 1, 0) // SERVER_MAX_ROWS})) AS h(hi)
+                CROSS JOIN UNNEST(sequence(1, {SERVER_MAX_ROWS})) AS l(lo)
+            )
+            WHERE id <= {num_rows}
+        )
+    """
+
+
+@dataclass(slots=True)
+class QueryResult:
+    """Outcome of one statement; fixed fields keep large result lists compact"""
+    catalog: str
+    duration: float
+    success: bool
+    timestamp: float
+    thread_id: str = ''
+    rows_count: Optional[int] = 0
+    error: Optional[str] = None
+
+
+class UpdateStressTester(PooledTester):
+    def __init__(self, host='localhost', port=8081, user='admin', catalogs: Sequence[str] = CATALOGS,
+                 table_name: Optional[str] = None):
         self.host = host
         self.port = port
         self.user = user
-        self.polaris_conn = None
-        self.hms_conn = None
-        self.nessie_conn = None
+        # Catalogs this tester connects to and runs workers for (one per process with catalog_processes)
+        self.catalogs = tuple(catalogs)
+        # Per-catalog pools of (connection, cursor) pairs; each pair serves one worker at a time
+        self.pools: Dict[str, queue.Queue] = {catalog: queue.Queue() for catalog in self.catalogs}
+        self.pool_sizes: Dict[str, int] = {catalog: 0 for catalog in self.catalogs}
+        # Bound while run_update_stress_test is driving the async workers
+        self._executor: Optional[ThreadPoolExecutor] = None
         # Use timestamp to create unique table names
         self.table_suffix = str(int(time.time()))
-        self.table_name = f"update_stress_{self.table_suffix}"
+        self.table_name = table_name or f"update_stress_{self.table_suffix}"
+        self.update_templates = {
+            update_type: template.format(table=f"stress_test.{self.table_name}")
+            for update_type, template in UPDATE_TEMPLATES.items()
+        }
+        self.merge_template = MERGE_TEMPLATE.format(table=f"stress_test.{self.table_name}")
+        self.set_partition_spread(DEFAULT_PARTITION_SPREAD)
+        self.initial_rows = 10000
+        # Every generator is spawned from this sequence; each worker draws from its own
+        self.seed_sequence = np.random.SeedSequence()
+        self.rng = self.spawn_rng()
         self.setup_connections()
         
+    def set_partition_spread(self, partition_spread: int):
+        """Use the last ``partition_spread`` days as the table's partition dates"""
+        if partition_spread < 1:
+            raise ValueError(f"partition_spread must be at least 1, got {partition_spread}")
+        today = date.today()
+        self.set_partition_dates([today - timedelta(days=d) for d in range(partition_spread)])
+
+    def set_partition_dates(self, partition_dates: Sequence[date]):
+        """Use ``partition_dates`` (newest first) as the table's partition dates"""
+        self.partition_dates = list(partition_dates)
+        self.partition_date_literals = [d.isoformat() for d in self.partition_dates]
+
+    def id_blocks(self) -> int:
+        """Number of ``FILE_STRIDE``-sized id blocks the initial rows span"""
+        return max(1, -(-self.initial_rows // FILE_STRIDE))
+
     def setup_connections(self):
         """Setup connections to all catalogs"""
         try:
-            # Connection for Polaris catalog (iceberg_polaris)
-            self.polaris_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_polaris',
-                schema='default'
-            )
-            logger.info("Connected to Polaris catalog")
-            
-            # Connection for HMS catalog
-            self.hms_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_hms',
-                schema='default'
-            )
-            logger.info("Connected to HMS catalog")
-            
-            # Connection for Nessie catalog
-            self.nessie_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_nessie',
-                schema='default'
-            )
-            logger.info("Connected to Nessie catalog")
-            
+            self.ensure_pool_size(1)
         except Exception as e:
             logger.error(f"Failed to setup connections: {e}")
             raise
 
-    def execute_query(self, connection, query: str, catalog_name: str) -> Dict[str, Any]:
-        """Execute a query and return results with timing"""
-        start_time = time.time()
-        thread_id = threading.current_thread().name
+    def open_pool_entry(self, catalog_name: str):
+        """Open a (connection, cursor) pair; the cursor is reused for every statement on it"""
+        connection = trino.dbapi.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            catalog=catalog_name,
+            schema='default'
+        )
+        return connection, connection.cursor()
+
+    def execute_query(self, connection, query: str, catalog_name: str,
+                      params: Optional[Sequence[Any]] = None, thread_name: Optional[str] = None,
+                      cursor=None) -> QueryResult:
+        """Execute a query (with optional bound ``?`` parameters) and return results with timing
+        
+        Update workers pass their worker label as ``thread_name``; other callers get the OS
+        thread name looked up here. Pooled callers pass the connection's long-lived ``cursor``.
+        """
+        start_time = time.time()  # wall clock, reported as the result timestamp
+        t0 = time.perf_counter()
+        thread_id = thread_name or threading.current_thread().name
+        kind = query.lstrip()[:6].upper()
         
         try:
-            cursor = connection.cursor()
+            if cursor is None:
+                cursor = connection.cursor()
             
-            cursor.execute(query)
+            cursor.execute(query, params)
             
-            # For UPDATE queries, get the number of affected rows
-            if query.strip().upper().startswith('UPDATE'):
-                # For Iceberg tables, we need to commit the transaction
-                connection.commit()
-                rows_count = cursor.rowcount if hasattr(cursor, 'rowcount') else 0
-            elif query.strip().upper().startswith('SELECT'):
+            # Connections are autocommit: every UPDATE/MERGE is committed by Trino when it
+            # finishes, so no client commit() follows; rowcount is the number of affected rows
+            if kind == 'SELECT':
                 results = cursor.fetchall()
                 rows_count = len(results)
             else:
                 rows_count = cursor.rowcount if hasattr(cursor, 'rowcount') else 0
             
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = time.perf_counter() - t0
             
-            return {
-                'catalog': catalog_name,
-                'duration': duration,
-                'rows_count': rows_count,
-                'success': True,
-                'thread_id': thread_id,
-                'timestamp': start_time
-            }
+            return QueryResult(
+                catalog=catalog_name,
+                duration=duration,
+                rows_count=rows_count,
+                success=True,
+                thread_id=thread_id,
+                timestamp=start_time
+            )
             
         except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = time.perf_counter() - t0
             
-            return {
-                'catalog': catalog_name,
-                'duration': duration,
-                'success': False,
-                'error': str(e),
-                'thread_id': thread_id,
-                'timestamp': start_time
-            }
+            return QueryResult(
+                catalog=catalog_name,
+                duration=duration,
+                success=False,
+                error=str(e),
+                thread_id=thread_id,
+                timestamp=start_time
+            )
 
     def setup_stress_environment(self, initial_rows=10000):
         """Setup schemas, tables and initial data for stress testing"""
         logger.info(f"Setting up stress test environment with {initial_rows:,} initial rows per catalog")
+        self.initial_rows = initial_rows
         
         setup_queries = [
             # Schema creation
@@ -134,290 +269,258 @@ class UpdateStressTester:
             ("iceberg_nessie", f"DROP TABLE IF EXISTS stress_test.{self.table_name}")
         ]
         
-        create_queries = [
-            # Table creation
-            ("iceberg_polaris", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    category varchar,
-                    name varchar,
-                    value double,
-                    status varchar,
-                    priority integer,
-                    last_updated timestamp,
-                    version integer,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            ("iceberg_hms", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    category varchar,
-                    name varchar,
-                    value double,
-                    status varchar,
-                    priority integer,
-                    last_updated timestamp,
-                    version integer,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            ("iceberg_nessie", f"""
-                CREATE TABLE stress_test.{self.table_name} (
-                    id bigint,
-                    category varchar,
-                    name varchar,
-                    value double,
-                    status varchar,
-                    priority integer,
-                    last_updated timestamp,
-                    version integer,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """)
-        ]
-        
         # Execute setup
         for catalog_name, query in setup_queries:
-            if catalog_name == "iceberg_polaris":
-                conn = self.polaris_conn
-            elif catalog_name == "iceberg_hms":
-                conn = self.hms_conn
-            else:  # iceberg_nessie
-                conn = self.nessie_conn
-            result = self.execute_query(conn, query, catalog_name)
-            if not result['success']:
-                logger.warning(f"Schema creation warning for {catalog_name}: {result.get('error')}")
+            with self.acquire(catalog_name) as (conn, cursor):
+                result = self.execute_query(conn, query, catalog_name, cursor=cursor)
+            if not result.success:
+                logger.warning(f"Schema creation warning for {catalog_name}: {result.error}")
         
         # Drop tables
         for catalog_name, query in drop_queries:
-            if catalog_name == "iceberg_polaris":
-                conn = self.polaris_conn
-            elif catalog_name == "iceberg_hms":
-                conn = self.hms_conn
-            else:  # iceberg_nessie
-                conn = self.nessie_conn
-            result = self.execute_query(conn, query, catalog_name)
-        
-        # Create tables
-        for catalog_name, query in create_queries:
-            if catalog_name == "iceberg_polaris":
-                conn = self.polaris_conn
-            elif catalog_name == "iceberg_hms":
-                conn = self.hms_conn
-            else:  # iceberg_nessie
-                conn = self.nessie_conn
-            result = self.execute_query(conn, query, catalog_name)
-            if not result['success']:
-                logger.error(f"Table creation failed for {catalog_name}: {result.get('error')}")
-                raise Exception(f"Failed to create table in {catalog_name}")
-        
-        # Insert initial data
+            with self.acquire(catalog_name) as (conn, cursor):
+                result = self.execute_query(conn, query, catalog_name, cursor=cursor)
+        
+        # Create and populate tables
         self.populate_initial_data(initial_rows)
 
     def populate_initial_data(self, num_rows: int):
-        """Populate tables with initial data for update testing"""
+        """Create and populate the tables for update testing, all catalogs concurrently"""
         logger.info(f"Populating initial data: {num_rows:,} rows per catalog")
         
-        batch_size = 1000
-        current_date = time.strftime('%Y-%m-%d')
-        categories = ['Electronics', 'Books', 'Clothing', 'Home', 'Sports', 'Toys']
-        statuses = ['Active', 'Pending', 'Inactive', 'Processing']
-        
-        for catalog in ['iceberg_polaris', 'iceberg_hms', 'iceberg_nessie']:
-            if catalog == "iceberg_polaris":
-                conn = self.polaris_conn
-            elif catalog == "iceberg_hms":
-                conn = self.hms_conn
-            else:  # iceberg_nessie
-                conn = self.nessie_conn
-            
-            for batch_start in range(0, num_rows, batch_size):
-                batch_end = min(batch_start + batch_size, num_rows)
-                values = []
-                
-                for i in range(batch_start, batch_end):
-                    id_val = i + 1
-                    category = random.choice(categories)
-                    name = f"'item_{id_val}'"
-                    value = round(random.uniform(10.0, 1000.0), 2)
-                    status = random.choice(statuses)
-                    priority = random.randint(1, 5)
-                    last_updated = f"TIMESTAMP '{current_date} {random.randint(0,23):02d}:{random.randint(0,59):02d}:{random.randint(0,59):02d}'"
-                    version = 1
-                    partition_date = f"DATE '{current_date}'"
-                    
-                    values.append(f"({id_val}, '{category}', {name}, {value}, '{status}', {priority}, {last_updated}, {version}, {partition_date})")
-                
-                insert_query = f"INSERT INTO stress_test.{self.table_name} VALUES {', '.join(values)}"
-                result = self.execute_query(conn, insert_query, f"{catalog}_initial_data")
-                
-                if not result['success']:
-                    logger.error(f"Failed to insert initial data batch for {catalog}: {result.get('error')}")
-                    raise Exception(f"Failed to populate initial data in {catalog}")
-                
-                logger.info(f"[{catalog}] Inserted batch {batch_start + 1}-{batch_end}")
+        with ThreadPoolExecutor(max_workers=len(self.catalogs)) as executor:
+            tasks = [executor.submit(self.populate_catalog, catalog, num_rows) for catalog in self.catalogs]
+            for task in as_completed(tasks):
+                task.result()
 
-    def generate_update_queries(self, thread_id: str, num_updates: int) -> List[str]:
-        """Generate various types of UPDATE queries"""
-        queries = []
-        categories = ['Electronics', 'Books', 'Clothing', 'Home', 'Sports', 'Toys']
-        statuses = ['Active', 'Pending', 'Inactive', 'Processing', 'Completed']
+    def populate_catalog(self, catalog: str, num_rows: int):
+        """Create one catalog's table with ``num_rows`` server-generated rows in a single CTAS commit"""
+        query = build_ctas_statement(f"stress_test.{self.table_name}", num_rows,
+                                     self.partition_dates[0], len(self.partition_dates))
+        with self.acquire(catalog) as (conn, cursor):
+            result = self.execute_query(conn, query, f"{catalog}_initial_data", cursor=cursor)
+        
+        if not result.success:
+            logger.error(f"Table creation failed for {catalog}: {result.error}")
+            raise Exception(f"Failed to create table in {catalog}")
+        
+        logger.info(f"[{catalog}] Created table with {num_rows:,} rows in {result.duration:.2f}s")
+
+    def generate_update_queries(self, thread_id: str, num_updates: int,
+                                rng: Optional[np.random.Generator] = None) -> List[str]:
+        """Generate various types of UPDATE queries
+        
+        Every random parameter is drawn for all ``num_updates`` queries up front as one array per
+        column; queries are then formatted per update type over that type's indices.
+        """
+        rng = rng or self.rng
+        queries: List[Optional[str]] = [None] * num_updates
         current_timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-        
-        for i in range(num_updates):
-            update_type = random.choice([
-                'value_update',
-                'status_update', 
-                'priority_update',
-                'category_update',
-                'version_increment',
-                'bulk_update'
-            ])
-            
-            if update_type == 'value_update':
-                # Update value for specific IDs
-                start_id = random.randint(1, 9000)
-                end_id = start_id + random.randint(1, 100)
-                new_value = round(random.uniform(10.0, 2000.0), 2)
-                query = f"""
-                    UPDATE stress_test.{self.table_name} 
-                    SET value = {new_value}, 
-                        last_updated = TIMESTAMP '{current_timestamp}',
-                        version = version + 1
-                    WHERE id BETWEEN {start_id} AND {end_id}
-                """
-                
-            elif update_type == 'status_update':
-                # Update status for a category
-                category = random.choice(categories)
-                new_status = random.choice(statuses)
-                query = f"""
-                    UPDATE stress_test.{self.table_name} 
-                    SET status = '{new_status}',
-                        last_updated = TIMESTAMP '{current_timestamp}',
-                        version = version + 1
-                    WHERE category = '{category}' AND priority > {random.randint(1, 3)}
-                """
-                
-            elif update_type == 'priority_update':
-                # Update priority based on value
-                threshold = random.randint(100, 800)
-                new_priority = random.randint(1, 5)
-                query = f"""
-                    UPDATE stress_test.{self.table_name} 
-                    SET priority = {new_priority},
-                        last_updated = TIMESTAMP '{current_timestamp}',
-                        version = version + 1
-                    WHERE value > {threshold}
-                """
-                
-            elif update_type == 'category_update':
-                # Update category for specific status
-                old_status = random.choice(statuses)
-                new_category = random.choice(categories)
-                query = f"""
-                    UPDATE stress_test.{self.table_name} 
-                    SET category = '{new_category}',
-                        last_updated = TIMESTAMP '{current_timestamp}',
-                        version = version + 1
-                    WHERE status = '{old_status}' AND id % 10 = {random.randint(0, 9)}
-                """
-                
-            elif update_type == 'version_increment':
-                # Increment version for all rows with specific criteria
-                min_value = random.randint(50, 500)
-                query = f"""
-                    UPDATE stress_test.{self.table_name} 
-                    SET version = version + 1,
-                        last_updated = TIMESTAMP '{current_timestamp}'
-                    WHERE value > {min_value} AND priority <= 3
-                """
-                
-            elif update_type == 'bulk_update':
-                # Bulk update with multiple conditions
-                category = random.choice(categories)
-                status = random.choice(statuses)
-                new_value_multiplier = round(random.uniform(0.8, 1.2), 2)
-                query = f"""
-                    UPDATE stress_test.{self.table_name} 
-                    SET value = value * {new_value_multiplier},
-                        status = '{status}',
-                        last_updated = TIMESTAMP '{current_timestamp}',
-                        version = version + 1
-                    WHERE category = '{category}' AND version < 5
-                """
-            
-            queries.append(query.strip())
+        date_literals = self.partition_date_literals
+        
+        types = rng.integers(0, len(UPDATE_TYPES), size=num_updates)
+        start_ids = rng.integers(0, self.id_blocks(), size=num_updates) * FILE_STRIDE + 1
+        end_ids = (start_ids + (FILE_STRIDE - 1)).tolist()
+        start_ids = start_ids.tolist()
+        new_values = np.round(rng.uniform(10.0, 2000.0, size=num_updates), 2).tolist()
+        categories = rng.choice(CATEGORIES, size=num_updates).tolist()
+        statuses = rng.choice(UPDATE_STATUSES, size=num_updates).tolist()
+        min_priorities = rng.integers(1, 4, size=num_updates).tolist()
+        thresholds = rng.integers(100, 801, size=num_updates).tolist()
+        new_priorities = rng.integers(1, 6, size=num_updates).tolist()
+        remainders = rng.integers(0, 10, size=num_updates).tolist()
+        min_values = rng.integers(50, 501, size=num_updates).tolist()
+        multipliers = np.round(rng.uniform(0.8, 1.2, size=num_updates), 2).tolist()
+        partition_dates = [date_literals[d] for d in rng.integers(0, len(date_literals), size=num_updates).tolist()]
+        
+        buckets = {update_type: np.flatnonzero(types == k).tolist() for k, update_type in enumerate(UPDATE_TYPES)}
+        
+        templates = self.update_templates
+        for i in buckets['value_update']:
+            queries[i] = templates['value_update'].format(
+                value=new_values[i], ts=current_timestamp, start_id=start_ids[i], end_id=end_ids[i],
+                partition_date=partition_dates[i])
+        for i in buckets['status_update']:
+            queries[i] = templates['status_update'].format(
+                status=statuses[i], ts=current_timestamp, category=categories[i], min_priority=min_priorities[i],
+                partition_date=partition_dates[i])
+        for i in buckets['priority_update']:
+            queries[i] = templates['priority_update'].format(
+                priority=new_priorities[i], ts=current_timestamp, threshold=thresholds[i],
+                partition_date=partition_dates[i])
+        for i in buckets['category_update']:
+            queries[i] = templates['category_update'].format(
+                category=categories[i], ts=current_timestamp, status=statuses[i], remainder=remainders[i],
+                partition_date=partition_dates[i])
+        for i in buckets['version_increment']:
+            queries[i] = templates['version_increment'].format(
+                ts=current_timestamp, min_value=min_values[i], partition_date=partition_dates[i])
+        for i in buckets['bulk_update']:
+            queries[i] = templates['bulk_update'].format(
+                multiplier=multipliers[i], status=statuses[i], ts=current_timestamp, category=categories[i],
+                partition_date=partition_dates[i])
         
         return queries
 
-    def update_stress_worker(self, catalog_name: str, thread_num: int, updates_per_batch: int, num_batches: int, delay_range: tuple):
-        """Worker function for stress testing updates"""
-        if catalog_name == "iceberg_polaris":
-            conn = self.polaris_conn
-        elif catalog_name == "iceberg_hms":
-            conn = self.hms_conn
-        else:  # iceberg_nessie
-            conn = self.nessie_conn
-            
+    def generate_merge_query(self, num_updates: int,
+                             rng: Optional[np.random.Generator] = None) -> Tuple[str, int]:
+        """Coalesce ``num_updates`` value updates into one MERGE, committed as a single snapshot
+        
+        Only value updates are coalesced: their id-range predicate maps onto a MERGE join. Each
+        source row takes a distinct (id block, partition) cell because MERGE rejects a target row
+        matched by two source rows; a batch larger than the number of cells is capped to it.
+        Returns the MERGE and its number of source rows.
+        """
+        rng = rng or self.rng
+        current_timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        date_literals = self.partition_date_literals
+        cell_count = self.id_blocks() * len(date_literals)
+        cells = rng.choice(cell_count, size=min(num_updates, cell_count), replace=False)
+        start_ids = (cells // len(date_literals) * FILE_STRIDE + 1).tolist()
+        days = (cells % len(date_literals)).tolist()
+        new_values = np.round(rng.uniform(10.0, 2000.0, size=len(cells)), 2).tolist()
+        
+        rows = ", ".join(
+            f"({start_id}, {start_id + FILE_STRIDE - 1}, {new_value}, DATE '{date_literals[day]}')"
+            for start_id, new_value, day in zip(start_ids, new_values, days)
+        )
+        return self.merge_template.format(rows=rows, ts=current_timestamp), len(start_ids)
+
+    async def update_stress_worker(self, catalog_name: str, thread_num: int, updates_per_batch: int, num_batches: int,
+                                   delay_range: tuple, update_mode: str = 'statement',
+                                   rng: Optional[np.random.Generator] = None):
+        """Worker coroutine for stress testing updates, drawing queries and delays from its own ``rng``
+        
+        Queries are generated on the event loop; each blocking statement runs on the I/O pool
+        while the other workers' coroutines proceed.
+        """
+        rng = rng or self.spawn_rng()
+        loop = asyncio.get_running_loop()
         results = []
         thread_id = f"{catalog_name}-UT{thread_num}"
         
         logger.info(f"[{thread_id}] Starting update stress test: {num_batches} batches of {updates_per_batch} updates each")
         
-        for batch_id in range(num_batches):
-            try:
-                # Generate update queries for this batch
-                update_queries = self.generate_update_queries(thread_id, updates_per_batch)
-                
-                logger.info(f"[{thread_id}] Executing batch {batch_id + 1}/{num_batches} ({len(update_queries)} updates)")
-                
-                batch_start_time = time.time()
-                batch_results = []
-                
-                for query_idx, query in enumerate(update_queries):
-                    result = self.execute_query(conn, query, thread_id)
-                    batch_results.append(result)
+        async with self.acquire_async(catalog_name) as (conn, cursor):
+            for batch_id in range(num_batches):
+                try:
+                    # Generate update queries for this batch
+                    if update_mode == 'merge':
+                        merge_query, merge_rows = self.generate_merge_query(updates_per_batch, rng)
+                        update_queries = [merge_query]
+                        logger.info(f"[{thread_id}] Executing batch {batch_id + 1}/{num_batches} ({merge_rows} updates in one MERGE)")
+                    else:
+                        update_queries = self.generate_update_queries(thread_id, updates_per_batch, rng)
+                        logger.info(f"[{thread_id}] Executing batch {batch_id + 1}/{num_batches} ({len(update_queries)} updates)")
                     
-                    if not result['success']:
-                        logger.warning(f"[{thread_id}] Update {query_idx + 1} failed: {result.get('error')}")
-                
-                batch_duration = time.time() - batch_start_time
-                successful_updates = len([r for r in batch_results if r['success']])
-                total_rows_affected = sum(r.get('rows_count', 0) for r in batch_results if r['success'])
-                
-                logger.info(f"[{thread_id}] Batch {batch_id + 1} completed: {successful_updates}/{len(update_queries)} updates successful, {total_rows_affected} rows affected, {batch_duration:.2f}s")
-                
-                results.extend(batch_results)
-                
-                # Random delay between batches
-                delay = random.uniform(delay_range[0], delay_range[1])
-                time.sleep(delay)
+                    batch_start_time = time.perf_counter()
+                    batch_results = []
+                    
+                    for query_idx, query in enumerate(update_queries):
+                        result = await loop.run_in_executor(
+                            self._executor, self.execute_query, conn, query, thread_id, None, thread_id, cursor
+                        )
+                        batch_results.append(result)
+                        
+                        if not result.success:
+                            logger.warning(f"[{thread_id}] Update {query_idx + 1} failed: {result.error}")
+                    
+                    batch_duration = time.perf_counter() - batch_start_time
+                    successful_updates = len([r for r in batch_results if r.success])
+                    total_rows_affected = sum(r.rows_count or 0 for r in batch_results if r.success)
+                    
+                    logger.info(f"[{thread_id}] Batch {batch_id + 1} completed: {successful_updates}/{len(update_queries)} updates successful, {total_rows_affected} rows affected, {batch_duration:.2f}s")
+                    
+                    results.extend(batch_results)
+                    
+                    # Random delay between batches
+                    delay = rng.uniform(delay_range[0], delay_range[1])
+                    await asyncio.sleep(delay)
                 
-            except Exception as e:
-                logger.error(f"[{thread_id}] Unexpected error in batch {batch_id}: {e}")
-                results.append({
-                    'catalog': thread_id,
-                    'success': False,
-                    'error': str(e),
-                    'duration': 0,
-                    'timestamp': time.time()
-                })
+                except Exception as e:
+                    logger.error(f"[{thread_id}] Unexpected error in batch {batch_id}: {e}")
+                    results.append(QueryResult(
+                        catalog=thread_id,
+                        success=False,
+                        error=str(e),
+                        duration=0,
+                        timestamp=time.time()
+                    ))
         
         logger.info(f"[{thread_id}] Completed all {num_batches} batches")
         return results
 
-    def run_update_stress_test(self, initial_rows=10000, threads_per_catalog=3, updates_per_batch=5, num_batches=10, delay_range=(0.2, 1.0)):
-        """Run comprehensive update stress test"""
+    async def _run_update_workers(self, threads_per_catalog: int, updates_per_batch: int, num_batches: int,
+                                  delay_range: tuple, update_mode: str) -> List[QueryResult]:
+        """Run every catalog's update workers concurrently on one event loop"""
+        workers = [
+            self.update_stress_worker(catalog_name, i, updates_per_batch, num_batches, delay_range,
+                                      update_mode, self.spawn_rng())
+            for catalog_name in self.catalogs
+            for i in range(threads_per_catalog)
+        ]
+        
+        all_results = []
+        for outcome in await asyncio.gather(*workers, return_exceptions=True):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Task failed: {outcome}")
+            else:
+                all_results.extend(outcome)
+        return all_results
+
+    def run_update_workers(self, threads_per_catalog: int, updates_per_batch: int, num_batches: int,
+                           delay_range: tuple, update_mode: str) -> List[QueryResult]:
+        """Run this tester's update workers to completion and return their results"""
+        # Each worker keeps its own (connection, cursor) pair for the whole run
+        self.ensure_pool_size(threads_per_catalog)
+        
+        # One event loop drives all workers; the pool only runs their blocking Trino calls
+        with ThreadPoolExecutor(max_workers=threads_per_catalog * len(self.catalogs),
+                                thread_name_prefix="update-io") as executor:
+            self._executor = executor
+            try:
+                return asyncio.run(self._run_update_workers(
+                    threads_per_catalog, updates_per_batch, num_batches, delay_range, update_mode
+                ))
+            finally:
+                self._executor = None
+
+    def run_catalog_processes(self, threads_per_catalog: int, updates_per_batch: int, num_batches: int,
+                              delay_range: tuple, update_mode: str) -> List[QueryResult]:
+        """Run each catalog's update workers in a separate process and gather their results"""
+        seeds = self.seed_sequence.spawn(len(self.catalogs))
+        # Spawned children start with unconfigured logging, so each sets up its own queue listener
+        with ProcessPoolExecutor(max_workers=len(self.catalogs), initializer=start_queue_logging,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            tasks = {
+                executor.submit(run_catalog_in_process, self.host, self.port, self.user, catalog_name,
+                                self.table_name, self.initial_rows, self.partition_dates, seed,
+                                threads_per_catalog, updates_per_batch, num_batches, delay_range, update_mode): catalog_name
+                for catalog_name, seed in zip(self.catalogs, seeds)
+            }
+            all_results = []
+            for task in as_completed(tasks):
+                try:
+                    all_results.extend(task.result())
+                except Exception as e:
+                    logger.error(f"Catalog process for {tasks[task]} failed: {e}")
+        return all_results
+
+    def run_update_stress_test(self, initial_rows=10000, threads_per_catalog=3, updates_per_batch=5, num_batches=10,
+                               delay_range=(0.2, 1.0), update_mode='statement',
+                               partition_spread=DEFAULT_PARTITION_SPREAD, catalog_processes=False):
+        """Run comprehensive update stress test
+        
+        ``update_mode='merge'`` turns each batch into one MERGE of disjoint value updates, so
+        every batch costs one Iceberg commit instead of ``updates_per_batch``. Initial rows are
+        spread over ``partition_spread`` daily partitions and each update targets one of them.
+        With ``catalog_processes`` every catalog's workers run in their own process, so the
+        catalogs do not share one interpreter's GIL.
+        """
+        if update_mode not in UPDATE_MODES:
+            raise ValueError(f"update_mode must be one of {UPDATE_MODES}, got {update_mode!r}")
+        self.set_partition_spread(partition_spread)
+        
         logger.info("="*80)
         logger.info("STARTING UPDATE STRESS TEST")
         logger.info("="*80)
@@ -428,162 +531,82 @@ class UpdateStressTester:
         logger.info(f"  - Batches per thread: {num_batches}")
         logger.info(f"  - Total updates per catalog: {threads_per_catalog * updates_per_batch * num_batches:,}")
         logger.info(f"  - Total updates across all catalogs: {3 * threads_per_catalog * updates_per_batch * num_batches:,}")
+        logger.info(f"  - Update mode: {update_mode}")
+        logger.info(f"  - Partition spread: {partition_spread} day(s)")
+        logger.info(f"  - Process per catalog: {catalog_processes}")
         logger.info(f"  - Delay range: {delay_range}")
         logger.info("="*80)
         
         # Setup test environment
         print("Setting up update stress test environment...")
         self.setup_stress_environment(initial_rows)
+        start_time = time.perf_counter()
         
-        start_time = time.time()
-        all_results = []
-        
-        # Create tasks for all catalogs
-        tasks = []
-        with ThreadPoolExecutor(max_workers=threads_per_catalog * 3) as executor:
-            # Submit tasks for Polaris
-            for i in range(threads_per_catalog):
-                task = executor.submit(
-                    self.update_stress_worker, 
-                    "iceberg_polaris", 
-                    i, 
-                    updates_per_batch,
-                    num_batches, 
-                    delay_range
-                )
-                tasks.append(task)
-            
-            # Submit tasks for HMS
-            for i in range(threads_per_catalog):
-                task = executor.submit(
-                    self.update_stress_worker, 
-                    "iceberg_hms", 
-                    i, 
-                    updates_per_batch,
-                    num_batches, 
-                    delay_range
-                )
-                tasks.append(task)
-            
-            # Submit tasks for Nessie
-            for i in range(threads_per_catalog):
-                task = executor.submit(
-                    self.update_stress_worker, 
-                    "iceberg_nessie", 
-                    i, 
-                    updates_per_batch,
-                    num_batches, 
-                    delay_range
-                )
-                tasks.append(task)
-            
-            # Collect results
-            for task in as_completed(tasks):
-                try:
-                    results = task.result()
-                    all_results.extend(results)
-                except Exception as e:
-                    logger.error(f"Task failed: {e}")
+        if catalog_processes:
+            all_results = self.run_catalog_processes(
+                threads_per_catalog, updates_per_batch, num_batches, delay_range, update_mode
+            )
+        else:
+            all_results = self.run_update_workers(
+                threads_per_catalog, updates_per_batch, num_batches, delay_range, update_mode
+            )
         
-        end_time = time.time()
-        total_duration = end_time - start_time
+        total_duration = time.perf_counter() - start_time
         
         # Analyze results
         self.analyze_update_results(all_results, total_duration)
         
         return all_results
 
-    def analyze_update_results(self, results: List[Dict[str, Any]], total_duration: float):
+    def analyze_update_results(self, results: List[QueryResult], total_duration: float):
         """Analyze and print update stress test results"""
-        # Separate results by catalog
-        polaris_results = [r for r in results if 'iceberg_polaris-UT' in r['catalog']]
-        hms_results = [r for r in results if 'iceberg_hms-UT' in r['catalog']]
-        nessie_results = [r for r in results if 'iceberg_nessie-UT' in r['catalog']]
-        
-        # Calculate success/failure counts
-        polaris_success = [r for r in polaris_results if r['success']]
-        polaris_failed = [r for r in polaris_results if not r['success']]
-        hms_success = [r for r in hms_results if r['success']]
-        hms_failed = [r for r in hms_results if not r['success']]
-        nessie_success = [r for r in nessie_results if r['success']]
-        nessie_failed = [r for r in nessie_results if not r['success']]
+        # Single pass: bucket every result by catalog (worker labels are "<catalog>-UT<n>") and outcome
+        buckets: Dict[str, Dict[bool, List[QueryResult]]] = {
+            catalog_name: {True: [], False: []} for catalog_name in CATALOGS
+        }
+        for r in results:
+            bucket = buckets.get(r.catalog.partition('-UT')[0])
+            if bucket is not None:
+                bucket[r.success].append(r)
         
         print("\n" + "="*80)
         print("UPDATE STRESS TEST RESULTS")
         print("="*80)
         print(f"Total test duration: {total_duration:.2f}s")
         
-        # Polaris results
-        print(f"\nPOLARIS CATALOG (iceberg_polaris):")
-        print(f"  Total update operations: {len(polaris_results)}")
-        if polaris_results:
-            print(f"  Successful: {len(polaris_success)} ({len(polaris_success)/len(polaris_results)*100:.1f}%)")
-            print(f"  Failed: {len(polaris_failed)} ({len(polaris_failed)/len(polaris_results)*100:.1f}%)")
-        
-        if polaris_success:
-            durations = [r['duration'] for r in polaris_success]
-            total_rows_affected = sum(r.get('rows_count', 0) for r in polaris_success)
-            print(f"  Total rows affected: {total_rows_affected:,}")
-            print(f"  Average duration: {statistics.mean(durations):.3f}s")
-            print(f"  Median duration: {statistics.median(durations):.3f}s")
-            print(f"  Min duration: {min(durations):.3f}s")
-            print(f"  Max duration: {max(durations):.3f}s")
-            if len(durations) > 1:
-                print(f"  Std deviation: {statistics.stdev(durations):.3f}s")
-            print(f"  Updates per second: {len(polaris_success)/total_duration:.1f}")
-            if total_rows_affected > 0:
-                print(f"  Rows affected per second: {total_rows_affected/total_duration:.1f}")
-        
-        # HMS results
-        print(f"\nHIVE METASTORE CATALOG (iceberg_hms):")
-        print(f"  Total update operations: {len(hms_results)}")
-        print(f"  Successful: {len(hms_success)} ({len(hms_success)/len(hms_results)*100:.1f}%)")
-        print(f"  Failed: {len(hms_failed)} ({len(hms_failed)/len(hms_results)*100:.1f}%)")
-        
-        if hms_success:
-            durations = [r['duration'] for r in hms_success]
-            total_rows_affected = sum(r.get('rows_count', 0) for r in hms_success)
-            print(f"  Total rows affected: {total_rows_affected:,}")
-            print(f"  Average duration: {statistics.mean(durations):.3f}s")
-            print(f"  Median duration: {statistics.median(durations):.3f}s")
-            print(f"  Min duration: {min(durations):.3f}s")
-            print(f"  Max duration: {max(durations):.3f}s")
-            if len(durations) > 1:
-                print(f"  Std deviation: {statistics.stdev(durations):.3f}s")
-            print(f"  Updates per second: {len(hms_success)/total_duration:.1f}")
-            if total_rows_affected > 0:
-                print(f"  Rows affected per second: {total_rows_affected/total_duration:.1f}")
-        
-        # Nessie results
-        print(f"\nNESSIE CATALOG (iceberg_nessie):")
-        print(f"  Total update operations: {len(nessie_results)}")
-        if nessie_results:
-            print(f"  Successful: {len(nessie_success)} ({len(nessie_success)/len(nessie_results)*100:.1f}%)")
-            print(f"  Failed: {len(nessie_failed)} ({len(nessie_failed)/len(nessie_results)*100:.1f}%)")
-        
-        if nessie_success:
-            durations = [r['duration'] for r in nessie_success]
-            total_rows_affected = sum(r.get('rows_count', 0) for r in nessie_success)
-            print(f"  Total rows affected: {total_rows_affected:,}")
-            print(f"  Average duration: {statistics.mean(durations):.3f}s")
-            print(f"  Median duration: {statistics.median(durations):.3f}s")
-            print(f"  Min duration: {min(durations):.3f}s")
-            print(f"  Max duration: {max(durations):.3f}s")
-            if len(durations) > 1:
-                print(f"  Std deviation: {statistics.stdev(durations):.3f}s")
-            print(f"  Updates per second: {len(nessie_success)/total_duration:.1f}")
-            if total_rows_affected > 0:
-                print(f"  Rows affected per second: {total_rows_affected/total_duration:.1f}")
-        
-        # Performance comparison
         catalogs_data = []
-        if polaris_success:
-            catalogs_data.append(("Polaris", statistics.mean([r['duration'] for r in polaris_success])))
-        if hms_success:
-            catalogs_data.append(("HMS", statistics.mean([r['duration'] for r in hms_success])))
-        if nessie_success:
-            catalogs_data.append(("Nessie", statistics.mean([r['duration'] for r in nessie_success])))
+        failures = []
+        for catalog_name, short_name, title in CATALOG_DISPLAY:
+            success = buckets[catalog_name][True]
+            failed = buckets[catalog_name][False]
+            total = len(success) + len(failed)
+            failed_count = len(failed)
+            
+            print(f"\n{title} CATALOG ({catalog_name}):")
+            print(f"  Total update operations: {total}")
+            if total:
+                print(f"  Successful: {len(success)} ({len(success)/total*100:.1f}%)")
+                print(f"  Failed: {failed_count} ({failed_count/total*100:.1f}%)")
+            
+            if len(success):
+                durations = np.fromiter((r.duration for r in success), dtype=np.float64, count=len(success))
+                total_rows_affected = sum(r.rows_count or 0 for r in success)
+                print(f"  Total rows affected: {total_rows_affected:,}")
+                print(f"  Average duration: {durations.mean():.3f}s")
+                print(f"  Median duration: {np.median(durations):.3f}s")
+                print(f"  Min duration: {durations.min():.3f}s")
+                print(f"  Max duration: {durations.max():.3f}s")
+                if len(durations) > 1:
+                    print(f"  Std deviation: {durations.std(ddof=1):.3f}s")
+                print(f"  Updates per second: {len(success)/total_duration:.1f}")
+                if total_rows_affected > 0:
+                    print(f"  Rows affected per second: {total_rows_affected/total_duration:.1f}")
+                catalogs_data.append((short_name, float(durations.mean())))
+            
+            if failed:
+                failures.append((short_name, failed))
         
+        # Performance comparison
         if len(catalogs_data) > 1:
             print(f"\nPERFORMANCE COMPARISON:")
             catalogs_data.sort(key=lambda x: x[1])  # Sort by average duration
@@ -594,40 +617,52 @@ class UpdateStressTester:
                 print(f"  {name}: {slower_pct:.1f}% slower than {fastest[0]}")
         
         # Print sample failures
-        if polaris_failed:
-            print(f"\nSAMPLE POLARIS FAILURES:")
-            for r in polaris_failed[:3]:
-                print(f"  - {r['catalog']}: {r.get('error', 'Unknown error')[:100]}...")
-            if len(polaris_failed) > 3:
-                print(f"  ... and {len(polaris_failed) - 3} more failures")
-        
-        if hms_failed:
-            print(f"\nSAMPLE HMS FAILURES:")
-            for r in hms_failed[:3]:
-                print(f"  - {r['catalog']}: {r.get('error', 'Unknown error')[:100]}...")
-            if len(hms_failed) > 3:
-                print(f"  ... and {len(hms_failed) - 3} more failures")
-        
-        if nessie_failed:
-            print(f"\nSAMPLE NESSIE FAILURES:")
-            for r in nessie_failed[:3]:
-                print(f"  - {r['catalog']}: {r.get('error', 'Unknown error')[:100]}...")
-            if len(nessie_failed) > 3:
-                print(f"  ... and {len(nessie_failed) - 3} more failures")
+        for short_name, failed in failures:
+            print(f"\nSAMPLE {short_name.upper()} FAILURES:")
+            for r in failed[:3]:
+                print(f"  - {r.catalog}: {(r.error or 'Unknown error')[:100]}...")
+            if len(failed) > 3:
+                print(f"  ... and {len(failed) - 3} more failures")
         
         print("\n" + "="*80)
 
     def cleanup(self):
         """Clean up connections"""
-        if self.polaris_conn:
-            self.polaris_conn.close()
-        if self.hms_conn:
-            self.hms_conn.close()
-        if self.nessie_conn:
-            self.nessie_conn.close()
+        for catalog_name, pool in self.pools.items():
+            while True:
+                try:
+                    connection, cursor = pool.get_nowait()
+                    cursor.close()
+                    connection.close()
+                except queue.Empty:
+                    break
+            self.pool_sizes[catalog_name] = 0
+
+def run_catalog_in_process(host: str, port: int, user: str, catalog_name: str, table_name: str,
+                           initial_rows: int, partition_dates: Sequence[date], seed: np.random.SeedSequence,
+                           threads_per_catalog: int, updates_per_batch: int, num_batches: int,
+                           delay_range: tuple, update_mode: str) -> List[QueryResult]:
+    """Process entry point: run one catalog's update workers against the already populated table"""
+    tester = UpdateStressTester(host, port, user, catalogs=(catalog_name,), table_name=table_name)
+    try:
+        tester.initial_rows = initial_rows
+        tester.set_partition_dates(partition_dates)
+        tester.seed_sequence = seed
+        return tester.run_update_workers(threads_per_catalog, updates_per_batch, num_batches, delay_range, update_mode)
+    finally:
+        tester.cleanup()
 
 def main():
     """Main function to run the update stress tests"""
+    parser = argparse.ArgumentParser(description="UPDATE stress test for Polaris, HMS and Nessie catalogs")
+    parser.add_argument('--partition-spread', type=int, default=DEFAULT_PARTITION_SPREAD,
+                        help="spread initial rows over this many daily partitions; every update targets one "
+                             "(default: %(default)s = all rows in today's partition)")
+    parser.add_argument('--process-per-catalog', action='store_true',
+                        help="run each catalog's update workers in a separate process")
+    args = parser.parse_args()
+    start_queue_logging()
+    
     print("UPDATE STRESS TEST FOR POLARIS vs HIVE METASTORE vs NESSIE")
     print("="*70)
     
@@ -677,13 +712,15 @@ def main():
         num_batches = int(input("Number of batches per thread: "))
         min_delay = float(input("Min delay between batches (seconds): "))
         max_delay = float(input("Max delay between batches (seconds): "))
+        update_mode = input("Update mode - statement (one UPDATE each) or merge (one MERGE per batch) [statement]: ").strip() or 'statement'
         
         config = {
             'initial_rows': initial_rows,
             'threads_per_catalog': threads,
             'updates_per_batch': updates_per_batch,
             'num_batches': num_batches,
-            'delay_range': (min_delay, max_delay)
+            'delay_range': (min_delay, max_delay),
+            'update_mode': update_mode
         }
     elif choice in ["1", "2", "3"]:
         config = test_configs[int(choice) - 1]
@@ -700,10 +737,11 @@ def main():
         tester = UpdateStressTester()
         
         # Run stress test
-        results = tester.run_update_stress_test(**config)
+        results = tester.run_update_stress_test(**config, partition_spread=args.partition_spread,
+                                                catalog_processes=args.process_per_catalog)
         
         total_ops = len(results)
-        successful_ops = len([r for r in results if r['success']])
+        successful_ops = len([r for r in results if r.success])
         print(f"\nUpdate stress test completed!")
         print(f"Total update operations: {total_ops}")
         print(f"Successful operations: {successful_ops} ({successful_ops/total_ops*100:.1f}%)")
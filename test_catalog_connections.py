@@ -5,11 +5,39 @@ Quick test to verify all catalog connections work with new naming
 
 import trino
 import logging
+from functools import lru_cache
+from typing import Dict, Sequence
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def test_catalog_connections():
+@lru_cache(maxsize=None)
+def _shared_connection(host: str, port: int, user: str):
+    """One Trino connection per server, kept open for the process and shared by all probes"""
+    return trino.dbapi.connect(host=host, port=port, user=user)
+
+@lru_cache(maxsize=None)
+def _probe(host: str, port: int, catalog_name: str, user: str = 'admin') -> int:
+    """Return the number of schemas in a catalog; successful probes are memoized per run"""
+    cursor = _shared_connection(host, port, user).cursor()
+    cursor.execute(f"SHOW SCHEMAS FROM {catalog_name}")
+    return len(cursor.fetchall())
+
+def _count_schemas(host: str, port: int, catalog_names: Sequence[str], user: str = 'admin') -> Dict[str, int]:
+    """Count the schemas of several catalogs with one query against Trino's system catalog
+    
+    Catalogs that could not be listed are absent from the result.
+    """
+    placeholders = ", ".join(["?"] * len(catalog_names))
+    cursor = _shared_connection(host, port, user).cursor()
+    cursor.execute(
+        "SELECT table_catalog, count(*) FROM system.jdbc.schemas "
+        f"WHERE table_catalog IN ({placeholders}) GROUP BY table_catalog",
+        list(catalog_names)
+    )
+    return {catalog_name: count for catalog_name, count in cursor.fetchall()}
+
+def test_catalog_connections(host='localhost', port=8081):
     """Test connections to all three catalogs"""
     catalogs = {
         'iceberg_polaris': 'Polaris REST Catalog',
@@ -19,26 +47,23 @@ def test_catalog_connections():
     
     results = {}
     
+    # One metadata query for all catalogs; per-catalog probes only for what it could not answer
+    try:
+        schema_counts = _count_schemas(host, port, list(catalogs))
+    except Exception as e:
+        logger.warning(f"Batched schema listing failed, probing catalogs one by one - {e}")
+        schema_counts = {}
+    
     for catalog_name, display_name in catalogs.items():
         try:
             logger.info(f"Testing {display_name} ({catalog_name})...")
             
-            conn = trino.dbapi.connect(
-                host='localhost',
-                port=8081,
-                user='admin',
-                catalog=catalog_name,
-                schema='default'
-            )
-            
-            cursor = conn.cursor()
-            cursor.execute("SHOW SCHEMAS")
-            schemas = cursor.fetchall()
-            
-            conn.close()
+            schema_count = schema_counts.get(catalog_name)
+            if schema_count is None:
+                schema_count = _probe(host, port, catalog_name)
             
             results[catalog_name] = True
-            logger.info(f"✅ {display_name}: Connected successfully, found {len(schemas)} schemas")
+            logger.info(f"✅ {display_name}: Connected successfully, found {schema_count} schemas")
             
         except Exception as e:
             results[catalog_name] = False
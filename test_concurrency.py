@@ -6,14 +6,23 @@ Tests concurrent operations on different Iceberg catalogs:
 - iceberg_hms: Uses Hive Metastore
 """
 
+import argparse
+import asyncio
 import threading
 import time
-import random
 import logging
-from typing import List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
+import queue
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import trino
 
+from trino_pool import PooledTester
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,80 +30,226 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class TrinoConcurrencyTester:
-    def __init__(self, host='localhost', port=8081, user='admin'):
+# Result labels of the tested catalogs; "iceberg" runs against the Polaris connection
+CATALOGS = ("iceberg", "iceberg_hms")
+# Trino catalog behind each label
+CATALOG_IDS = {"iceberg": "iceberg_polaris", "iceberg_hms": "iceberg_hms"}
+# (label, report title, short name used for failures) in report order
+CATALOG_DISPLAY = (
+    ("iceberg", "POLARIS CATALOG", "POLARIS"),
+    ("iceberg_hms", "HIVE METASTORE CATALOG", "HMS"),
+)
+
+# One test row: id, name, value, created_at, partition_date
+TEST_COLUMNS = "id, name, value, created_at, partition_date"
+INSERT_ROW_PLACEHOLDER = "(?, ?, ?, ?, ?)"
+# Compacts the small files left by the insert phase before the read phase (--optimize)
+OPTIMIZE_STATEMENT = "ALTER TABLE test_schema.concurrent_test EXECUTE optimize(file_size_threshold => '128MB')"
+NAME_TMPL = "name_%d"
+# SELECT results are read FETCH_SIZE rows at a time and only counted; with debug_keep_rows
+# the first RESULT_SAMPLE_ROWS are also returned as 'results'
+FETCH_SIZE = 1000
+RESULT_SAMPLE_ROWS = 5
+# Seconds a cached read result stays valid; any write to the catalog invalidates it sooner
+RESULT_CACHE_TTL = 5.0
+# Seconds between consecutive worker start-ups, spreading their first statements
+WORKER_START_STAGGER = 0.01
+# Failures that mean Trino itself is unreachable or refusing us, not that one statement failed
+CONNECTION_ERRORS = (trino.exceptions.TrinoConnectionError, trino.exceptions.TrinoAuthError,
+                     trino.exceptions.HttpError, OSError)
+# Read statements prepared once per connection; workers only send ``EXECUTE <name>``
+READ_QUERIES = {
+    'rq0': "SELECT COUNT(*) FROM test_schema.concurrent_test",
+    'rq1': "SELECT partition_date, COUNT(*) FROM test_schema.concurrent_test GROUP BY 1",
+    'rq2': "SELECT partition_date, AVG(value) FROM test_schema.concurrent_test GROUP BY partition_date",
+    'rq3': "SELECT id, name, value FROM test_schema.concurrent_test ORDER BY id DESC LIMIT 10",
+    'rq4': "SELECT name, MAX(value), MIN(value) FROM test_schema.concurrent_test GROUP BY name LIMIT 5",
+}
+# Mixed-workload read; the threshold is supplied per call via ``EXECUTE pmix USING <n>``
+MIXED_READ_QUERY = ('pmix', "SELECT COUNT(*) FROM test_schema.concurrent_test WHERE value > ?")
+
+
+@lru_cache(maxsize=None)
+def build_insert_statement(table_name: str, batch_size: int) -> str:
+    """Build (once per table/batch size) the parameterized multi-row INSERT
+    
+    Rows are inserted through an ORDER BY partition_date, id so each partition's rows reach
+    the Iceberg writer together and a batch lands in as few data files as possible.
+    """
+    rows = ", ".join([INSERT_ROW_PLACEHOLDER] * batch_size)
+    return (
+        f"INSERT INTO {table_name} ({TEST_COLUMNS}) "
+        f"SELECT {TEST_COLUMNS} FROM (VALUES {rows}) AS t({TEST_COLUMNS}) "
+        "ORDER BY partition_date, id"
+    )
+
+
+class TrinoConcurrencyTester(PooledTester):
+    def __init__(self, host='localhost', port=8081, user='admin', use_cache: bool = False,
+                 debug_keep_rows: bool = False):
         self.host = host
         self.port = port
         self.user = user
-        self.polaris_conn = None
-        self.hms_conn = None
+        self.debug_keep_rows = debug_keep_rows
+        # Read results per (catalog, query): (stored at, rows_count, sample rows); None disables caching
+        self.result_cache: Optional[Dict[Tuple[str, str], Tuple[float, int, Any]]] = {} if use_cache else None
+        self._cache_lock = threading.Lock()
+        # Bumped by every write to a catalog; reads started under an older generation are not stored
+        self._cache_generation: Dict[str, int] = {catalog_name: 0 for catalog_name in CATALOGS}
+        # Per-catalog pools of idle connections; workers check one out for their lifetime
+        self.pools: Dict[str, queue.Queue] = {catalog_name: queue.Queue() for catalog_name in CATALOGS}
+        self.pool_sizes: Dict[str, int] = {catalog_name: 0 for catalog_name in CATALOGS}
+        # I/O pool running blocking Trino calls while a test's worker coroutines are active
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Set while a test is running once a worker raises or hits a connection-level error
+        self._abort: Optional[asyncio.Event] = None
+        # Workers draw from their own child streams; self.rng serves other callers
+        self.seed_sequence = np.random.SeedSequence()
+        self.rng = self.spawn_rng()
         self.setup_connections()
         
     def setup_connections(self):
-        """Setup connections to both catalogs"""
+        """Open one pooled connection to each catalog"""
+        # Whether the driver's cursors report rowcount, checked once instead of per query
+        self._has_rowcount = hasattr(trino.dbapi.Cursor, 'rowcount')
         try:
-            # Connection for Polaris catalog
-            self.polaris_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_polaris',
-                schema='default'
-            )
-            logger.info("Connected to Polaris catalog")
-            
-            # Connection for HMS catalog
-            self.hms_conn = trino.dbapi.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                catalog='iceberg_hms',
-                schema='default'
-            )
-            logger.info("Connected to HMS catalog")
-            
+            self.ensure_pool_size(1)
         except Exception as e:
             logger.error(f"Failed to setup connections: {e}")
             raise
 
-    def execute_query(self, connection, query: str, catalog_name: str) -> Dict[str, Any]:
-        """Execute a query and return results with timing"""
-        start_time = time.time()
+    def open_pool_entry(self, catalog_name: str):
+        """Open a connection to the catalog behind ``catalog_name`` with the read queries prepared"""
+        connection = trino.dbapi.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            catalog=CATALOG_IDS[catalog_name],
+            schema='default'
+        )
+        self.prepare_statements(connection)
+        return connection
+
+    def prepare_statements(self, connection):
+        """PREPARE the read queries on a connection so later calls only send EXECUTE
+        
+        The trino client keeps prepared statements in the connection's session, so
+        every cursor of ``connection`` can execute them by name.
+        """
+        cursor = connection.cursor()
+        for name, sql in (*READ_QUERIES.items(), MIXED_READ_QUERY):
+            cursor.execute(f"PREPARE {name} FROM {sql}")
+            cursor.fetchall()
+
+    def cached_result(self, catalog: str, query: str) -> Optional[Tuple[int, Any]]:
+        """Return (rows_count, sample rows) of a fresh cached read result, if any"""
+        with self._cache_lock:
+            entry = self.result_cache.get((catalog, query))
+        if entry is None or time.monotonic() - entry[0] >= RESULT_CACHE_TTL:
+            return None
+        return entry[1], entry[2]
+
+    def cache_generation(self, catalog: str) -> int:
+        """Return the catalog's current write generation"""
+        with self._cache_lock:
+            return self._cache_generation[catalog]
+
+    def store_result(self, catalog: str, query: str, generation: int, rows_count: int, sample: Any):
+        """Cache a read result unless a write to the catalog finished after the read started"""
+        with self._cache_lock:
+            if self._cache_generation[catalog] == generation:
+                self.result_cache[(catalog, query)] = (time.monotonic(), rows_count, sample)
+
+    def invalidate_cache(self, catalog: str):
+        """Drop the catalog's cached read results after a write
+        
+        Every read query targets test_schema.concurrent_test (prepared reads are only
+        visible by name), so a write to the catalog invalidates all of its entries and
+        bumps its generation so reads already in flight do not store stale results.
+        """
+        with self._cache_lock:
+            self._cache_generation[catalog] += 1
+            for key in [key for key in self.result_cache if key[0] == catalog]:
+                del self.result_cache[key]
+
+    def execute_query(self, connection, query: str, catalog_name: str,
+                      params: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """Execute a query (binding ``params`` if given) and return results with timing
+        
+        Unparameterized reads are answered from the result cache while it holds a fresh entry.
+        Log calls here use %-style arguments so nothing is formatted when INFO is disabled.
+        """
+        t0 = time.perf_counter_ns()
         thread_id = threading.current_thread().name
+        is_select = query.strip().upper().startswith(('SELECT', 'EXECUTE'))
+        catalog = catalog_name.partition('-')[0]
+        use_cache = self.result_cache is not None and params is None
+        
+        if is_select and use_cache:
+            generation = self.cache_generation(catalog)
+            cached = self.cached_result(catalog, query)
+            if cached is not None:
+                rows_count, sample = cached
+                duration = (time.perf_counter_ns() - t0) / 1e9
+                logger.info("[%s] Cache hit for: %.100s, rows: %d", catalog_name, query, rows_count)
+                result = {
+                    'catalog': catalog_name,
+                    'query': query,
+                    'duration': duration,
+                    'rows_count': rows_count,
+                    'success': True,
+                    'thread_id': thread_id,
+                    'cached': True
+                }
+                if self.debug_keep_rows:
+                    result['results'] = sample
+                return result
         
         try:
             cursor = connection.cursor()
-            logger.info(f"[{catalog_name}] Executing: {query[:100]}...")
+            logger.info("[%s] Executing: %.100s...", catalog_name, query)
             
-            cursor.execute(query)
+            cursor.execute(query, params)
             
-            # Fetch results if it's a SELECT query
-            if query.strip().upper().startswith('SELECT'):
-                results = cursor.fetchall()
-                rows_count = len(results)
+            # Stream SELECT results in pages; rows are counted, not kept
+            sample = None
+            if is_select:
+                batch = cursor.fetchmany(FETCH_SIZE)
+                rows_count = len(batch)
+                if self.debug_keep_rows:
+                    sample = batch[:RESULT_SAMPLE_ROWS]
+                while True:
+                    batch = cursor.fetchmany(FETCH_SIZE)
+                    if not batch:
+                        break
+                    rows_count += len(batch)
+                if use_cache:
+                    self.store_result(catalog, query, generation, rows_count, sample)
             else:
-                results = None
-                rows_count = cursor.rowcount if hasattr(cursor, 'rowcount') else 0
+                # The trino client's execute() already waited for DDL/DML to finish
+                rows_count = cursor.rowcount if self._has_rowcount else 0
+                if self.result_cache is not None:
+                    self.invalidate_cache(catalog)
             
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = (time.perf_counter_ns() - t0) / 1e9
             
-            logger.info(f"[{catalog_name}] Query completed in {duration:.2f}s, rows: {rows_count}")
+            logger.info("[%s] Query completed in %.3fs, rows: %d", catalog_name, duration, rows_count)
             
-            return {
+            result = {
                 'catalog': catalog_name,
                 'query': query,
                 'duration': duration,
                 'rows_count': rows_count,
                 'success': True,
-                'thread_id': thread_id,
-                'results': results
+                'thread_id': thread_id
             }
+            if self.debug_keep_rows:
+                result['results'] = sample
+            return result
             
         except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
-            logger.error(f"[{catalog_name}] Query failed after {duration:.2f}s: {e}")
+            duration = (time.perf_counter_ns() - t0) / 1e9
+            logger.error("[%s] Query failed after %.3fs: %s", catalog_name, duration, e)
             
             return {
                 'catalog': catalog_name,
@@ -102,31 +257,20 @@ class TrinoConcurrencyTester:
                 'duration': duration,
                 'success': False,
                 'error': str(e),
+                'connection_error': isinstance(e, CONNECTION_ERRORS),
                 'thread_id': thread_id
             }
 
     def setup_test_environment(self):
-        """Setup schemas and tables for testing"""
+        """Setup schemas and tables for testing
+        
+        Each catalog's DDL runs in order on its own connection; the catalogs are independent,
+        so their chains overlap and setup takes as long as the slower one.
+        """
         setup_queries = [
-            # Polaris setup
-            ("iceberg", "CREATE SCHEMA IF NOT EXISTS test_schema"),
-            ("iceberg", "DROP TABLE IF EXISTS test_schema.concurrent_test"),
-            ("iceberg", """
-                CREATE TABLE test_schema.concurrent_test (
-                    id bigint,
-                    name varchar,
-                    value double,
-                    created_at timestamp,
-                    partition_date date
-                ) WITH (
-                    partitioning = ARRAY['partition_date']
-                )
-            """),
-            
-            # HMS setup
-            ("iceberg_hms", "CREATE SCHEMA IF NOT EXISTS test_schema"),
-            ("iceberg_hms", "DROP TABLE IF EXISTS test_schema.concurrent_test"),
-            ("iceberg_hms", """
+            "CREATE SCHEMA IF NOT EXISTS test_schema",
+            "DROP TABLE IF EXISTS test_schema.concurrent_test",
+            """
                 CREATE TABLE test_schema.concurrent_test (
                     id bigint,
                     name varchar,
@@ -136,218 +280,257 @@ class TrinoConcurrencyTester:
                 ) WITH (
                     partitioning = ARRAY['partition_date']
                 )
-            """)
+            """
         ]
         
-        for catalog_name, query in setup_queries:
-            conn = self.polaris_conn if catalog_name == "iceberg" else self.hms_conn
-            result = self.execute_query(conn, query, catalog_name)
-            if not result['success']:
-                logger.error(f"Setup failed for {catalog_name}: {result.get('error')}")
+        def run_setup(catalog_name: str):
+            with self.acquire(catalog_name) as conn:
+                for query in setup_queries:
+                    result = self.execute_query(conn, query, catalog_name)
+                    if not result['success']:
+                        logger.error(f"Setup failed for {catalog_name}: {result.get('error')}")
+        
+        with ThreadPoolExecutor(max_workers=len(CATALOGS), thread_name_prefix="setup") as executor:
+            list(executor.map(run_setup, CATALOGS))
 
-    def generate_test_data_query(self, table_name: str, batch_size: int = 100) -> str:
-        """Generate INSERT query with test data"""
-        values = []
-        current_date = time.strftime('%Y-%m-%d')
-        
-        for i in range(batch_size):
-            id_val = random.randint(1, 1000000)
-            name_val = f"'name_{id_val}'"
-            value_val = round(random.uniform(1.0, 1000.0), 2)
-            created_at = f"TIMESTAMP '{current_date} {random.randint(0,23):02d}:{random.randint(0,59):02d}:{random.randint(0,59):02d}'"
-            partition_date = f"DATE '{current_date}'"
-            
-            values.append(f"({id_val}, {name_val}, {value_val}, {created_at}, {partition_date})")
+    def optimize_tables(self):
+        """Compact each catalog's test table, running the catalogs in parallel"""
+        def run_optimize(catalog_name: str):
+            with self.acquire(catalog_name) as conn:
+                result = self.execute_query(conn, OPTIMIZE_STATEMENT, catalog_name)
+                if not result['success']:
+                    logger.error(f"Optimize failed for {catalog_name}: {result.get('error')}")
+        
+        with ThreadPoolExecutor(max_workers=len(CATALOGS), thread_name_prefix="optimize") as executor:
+            list(executor.map(run_optimize, CATALOGS))
+
+    def generate_test_data_query(self, table_name: str, batch_size: int = 100,
+                                 rng: Optional[np.random.Generator] = None) -> Tuple[str, List[Any]]:
+        """Generate a parameterized INSERT query and its flattened test data"""
+        rng = rng or self.rng
+        today = date.today()
+        midnight = datetime.combine(today, datetime.min.time())
+        
+        # Draw every column for the whole batch in one vectorized call each; ids are pre-sorted
+        ids = np.sort(rng.integers(1, 1_000_001, size=batch_size)).tolist()
+        values = np.round(rng.uniform(1.0, 1000.0, size=batch_size), 2).tolist()
+        seconds = rng.integers(0, 86400, size=batch_size).tolist()
+        
+        rows = (
+            (id_val, NAME_TMPL % id_val, value_val, midnight + timedelta(seconds=sec), today)
+            for id_val, value_val, sec in zip(ids, values, seconds)
+        )
+        return build_insert_statement(table_name, batch_size), list(chain.from_iterable(rows))
+
+    async def _run_statement(self, conn, query: str, label: str,
+                             params: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """Run one statement on the I/O pool; a connection-level failure stops the other workers"""
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.execute_query, conn, query, label, params
+        )
+        if result.get('connection_error'):
+            self._abort.set()
+        return result
+
+    async def _gather_workers(self, worker, num_threads: int) -> List[Dict[str, Any]]:
+        """Run ``num_threads`` copies of ``worker`` per catalog concurrently on one event loop
+        
+        Worker starts are staggered by WORKER_START_STAGGER. Once a worker raises or a statement
+        fails with a connection-level error, the shared abort event is set and every worker stops
+        before sending its next statement. Nothing is cancelled, so a connection only returns to
+        the pool after its current statement has finished, and all results so far are kept.
+        """
+        self._abort = asyncio.Event()
+        
+        async def staggered(delay: float, catalog_name: str, thread_num: int):
+            await asyncio.sleep(delay)
+            if self._abort.is_set():
+                return []
+            try:
+                return await worker(catalog_name, thread_num)
+            except Exception:
+                self._abort.set()
+                raise
+        
+        # Interleave the catalogs so both start their workers at the same pace
+        starts = [(catalog_name, i) for i in range(num_threads) for catalog_name in CATALOGS]
+        workers = [staggered(n * WORKER_START_STAGGER, catalog_name, i)
+                   for n, (catalog_name, i) in enumerate(starts)]
         
-        return f"INSERT INTO {table_name} VALUES {', '.join(values)}"
+        all_results = []
+        for outcome in await asyncio.gather(*workers, return_exceptions=True):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Task failed: {outcome}")
+            else:
+                all_results.extend(outcome)
+        if self._abort.is_set():
+            logger.error(f"Test stopped early after a worker failure; kept {len(all_results)} results")
+        return all_results
 
-    def concurrent_insert_test(self, num_threads: int = 5, inserts_per_thread: int = 3):
-        """Test concurrent inserts to both catalogs"""
+    def run_workers(self, worker, num_threads: int, thread_name_prefix: str) -> List[Dict[str, Any]]:
+        """Drive the worker coroutines to completion; the pool only runs their blocking Trino calls"""
+        # Size the pools so no two workers ever share a connection's Trino session
+        self.ensure_pool_size(num_threads)
+        
+        with ThreadPoolExecutor(max_workers=num_threads * len(CATALOGS),
+                                thread_name_prefix=thread_name_prefix) as executor:
+            self._executor = executor
+            try:
+                return asyncio.run(self._gather_workers(worker, num_threads))
+            finally:
+                self._executor = None
+
+    def concurrent_insert_test(self, num_threads: int = 5, inserts_per_thread: int = 3,
+                               think_time: tuple = (0.1, 0.5)):
+        """Test concurrent inserts to both catalogs, pausing a random ``think_time`` range between inserts"""
         logger.info(f"Starting concurrent insert test with {num_threads} threads, {inserts_per_thread} inserts per thread")
         
-        def insert_worker(catalog_name: str, thread_num: int):
-            conn = self.polaris_conn if catalog_name == "iceberg" else self.hms_conn
-            results = []
-            
-            for i in range(inserts_per_thread):
-                query = self.generate_test_data_query("test_schema.concurrent_test", 50)
-                result = self.execute_query(conn, query, f"{catalog_name}-T{thread_num}")
-                results.append(result)
+        async def insert_worker(catalog_name: str, thread_num: int):
+            async with self.acquire_async(catalog_name) as conn:
+                rng = self.spawn_rng()
+                delays = rng.uniform(think_time[0], think_time[1], size=inserts_per_thread).tolist()
+                results = []
                 
-                # Small delay between inserts
-                time.sleep(random.uniform(0.1, 0.5))
+                for delay in delays:
+                    if self._abort.is_set():
+                        break
+                    query, params = self.generate_test_data_query("test_schema.concurrent_test", 50, rng)
+                    result = await self._run_statement(conn, query, f"{catalog_name}-T{thread_num}", params)
+                    results.append(result)
+                    
+                    # Think time between inserts
+                    if delay:
+                        await asyncio.sleep(delay)
             
             return results
         
-        # Create tasks for both catalogs
-        tasks = []
-        with ThreadPoolExecutor(max_workers=num_threads * 2) as executor:
-            # Submit tasks for Polaris
-            for i in range(num_threads):
-                task = executor.submit(insert_worker, "iceberg", i)
-                tasks.append(task)
-            
-            # Submit tasks for HMS
-            for i in range(num_threads):
-                task = executor.submit(insert_worker, "iceberg_hms", i)
-                tasks.append(task)
-            
-            # Collect results
-            all_results = []
-            for task in as_completed(tasks):
-                try:
-                    results = task.result()
-                    all_results.extend(results)
-                except Exception as e:
-                    logger.error(f"Task failed: {e}")
-        
-        return all_results
+        return self.run_workers(insert_worker, num_threads, "insert-io")
 
-    def concurrent_read_test(self, num_threads: int = 5, queries_per_thread: int = 3):
-        """Test concurrent reads from both catalogs"""
+    def concurrent_read_test(self, num_threads: int = 5, queries_per_thread: int = 3,
+                             think_time: tuple = (0.1, 0.3)):
+        """Test concurrent reads from both catalogs, pausing a random ``think_time`` range between queries"""
         logger.info(f"Starting concurrent read test with {num_threads} threads, {queries_per_thread} queries per thread")
         
-        read_queries = [
-            "SELECT COUNT(*) FROM test_schema.concurrent_test",
-            "SELECT partition_date, COUNT(*) FROM test_schema.concurrent_test GROUP BY 1",
-            "SELECT partition_date, AVG(value) FROM test_schema.concurrent_test GROUP BY partition_date",
-            "SELECT * FROM test_schema.concurrent_test ORDER BY id DESC LIMIT 10",
-            "SELECT name, MAX(value), MIN(value) FROM test_schema.concurrent_test GROUP BY name LIMIT 5"
-        ]
-        
-        def read_worker(catalog_name: str, thread_num: int):
-            conn = self.polaris_conn if catalog_name == "iceberg" else self.hms_conn
-            results = []
-            
-            for i in range(queries_per_thread):
-                query = random.choice(read_queries)
-                result = self.execute_query(conn, query, f"{catalog_name}-R{thread_num}")
-                results.append(result)
+        async def read_worker(catalog_name: str, thread_num: int):
+            async with self.acquire_async(catalog_name) as conn:
+                statements = list(READ_QUERIES)
+                # Pre-roll the worker's query picks and think times
+                rng = self.spawn_rng()
+                picks = rng.integers(len(statements), size=queries_per_thread).tolist()
+                delays = rng.uniform(think_time[0], think_time[1], size=queries_per_thread).tolist()
+                results = []
                 
-                # Small delay between queries
-                time.sleep(random.uniform(0.1, 0.3))
+                for pick, delay in zip(picks, delays):
+                    if self._abort.is_set():
+                        break
+                    query = f"EXECUTE {statements[pick]}"
+                    result = await self._run_statement(conn, query, f"{catalog_name}-R{thread_num}")
+                    results.append(result)
+                    
+                    # Think time between queries
+                    if delay:
+                        await asyncio.sleep(delay)
             
             return results
         
-        # Create tasks for both catalogs
-        tasks = []
-        with ThreadPoolExecutor(max_workers=num_threads * 2) as executor:
-            # Submit tasks for Polaris
-            for i in range(num_threads):
-                task = executor.submit(read_worker, "iceberg", i)
-                tasks.append(task)
-            
-            # Submit tasks for HMS
-            for i in range(num_threads):
-                task = executor.submit(read_worker, "iceberg_hms", i)
-                tasks.append(task)
-            
-            # Collect results
-            all_results = []
-            for task in as_completed(tasks):
-                try:
-                    results = task.result()
-                    all_results.extend(results)
-                except Exception as e:
-                    logger.error(f"Task failed: {e}")
-        
-        return all_results
+        return self.run_workers(read_worker, num_threads, "read-io")
 
-    def mixed_workload_test(self, num_threads: int = 4, operations_per_thread: int = 5):
-        """Test mixed read/write workload"""
+    def mixed_workload_test(self, num_threads: int = 4, operations_per_thread: int = 5,
+                            think_time: tuple = (0.1, 0.8)):
+        """Test mixed read/write workload, pausing a random ``think_time`` range between operations"""
         logger.info(f"Starting mixed workload test with {num_threads} threads, {operations_per_thread} operations per thread")
         
-        def mixed_worker(catalog_name: str, thread_num: int):
-            conn = self.polaris_conn if catalog_name == "iceberg" else self.hms_conn
-            results = []
-            
-            for i in range(operations_per_thread):
-                # Randomly choose between read and write operations
-                if random.random() < 0.6:  # 60% reads, 40% writes
-                    # Read operation
-                    query = "SELECT COUNT(*) FROM test_schema.concurrent_test WHERE value > " + str(random.randint(100, 500))
-                else:
-                    # Write operation
-                    query = self.generate_test_data_query("test_schema.concurrent_test", 25)
+        async def mixed_worker(catalog_name: str, thread_num: int):
+            async with self.acquire_async(catalog_name) as conn:
+                # Pre-roll the worker's operation mix, read thresholds and think times
+                rng = self.spawn_rng()
+                is_read = (rng.random(operations_per_thread) < 0.6).tolist()  # 60% reads, 40% writes
+                thresholds = rng.integers(100, 501, size=operations_per_thread).tolist()
+                delays = rng.uniform(think_time[0], think_time[1], size=operations_per_thread).tolist()
+                results = []
                 
-                result = self.execute_query(conn, query, f"{catalog_name}-M{thread_num}")
-                results.append(result)
-                
-                # Random delay
-                time.sleep(random.uniform(0.1, 0.8))
+                for read, threshold, delay in zip(is_read, thresholds, delays):
+                    if self._abort.is_set():
+                        break
+                    if read:
+                        # Read operation
+                        query = f"EXECUTE {MIXED_READ_QUERY[0]} USING {threshold}"
+                        params = None
+                    else:
+                        # Write operation
+                        query, params = self.generate_test_data_query("test_schema.concurrent_test", 25, rng)
+                    
+                    result = await self._run_statement(conn, query, f"{catalog_name}-M{thread_num}", params)
+                    results.append(result)
+                    
+                    # Think time between operations
+                    if delay:
+                        await asyncio.sleep(delay)
             
             return results
         
-        # Create tasks for both catalogs
-        tasks = []
-        with ThreadPoolExecutor(max_workers=num_threads * 2) as executor:
-            # Submit tasks for both catalogs
-            for catalog in ["iceberg", "iceberg_hms"]:
-                for i in range(num_threads):
-                    task = executor.submit(mixed_worker, catalog, i)
-                    tasks.append(task)
-            
-            # Collect results
-            all_results = []
-            for task in as_completed(tasks):
-                try:
-                    results = task.result()
-                    all_results.extend(results)
-                except Exception as e:
-                    logger.error(f"Task failed: {e}")
-        
-        return all_results
+        return self.run_workers(mixed_worker, num_threads, "mixed-io")
 
     def analyze_results(self, results: List[Dict[str, Any]]):
-        """Analyze and print test results"""
-        polaris_results = [r for r in results if 'iceberg' in r['catalog']]
-        hms_results = [r for r in results if 'iceberg_hms' in r['catalog']]
-        
-        successful_polaris = [r for r in polaris_results if r['success']]
-        successful_hms = [r for r in hms_results if r['success']]
-        
-        failed_polaris = [r for r in polaris_results if not r['success']]
-        failed_hms = [r for r in hms_results if not r['success']]
+        """Analyze and print test results in a single pass over ``results``
+        
+        Reads served from the result cache count as successful but are left out of the
+        duration statistics, which only describe queries that reached Trino.
+        """
+        # Per catalog: [successful, failed, duration sum, min, max, cached] plus the failed results
+        stats = {catalog_name: [0, 0, 0.0, math.inf, 0.0, 0] for catalog_name in CATALOGS}
+        failures = {catalog_name: [] for catalog_name in CATALOGS}
+        
+        for r in results:
+            # Labels are "<catalog>" or "<catalog>-<worker>"
+            catalog_name = r['catalog'].partition('-')[0]
+            bucket = stats.get(catalog_name)
+            if bucket is None:
+                continue
+            if r['success']:
+                bucket[0] += 1
+                if r.get('cached'):
+                    bucket[5] += 1
+                    continue
+                duration = r['duration']
+                bucket[2] += duration
+                if duration < bucket[3]:
+                    bucket[3] = duration
+                if duration > bucket[4]:
+                    bucket[4] = duration
+            else:
+                bucket[1] += 1
+                failures[catalog_name].append(r)
         
         print("\n" + "="*80)
         print("CONCURRENCY TEST RESULTS")
         print("="*80)
         
-        print(f"\nPOLARIS CATALOG:")
-        print(f"  Total operations: {len(polaris_results)}")
-        print(f"  Successful: {len(successful_polaris)}")
-        print(f"  Failed: {len(failed_polaris)}")
-        if successful_polaris:
-            avg_duration = sum(r['duration'] for r in successful_polaris) / len(successful_polaris)
-            print(f"  Average duration: {avg_duration:.2f}s")
-            print(f"  Min duration: {min(r['duration'] for r in successful_polaris):.2f}s")
-            print(f"  Max duration: {max(r['duration'] for r in successful_polaris):.2f}s")
-        
-        print(f"\nHIVE METASTORE CATALOG:")
-        print(f"  Total operations: {len(hms_results)}")
-        print(f"  Successful: {len(successful_hms)}")
-        print(f"  Failed: {len(failed_hms)}")
-        if successful_hms:
-            avg_duration = sum(r['duration'] for r in successful_hms) / len(successful_hms)
-            print(f"  Average duration: {avg_duration:.2f}s")
-            print(f"  Min duration: {min(r['duration'] for r in successful_hms):.2f}s")
-            print(f"  Max duration: {max(r['duration'] for r in successful_hms):.2f}s")
+        for catalog_name, title, _ in CATALOG_DISPLAY:
+            successful, failed, total_duration, min_duration, max_duration, cached = stats[catalog_name]
+            timed = successful - cached
+            print(f"\n{title}:")
+            print(f"  Total operations: {successful + failed}")
+            print(f"  Successful: {successful}")
+            print(f"  Failed: {failed}")
+            if cached:
+                print(f"  Served from cache (not timed): {cached}")
+            if timed:
+                print(f"  Average duration: {total_duration / timed:.2f}s")
+                print(f"  Min duration: {min_duration:.2f}s")
+                print(f"  Max duration: {max_duration:.2f}s")
         
         # Print failed operations
-        if failed_polaris:
-            print(f"\nFAILED POLARIS OPERATIONS:")
-            for r in failed_polaris:
-                print(f"  - {r['query'][:60]}... : {r['error']}")
-        
-        if failed_hms:
-            print(f"\nFAILED HMS OPERATIONS:")
-            for r in failed_hms:
-                print(f"  - {r['query'][:60]}... : {r['error']}")
+        for catalog_name, _, short_name in CATALOG_DISPLAY:
+            if failures[catalog_name]:
+                print(f"\nFAILED {short_name} OPERATIONS:")
+                for r in failures[catalog_name]:
+                    print(f"  - {r['query'][:60]}... : {r['error']}")
         
         print("\n" + "="*80)
 
-    def run_all_tests(self):
-        """Run all concurrency tests"""
+    def run_all_tests(self, optimize: bool = False):
+        """Run all concurrency tests, compacting the tables after the insert phase if ``optimize``"""
         logger.info("Starting comprehensive concurrency test suite")
         
         # Setup test environment
@@ -361,6 +544,10 @@ class TrinoConcurrencyTester:
         insert_results = self.concurrent_insert_test(num_threads=3, inserts_per_thread=2)
         all_results.extend(insert_results)
         
+        if optimize:
+            print("\nOptimizing test tables...")
+            self.optimize_tables()
+        
         # Wait a bit between tests
         time.sleep(2)
         
@@ -384,20 +571,31 @@ class TrinoConcurrencyTester:
 
     def cleanup(self):
         """Clean up connections"""
-        if self.polaris_conn:
-            self.polaris_conn.close()
-        if self.hms_conn:
-            self.hms_conn.close()
+        for catalog_name, pool in self.pools.items():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            self.pool_sizes[catalog_name] = 0
 
 def main():
     """Main function to run the concurrency tests"""
+    parser = argparse.ArgumentParser(description="Concurrency test for Polaris and HMS catalogs")
+    parser.add_argument('--cache', action='store_true',
+                        help="reuse identical read results for a few seconds instead of sending every read to Trino")
+    parser.add_argument('--optimize', action='store_true',
+                        help="compact the test tables between the insert and read phases")
+    # run_concurrency_test.py may pass scenario flags (--quick/--stress) this script does not define
+    args, _ = parser.parse_known_args()
+    
     tester = None
     try:
         print("Initializing Trino Concurrency Tester...")
-        tester = TrinoConcurrencyTester()
+        tester = TrinoConcurrencyTester(use_cache=args.cache)
         
         # Run all tests
-        results = tester.run_all_tests()
+        results = tester.run_all_tests(optimize=args.optimize)
         
         print(f"\nTest completed! Total operations: {len(results)}")
         
@@ -11,19 +11,38 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def wait_for_nessie(max_retries=30, delay=5):
-    """Wait for Nessie service to be ready"""
-    nessie_url = "http://localhost:19120/api/v2/config"
+NESSIE_API_URL = "http://localhost:19120/api/v2"
+# Seconds to wait for a Nessie REST API response
+NESSIE_API_TIMEOUT = 10
+# One keep-alive session shared by every Nessie REST call in this script
+_session = requests.Session()
+
+def wait_for_nessie(timeout=150.0, initial_delay=0.1, max_delay=2.0):
+    """Wait for Nessie service to be ready, polling with exponential backoff
+    
+    Readiness is probed with HEAD requests over the shared session; only a 2xx response
+    means Nessie is up. If the server rejects HEAD (405), the same URL is retried with GET.
+    Any other status keeps the wait going.
+    """
+    nessie_url = f"{NESSIE_API_URL}/config"
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    attempt = 0
     
-    for attempt in range(max_retries):
+    while time.monotonic() < deadline:
+        attempt += 1
         try:
-            response = requests.get(nessie_url, timeout=5)
-            if response.status_code == 200:
+            response = _session.head(nessie_url, timeout=1)
+            if response.status_code == 405:
+                response = _session.get(nessie_url, timeout=1)
+            if 200 <= response.status_code < 300:
                 logger.info("Nessie service is ready!")
                 return True
+            logger.info(f"Attempt {attempt}: Waiting for Nessie... (HTTP {response.status_code})")
         except requests.exceptions.RequestException as e:
-            logger.info(f"Attempt {attempt + 1}: Waiting for Nessie... ({e})")
-            time.sleep(delay)
+            logger.info(f"Attempt {attempt}: Waiting for Nessie... ({e})")
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, max_delay)
     
     logger.error("Nessie service did not become ready in time")
     return False
@@ -75,7 +94,7 @@ def test_nessie_catalog():
         
         # Query test data
         logger.info("Querying test data...")
-        cursor.execute("SELECT * FROM test_nessie.sample_table")
+        cursor.execute("SELECT id, name FROM test_nessie.sample_table")
         results = cursor.fetchall()
         logger.info(f"Test data: {results}")
         
@@ -99,20 +118,20 @@ def test_nessie_api():
     try:
         logger.info("Testing Nessie REST API...")
         
-        # Get default branch
-        response = requests.get("http://localhost:19120/api/v2/trees/main")
+        # Get the default branch over the shared keep-alive session
+        response = _session.get(f"{NESSIE_API_URL}/trees/main", timeout=NESSIE_API_TIMEOUT)
         if response.status_code == 200:
             logger.info(f"Main branch info: {response.json()}")
         else:
             logger.warning(f"Could not get main branch info: {response.status_code}")
         
         # List namespaces
-        response = requests.get("http://localhost:19120/api/v2/trees/main/contents")
-        if response.status_code == 200:
-            contents = response.json()
+        contents_response = _session.get(f"{NESSIE_API_URL}/trees/main/contents", timeout=NESSIE_API_TIMEOUT)
+        if contents_response.status_code == 200:
+            contents = contents_response.json()
             logger.info(f"Nessie contents: {contents}")
         else:
-            logger.warning(f"Could not list contents: {response.status_code}")
+            logger.warning(f"Could not list contents: {contents_response.status_code}")
         
         logger.info("✅ Nessie API test completed!")
         return True
@@ -0,0 +1,76 @@
+"""
+Connection pool and random stream helpers shared by the test scripts
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager, contextmanager
+from concurrent.futures import Executor
+from typing import Any, Dict, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SeedSequence.spawn advances a child counter; workers may spawn from several threads at once
+_spawn_lock = threading.Lock()
+
+
+class PooledTester(ABC):
+    """Base for testers that check pooled Trino connections out to workers
+    
+    Subclasses fill ``pools`` and ``pool_sizes`` with one entry per catalog, set
+    ``seed_sequence`` and implement ``open_pool_entry``. A pool entry is whatever one
+    worker holds: a connection, or a (connection, cursor) pair. Worker coroutines borrow
+    entries with ``acquire_async`` while ``_executor`` is set to the test's I/O pool.
+    """
+    pools: Dict[str, queue.Queue]
+    pool_sizes: Dict[str, int]
+    seed_sequence: np.random.SeedSequence
+    _executor: Optional[Executor] = None
+
+    @abstractmethod
+    def open_pool_entry(self, catalog_name: str) -> Any:
+        """Open one new pool entry for ``catalog_name``"""
+
+    def spawn_rng(self) -> np.random.Generator:
+        """Create a private generator on a fresh child stream of ``seed_sequence``
+        
+        Generators are never shared, so no worker contends on another's RNG state.
+        """
+        with _spawn_lock:
+            child = self.seed_sequence.spawn(1)[0]
+        return np.random.default_rng(child)
+
+    def ensure_pool_size(self, pool_size: int):
+        """Grow every catalog pool to at least ``pool_size`` entries"""
+        for catalog_name, pool in self.pools.items():
+            added = 0
+            while self.pool_sizes[catalog_name] < pool_size:
+                pool.put(self.open_pool_entry(catalog_name))
+                self.pool_sizes[catalog_name] += 1
+                added += 1
+            if added:
+                logger.info(f"Connection pool for {catalog_name}: {self.pool_sizes[catalog_name]} connections")
+
+    @contextmanager
+    def acquire(self, catalog_name: str):
+        """Borrow an entry from the catalog pool and return it when done"""
+        pool = self.pools[catalog_name]
+        entry = pool.get()
+        try:
+            yield entry
+        finally:
+            pool.put(entry)
+
+    @asynccontextmanager
+    async def acquire_async(self, catalog_name: str):
+        """Borrow an entry like ``acquire``, waiting for it on ``_executor`` instead of the event loop"""
+        pool = self.pools[catalog_name]
+        entry = await asyncio.get_running_loop().run_in_executor(self._executor, pool.get)
+        try:
+            yield entry
+        finally:
+            pool.put(entry)